@@ -1,9 +1,12 @@
 import streamlit as st
 from datetime import datetime, timezone
-from streamlit_folium import st_folium
 from utils.geocoding import validate_address, geocode_address
 from utils.district_data import get_district_info, get_council_member
-from utils.mapping import create_district_map, create_base_district_map
+from utils.district_map import district_map
+from utils.boundary_sets import AFTER, BOUNDARY_SETS
+from utils.metrics import span, log_rerun_spans
+from utils.profiling import start_rerun_profile, finish_rerun_profile, hash_input
+from utils.warmup import start_warmup
 from pathlib import Path
 import re
 import pytz
@@ -16,6 +19,11 @@ st.set_page_config(
 
 )
 
+start_rerun_profile("My_Districts")
+
+# No-op after the first call; covers servers started without serve.py
+start_warmup()
+
 # CSS remains unchanged through line 123
 st.markdown("""
     <style>
@@ -48,6 +56,42 @@ if 'current_coords' not in st.session_state:
     st.session_state.current_coords = None
 if 'district_info' not in st.session_state:
     st.session_state.district_info = None
+if 'last_map_click' not in st.session_state:
+    st.session_state.last_map_click = None
+
+# Only the fields the page shows are kept, so each session holds one small result
+SESSION_DISTRICT_FIELDS = (
+    "district_number", "new_district_number", "jurisdictions", "precinct", "polling_place", "polling_address",
+    "candidates"
+)
+
+
+def remember_result(address, coords, district_info):
+    """Replace the session's search result; nothing accumulates across searches"""
+    st.session_state.search_performed = True
+    st.session_state.current_address = address
+    st.session_state.current_coords = coords
+    st.session_state.district_info = {field: district_info.get(field) for field in SESSION_DISTRICT_FIELDS}
+
+
+def handle_map_click(map_data):
+    """Resolve a new map click straight to a district, without geocoding"""
+    click = (map_data or {}).get("last_clicked")
+    if not click:
+        return
+
+    lat, lon = round(click["lat"], 6), round(click["lng"], 6)
+    if st.session_state.last_map_click == (lat, lon):
+        return
+    st.session_state.last_map_click = (lat, lon)
+
+    district_info = get_district_info(lat, lon)
+    if district_info["district_number"] == "District not found":
+        st.warning("That point is outside the Chattanooga City Council districts. Try clicking inside a district.")
+        return
+
+    remember_result(f"Map location ({lat:.5f}, {lon:.5f})", (lat, lon), district_info)
+    st.rerun()
 
 
 # Add title and attribution to sidebar
@@ -108,6 +152,7 @@ with col1:
         "Street Address",
         placeholder="123 Main St",
         help="Enter your street address",
+        max_chars=200,
         key="main_street_address"
     )
 
@@ -135,12 +180,8 @@ with col1:
                     coords = geocode_address(address)
 
                     if coords:
-                        st.session_state.search_performed = True
-                        st.session_state.current_address = address
-                        st.session_state.current_coords = coords
                         lat, lon = coords
-                        district_info = get_district_info(lat, lon)
-                        st.session_state.district_info = district_info
+                        remember_result(address, coords, get_district_info(lat, lon))
                     else:
                         st.error("Unable to locate this address. Please check the format and try again.")
                 else:
@@ -152,65 +193,85 @@ with col1:
     MAP_HEIGHT = 400  # Consistent height for all maps
 
     st.subheader("Chattanooga City Council Districts")
-    if not st.session_state.search_performed:
-        m = create_base_district_map()
-        map_data = st_folium(m, width=None, height=MAP_HEIGHT, key="base_map")
-
-    # Show map if search is performed
-    if st.session_state.search_performed and st.session_state.current_coords:
-        lat, lon = st.session_state.current_coords
-        district_info = st.session_state.district_info
-
-        if district_info and district_info["district_number"] != "District not found":
-            m = create_district_map(lat, lon, district_info)
-            map_key = f"map_{st.session_state.current_address}"
-            map_data = st_folium(m, width=None, height=MAP_HEIGHT, key=map_key)
+    st.caption("Can't find your address? Click your location on the map instead.")
+
+    # One map per session under a fixed key. The browser loads the district polygons
+    # once from a static file; a search only sends the location and district number.
+    district_info = st.session_state.district_info
+    has_result = (
+        st.session_state.search_performed
+        and st.session_state.current_coords
+        and district_info
+        and district_info["district_number"] != "District not found"
+    )
 
-            # Display district information below map
+    with span("page.district_map"):
+        if has_result:
+            map_data = district_map(st.session_state.current_coords, district_info["district_number"],
+                                    zoom=15, height=MAP_HEIGHT)
+        else:
+            map_data = district_map(height=MAP_HEIGHT)
+    handle_map_click(map_data)
+
+    # Show district details below the map
+    if has_result:
+        st.markdown(f"### Your district is District {district_info['district_number']}")
+
+        # Answered from the same point, so no second geocode
+        new_district = district_info.get("new_district_number")
+        if new_district and new_district != "District not found":
+            if new_district != district_info["district_number"]:
+                starts = BOUNDARY_SETS[AFTER].effective_from
+                st.info(f"After redistricting, your district is **District {new_district}** "
+                        f"starting {starts:%B} {starts.day}, {starts.year}.")
+            else:
+                st.caption("Your district is the same after the 2025 redistricting.")
+
+        # County, school board and state districts, for whichever layers have boundary files
+        for label, value in (district_info.get("jurisdictions") or {}).items():
+            st.markdown(f"**{label}:** District {value}")
+
+        # Current Council Member
+        council_info = get_council_member(district_info["district_number"])
+        st.markdown("#### Current Council Member")
+        st.markdown(f"**{council_info['name']}**")
+
+        # Election Information
+        st.markdown("---")
+        st.markdown("### March 4th, 2025 Election Candidates")
+
+        for candidate in district_info.get('candidates', []):
+            with st.container():
+                st.markdown('<div class="candidate-info">', unsafe_allow_html=True)
+
+                # Handle candidate name and website if present
+                if "[" in candidate:
+                    name = candidate.split("[")[0].strip()
+                    website = candidate.split("(")[1].split(")")[0]
+                    st.markdown(f'<div class="candidate-name">{name}</div>', unsafe_allow_html=True)
+                    st.markdown(f'[Campaign Website]({website})', unsafe_allow_html=True)
+                else:
+                    st.markdown(f'<div class="candidate-name">{candidate}</div>', unsafe_allow_html=True)
 
-            st.markdown(f"### Your district is District {district_info['district_number']}")
+                # Safe image loading with error handling
+                try:
+                    photo_path = Path(f"assets/candidate_photos/{candidate.split('[')[0].strip()}.jpg")
+                    if photo_path.exists():
+                        st.image(str(photo_path), use_column_width=True)
+                except Exception as e:
+                    st.warning("Unable to load candidate photo")
 
-            # Current Council Member
-            council_info = get_council_member(district_info["district_number"])
-            st.markdown("#### Current Council Member")
-            st.markdown(f"**{council_info['name']}**")
+                st.markdown('</div>', unsafe_allow_html=True)
 
-            # Election Information
+        # Polling Location Information
+        if district_info["polling_place"] != "Not found":
             st.markdown("---")
-            st.markdown("### March 4th, 2025 Election Candidates")
-
-            for candidate in district_info.get('candidates', []):
-                with st.container():
-                    st.markdown('<div class="candidate-info">', unsafe_allow_html=True)
-
-                    # Handle candidate name and website if present
-                    if "[" in candidate:
-                        name = candidate.split("[")[0].strip()
-                        website = candidate.split("(")[1].split(")")[0]
-                        st.markdown(f'<div class="candidate-name">{name}</div>', unsafe_allow_html=True)
-                        st.markdown(f'[Campaign Website]({website})', unsafe_allow_html=True)
-                    else:
-                        st.markdown(f'<div class="candidate-name">{candidate}</div>', unsafe_allow_html=True)
-
-                    # Safe image loading with error handling
-                    try:
-                        photo_path = Path(f"assets/candidate_photos/{candidate.split('[')[0].strip()}.jpg")
-                        if photo_path.exists():
-                            st.image(str(photo_path), use_column_width=True)
-                    except Exception as e:
-                        st.warning("Unable to load candidate photo")
-
-                    st.markdown('</div>', unsafe_allow_html=True)
-
-            # Polling Location Information
-            if district_info["polling_place"] != "Not found":
-                st.markdown("---")
-                st.markdown("### 🏢 Your Polling Location")
-                st.markdown(f"""
-                **Location:** {district_info["polling_place"]}  
-                **Address:** {district_info["polling_address"]}  
-                **Precinct:** {district_info["precinct"]}
-                """)
+            st.markdown("### 🏢 Your Polling Location")
+            st.markdown(f"""
+            **Location:** {district_info["polling_place"]}  
+            **Address:** {district_info["polling_address"]}  
+            **Precinct:** {district_info["precinct"]}
+            """)
 
 # Footer
 st.markdown("---")
@@ -218,4 +279,9 @@ st.markdown(
     "Data provided by City of Chattanooga. "
     "For official information, visit the [Election Commission website](https://elect.hamiltontn.gov/).",
     unsafe_allow_html=True
-)
\ No newline at end of file
+)
+
+finish_rerun_profile({
+    "address": hash_input(st.session_state.current_address) if st.session_state.current_address else None,
+})
+log_rerun_spans("My_Districts")
\ No newline at end of file
@@ -0,0 +1,283 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from tornado.httpclient import AsyncHTTPClient, HTTPRequest
+from tornado.websocket import websocket_connect
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from utils.stub_geocoder import start_stub_geocoder
+
+STREETS = [
+    "Market St", "Broad St", "McCallie Ave", "Brainerd Rd", "Main St", "Dodds Ave",
+    "Amnicola Hwy", "Hixson Pike", "Rossville Blvd", "Bailey Ave", "Frazier Ave", "Dayton Blvd",
+]
+ZIPS = ["37402", "37403", "37404", "37405", "37406", "37407", "37408", "37411", "37412", "37415"]
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+class Replica:
+    """A `streamlit run My_Districts.py` server process, measured through /proc"""
+
+    def __init__(self, env: Dict[str, str]):
+        self.port = free_port()
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', 'streamlit', 'run', 'My_Districts.py',
+             '--server.port', str(self.port), '--server.address', '127.0.0.1',
+             '--server.headless', 'true', '--server.fileWatcherType', 'none'],
+            cwd=REPO_ROOT, env={**os.environ, **env},
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+
+    async def wait_ready(self, timeout: float = 60):
+        client = AsyncHTTPClient()
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                response = await client.fetch(f"http://127.0.0.1:{self.port}/_stcore/health", raise_error=False)
+                if response.code == 200:
+                    return
+            except OSError:
+                pass
+            await asyncio.sleep(0.25)
+        raise RuntimeError("Streamlit replica did not become healthy")
+
+    def cpu_seconds(self) -> float:
+        with open(f'/proc/{self.process.pid}/stat') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+
+    def rss_mb(self) -> float:
+        with open(f'/proc/{self.process.pid}/statm') as f:
+            return int(f.read().split()[1]) * PAGE_SIZE / 2**20
+
+    def stop(self):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+class Session:
+    """Minimal browser stand-in speaking Streamlit's websocket protocol"""
+
+    def __init__(self, port: int, page_name: str = ""):
+        self.port = port
+        self.page_name = page_name
+        self.widgets: Dict[str, str] = {}
+        self.ws = None
+
+    async def connect(self):
+        request = HTTPRequest(f"ws://127.0.0.1:{self.port}/_stcore/stream")
+        self.ws = await websocket_connect(request, subprotocols=["streamlit"])
+
+    async def rerun(self, widget_states: Optional[List[dict]] = None, timeout: float = 120) -> float:
+        """Send a rerun and return the seconds until the script finishes"""
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.page_name = self.page_name
+        for state in widget_states or []:
+            widget = msg.rerun_script.widget_states.widgets.add()
+            for field, value in state.items():
+                setattr(widget, field, value)
+
+        start = time.perf_counter()
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+        while True:
+            data = await asyncio.wait_for(self.ws.read_message(), timeout)
+            if data is None:
+                raise RuntimeError("Replica closed the connection")
+            forward = ForwardMsg()
+            forward.ParseFromString(data)
+            kind = forward.WhichOneof('type')
+            if kind == 'delta' and forward.delta.WhichOneof('type') == 'new_element':
+                self._record_widget(forward.delta.new_element)
+            elif kind == 'script_finished':
+                if forward.script_finished != 0:
+                    raise RuntimeError(f"Script finished with status {forward.script_finished}")
+                return time.perf_counter() - start
+
+    def _record_widget(self, element):
+        element_type = element.WhichOneof('type')
+        if element_type in ('text_input', 'button', 'selectbox'):
+            widget = getattr(element, element_type)
+            # Keyed widget ids look like "$$ID-<hash>-<key>"
+            if widget.id.startswith('$$ID-'):
+                key = widget.id.split('-', 2)[2]
+                if key != 'None':
+                    self.widgets[key] = widget.id
+            self.widgets.setdefault(f"{element_type}:{widget.label}", widget.id)
+
+    def close(self):
+        if self.ws:
+            self.ws.close()
+
+async def districts_session(port: int, rng: random.Random, address_pool: List[str]) -> List[float]:
+    """Load My_Districts.py, then search one address"""
+    session = Session(port)
+    await session.connect()
+    try:
+        latencies = [await session.rerun()]
+        street, zip_code = rng.choice(address_pool).split('|')
+        latencies.append(await session.rerun([
+            {"id": session.widgets["main_street_address"], "string_value": street},
+            {"id": session.widgets["main_zip_code"], "string_value": zip_code},
+            {"id": session.widgets["find_district_main"], "trigger_value": True},
+        ]))
+        return latencies
+    finally:
+        session.close()
+
+async def candidates_session(port: int, rng: random.Random, address_pool: List[str]) -> List[float]:
+    """Load the Candidates page, then filter to one district"""
+    session = Session(port, page_name="Candidates")
+    await session.connect()
+    try:
+        latencies = [await session.rerun()]
+        latencies.append(await session.rerun([
+            {"id": session.widgets["selectbox:Filter by District"], "int_value": rng.randint(1, 9)},
+        ]))
+        return latencies
+    finally:
+        session.close()
+
+SCENARIOS = {"districts": districts_session, "candidates": candidates_session}
+
+async def run_level(concurrency: int, sessions_per_user: int, scenarios: List[str],
+                    address_pool: List[str], env: Dict[str, str]) -> dict:
+    """Start a cold replica and run `concurrency` visitors against it"""
+    replica = Replica(env)
+    try:
+        await replica.wait_ready()
+        latencies: Dict[str, List[float]] = {name: [] for name in scenarios}
+        errors: List[str] = []
+
+        async def visitor(seed: int):
+            rng = random.Random(seed)
+            for i in range(sessions_per_user):
+                scenario = scenarios[(seed + i) % len(scenarios)]
+                try:
+                    latencies[scenario].extend(await SCENARIOS[scenario](replica.port, rng, address_pool))
+                except Exception as e:
+                    errors.append(f"{scenario}: {type(e).__name__}: {e}")
+
+        peak_rss = replica.rss_mb()
+        cpu_start = replica.cpu_seconds()
+        wall_start = time.perf_counter()
+
+        visitors = asyncio.gather(*(visitor(seed) for seed in range(concurrency)))
+        while not visitors.done():
+            peak_rss = max(peak_rss, replica.rss_mb())
+            await asyncio.sleep(0.2)
+        await visitors
+
+        wall = time.perf_counter() - wall_start
+        cpu = replica.cpu_seconds() - cpu_start
+        peak_rss = max(peak_rss, replica.rss_mb())
+    finally:
+        replica.stop()
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "concurrency": concurrency,
+        "reruns": len(all_latencies),
+        "errors": len(errors),
+        "p50_ms": percentile(all_latencies, 50) * 1000,
+        "p90_ms": percentile(all_latencies, 90) * 1000,
+        "p99_ms": percentile(all_latencies, 99) * 1000,
+        "max_ms": max(all_latencies, default=0) * 1000,
+        "reruns_per_sec": len(all_latencies) / wall if wall else 0,
+        "cpu_percent": 100 * cpu / wall if wall else 0,
+        "peak_rss_mb": peak_rss,
+        "scenarios": {
+            name: {
+                "reruns": len(values),
+                "p50_ms": percentile(values, 50) * 1000,
+                "p90_ms": percentile(values, 90) * 1000,
+                "mean_ms": statistics.mean(values) * 1000 if values else 0,
+            }
+            for name, values in latencies.items()
+        },
+        "sample_errors": errors[:5],
+    }
+
+async def main(args):
+    stub = start_stub_geocoder(delay=args.geocoder_delay)
+    scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip() in SCENARIOS]
+    rng = random.Random(0)
+    address_pool = [
+        f"{rng.randint(100, 4999)} {rng.choice(STREETS)}|{rng.choice(ZIPS)}"
+        for _ in range(args.unique_addresses)
+    ]
+
+    header = f"{'users':>5} {'reruns':>6} {'errors':>6} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} " \
+             f"{'rerun/s':>8} {'cpu %':>6} {'rss MB':>7}"
+    print(header)
+    print('-' * len(header))
+
+    summaries = []
+    for concurrency in [int(level) for level in args.concurrency.split(',')]:
+        env = {
+            "GEOCODER_DOMAIN": f"127.0.0.1:{stub.server_address[1]}",
+            "GEOCODER_SCHEME": "http",
+            "GEOCODER_RATE": "1000",
+            "GEOCODER_BURST": "100",
+            "GEOCODER_CONCURRENCY": "16",
+            # Each level starts from a cold replica, like a fresh autoscale instance
+            "SHARED_CACHE_URL": "sqlite:///" + str(Path(tempfile.mkdtemp(prefix="load_cache_")) / "cache.sqlite"),
+        }
+        summary = await run_level(concurrency, args.sessions, scenarios, address_pool, env)
+        summaries.append(summary)
+        print(f"{concurrency:>5} {summary['reruns']:>6} {summary['errors']:>6} {summary['p50_ms']:>8.0f} "
+              f"{summary['p90_ms']:>8.0f} {summary['p99_ms']:>8.0f} {summary['reruns_per_sec']:>8.2f} "
+              f"{summary['cpu_percent']:>6.0f} {summary['peak_rss_mb']:>7.0f}")
+        for error in summary["sample_errors"]:
+            print(f"      error: {error}")
+
+    print(f"\nStub geocoder answered {stub.request_count} requests")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps({"levels": summaries}, indent=2))
+        print(f"Saved results to {args.output}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Drive concurrent headless sessions against a local replica at growing concurrency"
+    )
+    parser.add_argument('--concurrency', default="1,2,4,8,16",
+                        help="Comma-separated visitor counts; each level runs against a fresh replica")
+    parser.add_argument('--sessions', type=int, default=3, help="Sessions each visitor runs back to back")
+    parser.add_argument('--scenarios', default="districts,candidates", help="Comma-separated scenarios to mix")
+    parser.add_argument('--unique-addresses', type=int, default=50,
+                        help="Size of the address pool; smaller pools mean more cache hits")
+    parser.add_argument('--geocoder-delay', type=float, default=0.2,
+                        help="Seconds the stub geocoder waits before answering")
+    parser.add_argument('--output', type=Path, help="Write the summary as JSON to this file")
+    asyncio.run(main(parser.parse_args()))
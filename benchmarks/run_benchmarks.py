@@ -0,0 +1,268 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = REPO_ROOT / 'benchmarks' / 'results'
+
+# Benchmarks run against the repo's data files and never touch the network
+os.chdir(REPO_ROOT)
+sys.path.insert(0, str(REPO_ROOT))
+
+import streamlit.config
+import streamlit.logger
+
+# Outside `streamlit run` every cached call warns about the missing runtime.
+# Load the config first, since loading it resets the log level.
+streamlit.config.get_config_options()
+streamlit.logger.set_log_level('error')
+
+from utils.stub_geocoder import start_stub_geocoder
+
+STUB_GEOCODER = start_stub_geocoder()
+os.environ.update({
+    "GEOCODER_DOMAIN": f"127.0.0.1:{STUB_GEOCODER.server_address[1]}",
+    "GEOCODER_SCHEME": "http",
+    "GEOCODER_RATE": "10000",
+    "GEOCODER_BURST": "1000",
+    "GEOCODER_CONCURRENCY": "8",
+    "SHARED_CACHE_URL": "sqlite:///" + str(Path(tempfile.mkdtemp(prefix="bench_cache_")) / "cache.sqlite"),
+})
+
+import numpy as np
+import pandas as pd
+
+BENCHMARKS: List[dict] = []
+
+def benchmark(name: str, rounds: int = 5, setup: Optional[Callable[[], None]] = None):
+    """Register a function to be timed; setup runs untimed before every round"""
+    def register(fn):
+        BENCHMARKS.append({"name": name, "fn": fn, "rounds": rounds, "setup": setup})
+        return fn
+    return register
+
+def coordinate_grid(size: int = 20):
+    """Evenly spaced points over the Chattanooga service area"""
+    lats = np.linspace(34.95, 35.15, size)
+    lons = np.linspace(-85.38, -85.12, size)
+    grid_lats, grid_lons = np.meshgrid(lats, lons)
+    return grid_lats.ravel(), grid_lons.ravel()
+
+class ScratchDirectory:
+    """Temporary working directory with the repo's input data linked in"""
+
+    def __enter__(self):
+        self.previous = Path.cwd()
+        self.path = Path(tempfile.mkdtemp(prefix="bench_"))
+        (self.path / 'attached_assets').symlink_to(REPO_ROOT / 'attached_assets')
+        os.chdir(self.path)
+        return self.path
+
+    def __exit__(self, *exc):
+        os.chdir(self.previous)
+        shutil.rmtree(self.path, ignore_errors=True)
+
+def clear_streamlit_caches():
+    import streamlit as st
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+# District lookup
+
+@benchmark("get_district_for_coordinates[grid 5x5]", rounds=3, setup=clear_streamlit_caches)
+def bench_district_lookup_grid():
+    from utils.district_data import get_district_for_coordinates
+    for lat, lon in zip(*coordinate_grid(5)):
+        get_district_for_coordinates(float(lat), float(lon))
+
+@benchmark("get_districts_for_points[grid 100x100]", rounds=5)
+def bench_district_lookup_vectorized():
+    from utils.district_data import get_districts_for_points
+    get_districts_for_points(*coordinate_grid(100))
+
+# Map building
+
+def clear_map_geometry():
+    from utils.district_map import build_map_geometry
+    build_map_geometry.clear()
+
+@benchmark("build_map_geometry[uncached]", rounds=3, setup=clear_map_geometry)
+def bench_map_geometry():
+    # The one-time cost: simplify the districts and write the file the map component fetches
+    from utils.district_map import build_map_geometry
+    build_map_geometry()
+
+# Boundary ingest
+
+@benchmark("fetch_district_boundaries[ingest]", rounds=3)
+def bench_boundary_ingest():
+    from utils.district_scraper import fetch_district_boundaries
+    with ScratchDirectory():
+        if not fetch_district_boundaries():
+            raise RuntimeError("fetch_district_boundaries failed")
+
+def synthetic_polygon_csv(path: Path, count: int = 100_000) -> Path:
+    """Precinct-sized WKT polygons over the city, with a few self-intersecting ones to repair"""
+    import shapely
+    rng = np.random.default_rng(0)
+    centers = shapely.points(rng.uniform(-85.38, -85.12, count), rng.uniform(34.95, 35.15, count))
+    wkt = shapely.to_wkt(shapely.buffer(centers, 0.0005, quad_segs=8), rounding_precision=8)
+    wkt[::1000] = "POLYGON ((0 0, 1 1, 1 0, 0 1, 0 0))"
+    pd.DataFrame({
+        "precinct": np.arange(count),
+        "voters": rng.integers(100, 3000, count),
+        "percent_turnout": rng.uniform(0, 100, count),
+        "the_geom": wkt,
+    }).to_csv(path, index=False)
+    return path
+
+# Deterministic, so it is generated once and reused by later runs
+SYNTHETIC_CSV = Path(tempfile.gettempdir()) / 'bench_polygons_100k.csv'
+
+def ensure_synthetic_csv():
+    if not SYNTHETIC_CSV.exists():
+        synthetic_polygon_csv(SYNTHETIC_CSV)
+
+@benchmark("convert_csv[100k polygons]", rounds=3, setup=ensure_synthetic_csv)
+def bench_large_ingest():
+    from utils.geometry_store import convert_csv
+    convert_csv(SYNTHETIC_CSV, 'the_geom', SYNTHETIC_CSV.with_suffix('.parquet'))
+
+# Photos
+
+def largest_photos(count: int = 3) -> List[Path]:
+    photos = [p for p in (REPO_ROOT / 'assets' / 'candidate_photos').glob('*.jpg')]
+    return sorted(photos, key=lambda p: p.stat().st_size, reverse=True)[:count]
+
+@benchmark("process_candidate_photo[3 largest JPEGs]", rounds=3)
+def bench_photo_processing():
+    from utils.photo_scraper import process_candidate_photo
+    with ScratchDirectory():
+        for photo in largest_photos():
+            if not process_candidate_photo(photo, photo.stem):
+                raise RuntimeError(f"process_candidate_photo failed for {photo.name}")
+
+# Polling places
+
+@benchmark("find_nearest_polling_place[uncached]", rounds=5, setup=clear_streamlit_caches)
+def bench_nearest_polling_place():
+    from utils.district_data import find_nearest_polling_place
+    df = pd.read_csv(REPO_ROOT / 'assets' / 'polling_places.csv')
+    find_nearest_polling_place(35.0456, -85.3097, df)
+
+def synthetic_polling_page(path: Path, count: int = 5_000) -> Path:
+    """A county-wide polling place list: one long table between the usual page chrome"""
+    filler = "<p>Polls are open 7:00 a.m. to 7:00 p.m. on Election Day.</p>" * 500
+    rows = "".join(
+        f"<tr><td>Precinct {i}</td><td>Community Center &amp; Library {i}</td>"
+        f"<td>{100 + i} North Moore Road, Chattanooga, TN 37411</td></tr>"
+        for i in range(count)
+    )
+    path.write_text(
+        f"<html><head><title>Polling Places</title></head><body><nav>{filler}</nav>"
+        f"<table><tr><th>Precinct</th><th>Location</th><th>Address</th></tr>{rows}</table>"
+        f"<footer>{filler}</footer></body></html>"
+    )
+    return path
+
+SYNTHETIC_POLLING_PAGE = Path(tempfile.gettempdir()) / 'bench_polling_places_5k.html'
+
+def ensure_polling_page():
+    if not SYNTHETIC_POLLING_PAGE.exists():
+        synthetic_polling_page(SYNTHETIC_POLLING_PAGE)
+
+@benchmark("parse_polling_places[5k-row page]", rounds=5, setup=ensure_polling_page)
+def bench_polling_page_parse():
+    from utils.polling_scraper import parse_polling_places
+    from utils.scraping import CHUNK_BYTES
+    with SYNTHETIC_POLLING_PAGE.open('rb') as f:
+        places = parse_polling_places(iter(lambda: f.read(CHUNK_BYTES), b''))
+    if len(places) != 5_000:
+        raise RuntimeError(f"parsed {len(places)} polling places")
+
+def time_benchmark(entry: dict) -> Dict[str, float]:
+    timings = []
+    for _ in range(entry["rounds"]):
+        if entry["setup"]:
+            entry["setup"]()
+        start = time.perf_counter()
+        entry["fn"]()
+        timings.append(time.perf_counter() - start)
+
+    return {
+        "rounds": len(timings),
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.mean(timings),
+        "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+    }
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, cwd=REPO_ROOT, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def compare(results: dict, baseline_path: Path):
+    """Print the median of each benchmark against a previous results file"""
+    baseline = json.loads(baseline_path.read_text())
+    print(f"\nCompared with {baseline_path.name} ({baseline.get('commit', 'unknown')}):")
+    for name, stats in results["benchmarks"].items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if not previous or "median" not in previous or "median" not in stats:
+            print(f"  {name}: no baseline")
+            continue
+        ratio = stats["median"] / previous["median"] if previous["median"] else float('inf')
+        print(f"  {name}: {previous['median'] * 1000:.1f} ms -> {stats['median'] * 1000:.1f} ms ({ratio:.2f}x)")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Time the district lookup, map and photo hot paths")
+    parser.add_argument('-k', '--filter', default='', help="Only run benchmarks whose name contains this text")
+    parser.add_argument('--output', type=Path, help="Results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument('--compare', type=Path, help="Previous results file to compare against")
+    args = parser.parse_args()
+
+    if not (REPO_ROOT / 'assets' / 'district_boundaries.json').exists():
+        print("assets/district_boundaries.json is missing; run python utils/district_scraper.py first")
+        sys.exit(1)
+
+    results = {
+        "commit": git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "benchmarks": {},
+    }
+
+    for entry in BENCHMARKS:
+        if args.filter not in entry["name"]:
+            continue
+        try:
+            stats = time_benchmark(entry)
+            print(f"{entry['name']}: median {stats['median'] * 1000:.1f} ms "
+                  f"(min {stats['min'] * 1000:.1f} ms, {stats['rounds']} rounds)")
+        except Exception as e:
+            stats = {"error": str(e)}
+            print(f"{entry['name']}: failed: {e}")
+        results["benchmarks"][entry["name"]] = stats
+
+    output = args.output or RESULTS_DIR / f"{results['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"\nSaved results to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
@@ -1,7 +1,9 @@
 # Content from All_Candidates.py
 import streamlit as st
-from utils.candidate_data import get_all_candidates, get_district_candidates, Candidate, MAYORAL_CANDIDATES_2025
+from utils.candidate_data import get_all_candidates, get_district_candidates, get_mayoral_candidates, Candidate
 from utils.photo_scraper import get_candidate_photo
+from utils.metrics import log_rerun_spans
+from utils.profiling import start_rerun_profile, finish_rerun_profile
 from typing import Optional
 from pathlib import Path
 from PIL import Image
@@ -149,6 +151,8 @@ st.set_page_config(
     layout="wide"
 )
 
+start_rerun_profile("Candidates")
+
 # Election countdown
 election_date = datetime(2025, 3, 4, tzinfo=pytz.timezone('America/New_York'))
 current_time = datetime.now(pytz.timezone('America/New_York'))
@@ -203,7 +207,7 @@ st.markdown("""
 col1, col2 = st.columns(2)
 
 # Display each mayoral candidate in a column
-for i, candidate in enumerate(MAYORAL_CANDIDATES_2025):
+for i, candidate in enumerate(get_mayoral_candidates()):
     with col1 if i == 0 else col2:
         candidate_card(candidate)
 
@@ -278,4 +282,7 @@ for district in sorted(candidates_by_district.keys(), key=int):
     cols = st.columns(3)  # Always create 3 columns, CSS will handle the responsive layout
     for i, candidate in enumerate(district_candidates):
         with cols[i % 3]:
-            candidate_card(candidate)
\ No newline at end of file
+            candidate_card(candidate)
+
+finish_rerun_profile({"district": district_filter})
+log_rerun_spans("Candidates")
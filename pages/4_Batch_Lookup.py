@@ -0,0 +1,109 @@
+import streamlit as st
+from utils.batch_lookup import new_results_path, process_address_csv
+from utils.profiling import start_rerun_profile, finish_rerun_profile, hash_input
+
+# Page Configuration
+st.set_page_config(
+    page_title="Batch Lookup | Chattanooga.Vote",
+    page_icon="🗳️",
+    layout="wide",
+)
+
+start_rerun_profile("Batch_Lookup")
+
+# Add title and attribution to sidebar
+st.sidebar.markdown("""
+    <div style='text-align: center; padding-top: 0; margin-bottom: 10px;'>
+        <h1 style='color: #1B4E5D; margin-bottom: 5px;'>chattanooga.vote</h1>
+    </div>
+""", unsafe_allow_html=True)
+
+st.sidebar.image('assets/chattanoogashow_jonathanholborn.png', width=320, use_container_width=False)
+
+# Add attribution to sidebar
+st.sidebar.markdown("""
+    <div style='text-align: center; padding-top: 0; margin-bottom: 10px;'>
+    <p style='font-style: italic; color: #666;'>
+        Brought to you by<br>
+        <a href="https://www.instagram.com/chattanoogashow/" target="_blank">The Chattanooga Show</a><br>
+        &
+        <a href="https://jonathanholborn.com" target="_blank">Jonathan Holborn</a>
+    </p>
+    </div>
+""", unsafe_allow_html=True)
+
+# The finished results CSV, read once when the run ends; the file itself is deleted then
+if 'batch_result' not in st.session_state:
+    st.session_state.batch_result = None
+if 'batch_summary' not in st.session_state:
+    st.session_state.batch_summary = None
+
+st.markdown("""
+# Batch District Lookup
+### For organizations working with many addresses
+
+Upload a CSV with an `address` column (and optionally a `zip` column). Each row is matched to its
+City Council district, precinct and polling place, and you can download the results as a CSV.
+Addresses are geocoded at a rate of about one per second, so large files take a while.
+""")
+
+uploaded_file = st.file_uploader("Address CSV", type=["csv"], key="batch_upload")
+
+if uploaded_file is not None and st.button("Look Up Districts", key="batch_lookup_run", type="primary"):
+    # Count rows without parsing so the progress bar has a total
+    total_rows = max(sum(1 for _ in uploaded_file) - 1, 1)
+    uploaded_file.seek(0)
+
+    st.session_state.batch_result = None
+    st.session_state.batch_summary = None
+
+    output_path = new_results_path()
+    progress = st.progress(0.0, text="Starting lookup...")
+
+    def update_progress(rows_done: int, geocoded: int):
+        progress.progress(
+            min(rows_done / total_rows, 1.0),
+            text=f"Processed {rows_done} of {total_rows} rows ({geocoded} located)"
+        )
+
+    try:
+        summary = process_address_csv(uploaded_file, output_path, progress_callback=update_progress)
+        st.session_state.batch_result = output_path.read_bytes()
+        st.session_state.batch_summary = summary
+        progress.progress(1.0, text="Lookup complete")
+    except ValueError as e:
+        st.error(str(e))
+    except Exception as e:
+        st.error(f"Error processing file: {str(e)}")
+    finally:
+        output_path.unlink(missing_ok=True)
+
+result = st.session_state.batch_result
+summary = st.session_state.batch_summary
+
+if result is not None and summary:
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Rows", summary["rows"])
+    col2.metric("Located", summary["geocoded"])
+    col3.metric("In a City District", summary["matched"])
+
+    st.download_button(
+        label="Download Results",
+        data=result,
+        file_name="district_lookup_results.csv",
+        mime="text/csv",
+        type="primary"
+    )
+
+finish_rerun_profile({
+    "upload": hash_input(uploaded_file.name) if uploaded_file is not None else None,
+    "rows": summary["rows"] if summary else None,
+})
+
+# Footer
+st.markdown("---")
+st.markdown(
+    "Data provided by City of Chattanooga. "
+    "For official information, visit the [Election Commission website](https://elect.hamiltontn.gov/).",
+    unsafe_allow_html=True
+)
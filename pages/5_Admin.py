@@ -0,0 +1,65 @@
+import hmac
+import os
+import pandas as pd
+import streamlit as st
+from utils.cache_stats import cache_stats
+import utils.district_data  # registers the district lookup caches
+
+# Page Configuration
+st.set_page_config(
+    page_title="Admin | Chattanooga.Vote",
+    page_icon="🗳️",
+    layout="wide",
+)
+
+# The page lists server internals, so it is only shown with ?token=<ADMIN_TOKEN>
+admin_token = os.environ.get("ADMIN_TOKEN", "")
+if not admin_token or not hmac.compare_digest(st.query_params.get("token", ""), admin_token):
+    st.markdown("# Admin")
+    st.info("This page is only available to site maintainers.")
+    st.stop()
+
+st.markdown("""
+# Admin
+### Cache usage since this server started
+""")
+
+if st.button("Refresh", key="admin_refresh"):
+    st.rerun()
+
+stats = pd.DataFrame(cache_stats())
+if stats.empty:
+    st.info("No cached functions have been registered yet.")
+    st.stop()
+
+total_calls = int(stats["hits"].sum() + stats["misses"].sum())
+col1, col2, col3 = st.columns(3)
+col1.metric("Cached Calls", total_calls)
+col2.metric("Overall Hit Rate", f"{stats['hits'].sum() / total_calls:.1%}" if total_calls else "n/a")
+sized = stats["approx_bytes"].notna()
+col3.metric("Approximate Cache Memory",
+            f"{stats.loc[sized, 'approx_bytes'].sum() / 2**20:.1f} MB" if sized.any() else "Not measured")
+
+st.dataframe(
+    stats[[
+        "name", "kind", "ttl_seconds", "hits", "misses", "hit_rate", "expirations",
+        "evictions", "entries", "approx_bytes", "mean_compute_ms",
+    ]],
+    column_config={
+        "name": "Function",
+        "kind": "Cache",
+        "ttl_seconds": st.column_config.NumberColumn("TTL (s)", format="%d"),
+        "hit_rate": st.column_config.ProgressColumn("Hit Rate", min_value=0.0, max_value=1.0, format="%.2f"),
+        "approx_bytes": st.column_config.NumberColumn("Approx. Bytes", format="%d"),
+        "mean_compute_ms": st.column_config.NumberColumn("Mean Miss (ms)", format="%.1f"),
+    },
+    hide_index=True,
+    use_container_width=True,
+)
+
+st.caption(
+    "Entries and sizes are estimates kept beside Streamlit's caches: an entry counts as live until "
+    "its TTL passes, and sizes, measured only with CACHE_SIZE_STATS=1, are the pickled size of each "
+    "computed cache_data value. Evictions are entries "
+    "recomputed before their TTL ran out."
+)
@@ -0,0 +1,32 @@
+"""
+Production entry point: starts the cache warm-up and the /metrics and /ready
+endpoint, then runs the Streamlit app in the same process so the warmed
+caches serve the first visitor. Extra arguments are passed to `streamlit run`.
+Set TILE_SERVER_PORT to also serve the district vector tiles to other
+clients (the app's own map reads the copy exported into its component), and
+TILE_PROXY_PORT to run the basemap tile proxy, which the map uses once that
+port is published and BASEMAP_URL names its public URL. Data files are
+watched and reloaded without a restart; DATA_WATCH_INTERVAL=0 turns that off.
+
+    python serve.py --server.address 0.0.0.0
+"""
+import os
+import sys
+from streamlit.web import cli
+from utils.metrics import start_metrics_server
+from utils.warmup import start_warmup
+from utils.data_reload import DATA_WATCH_INTERVAL, start_data_watcher
+from utils.tile_server import start_tile_server
+from utils.tile_proxy import start_tile_proxy
+
+if __name__ == '__main__':
+    start_metrics_server()
+    start_warmup()
+    if DATA_WATCH_INTERVAL > 0:
+        start_data_watcher()
+    if os.environ.get("TILE_SERVER_PORT"):
+        start_tile_server()
+    if os.environ.get("TILE_PROXY_PORT"):
+        start_tile_proxy()
+    sys.argv = ["streamlit", "run", "My_Districts.py", *sys.argv[1:]]
+    sys.exit(cli.main())
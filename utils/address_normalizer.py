@@ -0,0 +1,364 @@
+import re
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+
+# USPS Publication 28 street suffix abbreviations (common forms seen in Hamilton County)
+STREET_SUFFIXES = {
+    'ALLEY': 'ALY', 'ALLEE': 'ALY', 'ALLY': 'ALY', 'ALY': 'ALY',
+    'AVENUE': 'AVE', 'AV': 'AVE', 'AVEN': 'AVE', 'AVENU': 'AVE', 'AVN': 'AVE', 'AVNUE': 'AVE', 'AVE': 'AVE',
+    'BEND': 'BND', 'BND': 'BND',
+    'BLUFF': 'BLF', 'BLUF': 'BLF', 'BLF': 'BLF',
+    'BOULEVARD': 'BLVD', 'BOUL': 'BLVD', 'BOULV': 'BLVD', 'BLVD': 'BLVD',
+    'BRANCH': 'BR', 'BRNCH': 'BR', 'BR': 'BR',
+    'BRIDGE': 'BRG', 'BRDGE': 'BRG', 'BRG': 'BRG',
+    'BROOK': 'BRK', 'BRK': 'BRK',
+    'BYPASS': 'BYP', 'BYPA': 'BYP', 'BYPS': 'BYP', 'BYP': 'BYP',
+    'CIRCLE': 'CIR', 'CIRC': 'CIR', 'CIRCL': 'CIR', 'CRCL': 'CIR', 'CRCLE': 'CIR', 'CIR': 'CIR',
+    'COURT': 'CT', 'CRT': 'CT', 'CT': 'CT',
+    'COVE': 'CV', 'CV': 'CV',
+    'CREEK': 'CRK', 'CRK': 'CRK',
+    'CROSSING': 'XING', 'CRSSNG': 'XING', 'XING': 'XING',
+    'DRIVE': 'DR', 'DRIV': 'DR', 'DRV': 'DR', 'DR': 'DR',
+    'EXPRESSWAY': 'EXPY', 'EXPRESS': 'EXPY', 'EXPW': 'EXPY', 'EXPY': 'EXPY',
+    'EXTENSION': 'EXT', 'EXTN': 'EXT', 'EXTNSN': 'EXT', 'EXT': 'EXT',
+    'FREEWAY': 'FWY', 'FRWY': 'FWY', 'FWY': 'FWY',
+    'GARDENS': 'GDNS', 'GDNS': 'GDNS',
+    'GLEN': 'GLN', 'GLN': 'GLN',
+    'HEIGHTS': 'HTS', 'HTS': 'HTS',
+    'HIGHWAY': 'HWY', 'HIGHWY': 'HWY', 'HIWAY': 'HWY', 'HIWY': 'HWY', 'HWAY': 'HWY', 'HWY': 'HWY',
+    'HILL': 'HL', 'HL': 'HL',
+    'HOLLOW': 'HOLW', 'HLLW': 'HOLW', 'HOLLOWS': 'HOLW', 'HOLW': 'HOLW',
+    'LANE': 'LN', 'LN': 'LN',
+    'LOOP': 'LOOP', 'LOOPS': 'LOOP',
+    'MOUNTAIN': 'MTN', 'MNTAIN': 'MTN', 'MNTN': 'MTN', 'MOUNTIN': 'MTN', 'MTIN': 'MTN', 'MTN': 'MTN',
+    'PARKWAY': 'PKWY', 'PARKWY': 'PKWY', 'PKWAY': 'PKWY', 'PKY': 'PKWY', 'PKWY': 'PKWY',
+    'PIKE': 'PIKE', 'PIKES': 'PIKE',
+    'PLACE': 'PL', 'PL': 'PL',
+    'PLAZA': 'PLZ', 'PLZA': 'PLZ', 'PLZ': 'PLZ',
+    'POINT': 'PT', 'PT': 'PT',
+    'RIDGE': 'RDG', 'RDGE': 'RDG', 'RDG': 'RDG',
+    'ROAD': 'RD', 'RD': 'RD',
+    'ROW': 'ROW',
+    'RUN': 'RUN',
+    'SQUARE': 'SQ', 'SQR': 'SQ', 'SQRE': 'SQ', 'SQU': 'SQ', 'SQ': 'SQ',
+    'STREET': 'ST', 'STRT': 'ST', 'STR': 'ST', 'ST': 'ST',
+    'TERRACE': 'TER', 'TERR': 'TER', 'TER': 'TER',
+    'TRACE': 'TRCE', 'TRACES': 'TRCE', 'TRCE': 'TRCE',
+    'TRAIL': 'TRL', 'TRAILS': 'TRL', 'TRLS': 'TRL', 'TRL': 'TRL',
+    'TURNPIKE': 'TPKE', 'TRNPK': 'TPKE', 'TURNPK': 'TPKE', 'TPKE': 'TPKE',
+    'VIEW': 'VW', 'VW': 'VW',
+    'VILLAGE': 'VLG', 'VILL': 'VLG', 'VILLAG': 'VLG', 'VLG': 'VLG',
+    'WAY': 'WAY', 'WY': 'WAY',
+}
+
+DIRECTIONALS = {
+    'NORTH': 'N', 'N': 'N',
+    'SOUTH': 'S', 'S': 'S',
+    'EAST': 'E', 'E': 'E',
+    'WEST': 'W', 'W': 'W',
+    'NORTHEAST': 'NE', 'NE': 'NE',
+    'NORTHWEST': 'NW', 'NW': 'NW',
+    'SOUTHEAST': 'SE', 'SE': 'SE',
+    'SOUTHWEST': 'SW', 'SW': 'SW',
+}
+
+UNIT_DESIGNATORS = {
+    'APARTMENT': 'APT', 'APT': 'APT',
+    'BUILDING': 'BLDG', 'BLDG': 'BLDG',
+    'FLOOR': 'FL', 'FL': 'FL',
+    'SUITE': 'STE', 'STE': 'STE',
+    'UNIT': 'UNIT',
+    'ROOM': 'RM', 'RM': 'RM',
+    'LOT': 'LOT',
+    'TRAILER': 'TRLR', 'TRLR': 'TRLR',
+    '#': '#',
+}
+
+ORDINALS = {
+    'FIRST': '1ST', 'SECOND': '2ND', 'THIRD': '3RD', 'FOURTH': '4TH', 'FIFTH': '5TH',
+    'SIXTH': '6TH', 'SEVENTH': '7TH', 'EIGHTH': '8TH', 'NINTH': '9TH', 'TENTH': '10TH',
+}
+
+STATES = {'TN': 'TN', 'TENN': 'TN', 'TENNESSEE': 'TN', 'GA': 'GA', 'GEORGIA': 'GA'}
+
+# Multi-word place names are matched before splitting on whitespace
+KNOWN_CITIES = [
+    'CHATTANOOGA', 'EAST RIDGE', 'RED BANK', 'SIGNAL MOUNTAIN', 'LOOKOUT MOUNTAIN',
+    'COLLEGEDALE', 'HIXSON', 'OOLTEWAH', 'SODDY DAISY', 'SODDY-DAISY', 'LAKESITE',
+    'WALDEN', 'HARRISON', 'ROSSVILLE',
+]
+
+# USPS city of the Hamilton County ZIP codes outside Chattanooga, used when an address gives only the ZIP
+ZIP_CITIES = {
+    '37302': 'APISON', '37308': 'BIRCHWOOD', '37315': 'COLLEGEDALE', '37341': 'HARRISON',
+    '37343': 'HIXSON', '37350': 'LOOKOUT MOUNTAIN', '37351': 'LUPTON CITY', '37363': 'OOLTEWAH',
+    '37373': 'SALE CREEK', '37377': 'SIGNAL MOUNTAIN', '37379': 'SODDY DAISY', '37384': 'SODDY DAISY',
+    '30741': 'ROSSVILLE',
+}
+
+DEFAULT_CITY = 'CHATTANOOGA'
+DEFAULT_STATE = 'TN'
+
+ZIP_PATTERN = re.compile(r'\b(\d{5})(?:-\d{4})?\s*$')
+HOUSE_NUMBER_PATTERN = re.compile(r'^\d+(?:-\d+)?[A-Z]?$|^\d+/\d+$')
+PUNCTUATION_PATTERN = re.compile(r'[^\w\s#/-]')
+ORDINAL_NUMBER_PATTERN = re.compile(r'^\d+(?:ST|ND|RD|TH)$')
+
+@dataclass(frozen=True)
+class AddressComponents:
+    number: str = ''
+    predirectional: str = ''
+    street_name: str = ''
+    suffix: str = ''
+    postdirectional: str = ''
+    unit_type: str = ''
+    unit_number: str = ''
+    city: str = ''
+    state: str = ''
+    zip_code: str = ''
+
+    @property
+    def street_line(self) -> str:
+        """Delivery line without the unit, e.g. '123 N MAIN ST'"""
+        parts = [self.number, self.predirectional, self.street_name, self.suffix, self.postdirectional]
+        return ' '.join(part for part in parts if part)
+
+    @property
+    def unit(self) -> str:
+        return ' '.join(part for part in [self.unit_type, self.unit_number] if part)
+
+def _clean(text: str) -> str:
+    """Uppercase, drop punctuation other than # / - and collapse whitespace"""
+    text = text.upper().replace('#', ' # ')
+    text = PUNCTUATION_PATTERN.sub(' ', text)
+    return ' '.join(text.split())
+
+def _split_unit(tokens):
+    """Pull a unit designator and its number off the street tokens"""
+    for i, token in enumerate(tokens):
+        if token in UNIT_DESIGNATORS and i > 0:
+            unit_type = UNIT_DESIGNATORS[token]
+            unit_number = tokens[i + 1] if i + 1 < len(tokens) else ''
+            if unit_type == '#':
+                unit_type = 'UNIT' if unit_number else ''
+            rest = tokens[:i] + tokens[i + 2:]
+            return rest, unit_type, unit_number.lstrip('#')
+    return tokens, '', ''
+
+def _parse_street(tokens) -> dict:
+    """Split street tokens into number, directionals, name and suffix"""
+    parts = {'number': '', 'predirectional': '', 'street_name': '', 'suffix': '', 'postdirectional': ''}
+    tokens = list(tokens)
+
+    if tokens and HOUSE_NUMBER_PATTERN.match(tokens[0]):
+        parts['number'] = tokens.pop(0)
+
+    # "12 West Ave" keeps West as the street name
+    if len(tokens) > 1 and tokens[0] in DIRECTIONALS and not (len(tokens) == 2 and tokens[1] in STREET_SUFFIXES):
+        parts['predirectional'] = DIRECTIONALS[tokens.pop(0)]
+
+    if len(tokens) > 1 and tokens[-1] in DIRECTIONALS and tokens[-2] in STREET_SUFFIXES:
+        parts['postdirectional'] = DIRECTIONALS[tokens.pop()]
+
+    if len(tokens) > 1 and tokens[-1] in STREET_SUFFIXES:
+        parts['suffix'] = STREET_SUFFIXES[tokens.pop()]
+
+    parts['street_name'] = ' '.join(ORDINALS.get(token, token) for token in tokens)
+    return parts
+
+@lru_cache(maxsize=4096)
+def parse_address(address: str) -> AddressComponents:
+    """
+    Parse a free-form address into USPS-style components. Missing city and state
+    are left empty; see normalize_address for the Chattanooga defaults.
+    """
+    if not address:
+        return AddressComponents()
+
+    segments = [_clean(segment) for segment in address.split(',')]
+    segments = [segment for segment in segments if segment]
+    if not segments:
+        return AddressComponents()
+
+    # ZIP code: trailing five digits, never the house number at the very start
+    zip_code = ''
+    last = segments[-1]
+    zip_match = ZIP_PATTERN.search(last)
+    if zip_match and not (len(segments) == 1 and zip_match.start() == 0):
+        zip_code = zip_match.group(1)
+        last = last[:zip_match.start()].strip()
+        segments[-1] = last
+        segments = [segment for segment in segments if segment]
+
+    # State: trailing token of the last segment
+    state = ''
+    if segments:
+        tokens = segments[-1].split()
+        if tokens and tokens[-1] in STATES and (len(segments) > 1 or len(tokens) > 2):
+            state = STATES[tokens.pop()]
+            segments[-1] = ' '.join(tokens)
+            segments = [segment for segment in segments if segment]
+
+    # City: its own segment, or a known place name at the end of the street segment
+    city = ''
+    if len(segments) > 1 and not HOUSE_NUMBER_PATTERN.match(segments[-1].split()[0]) \
+            and segments[-1].split()[0] not in UNIT_DESIGNATORS:
+        city = segments.pop()
+    elif segments:
+        for known in KNOWN_CITIES:
+            if segments[0].endswith(' ' + known):
+                city = known
+                segments[0] = segments[0][:-len(known)].strip()
+                break
+    city = city.replace('SODDY-DAISY', 'SODDY DAISY')
+
+    # Any remaining segments after the first hold the unit ("123 Main St, Apt 4")
+    tokens = ' '.join(segments).split()
+    tokens, unit_type, unit_number = _split_unit(tokens)
+
+    return AddressComponents(
+        unit_type=unit_type,
+        unit_number=unit_number,
+        city=city,
+        state=state,
+        zip_code=zip_code,
+        **_parse_street(tokens)
+    )
+
+def city_of(components: AddressComponents) -> str:
+    """The city as written, else the ZIP code's city, else Chattanooga"""
+    return components.city or ZIP_CITIES.get(components.zip_code, DEFAULT_CITY)
+
+def normalize_address(address: str) -> str:
+    """
+    Canonical USPS-style address, e.g. '123 N MAIN ST APT 4, CHATTANOOGA, TN 37405'
+    """
+    components = parse_address(address)
+    line = ' '.join(part for part in [components.street_line, components.unit] if part)
+    locality = f"{city_of(components)}, {components.state or DEFAULT_STATE}"
+    if components.zip_code:
+        locality = f"{locality} {components.zip_code}"
+    return f"{line}, {locality}"
+
+def canonical_key(address: str) -> str:
+    """
+    Cache key shared by every spelling of the same location. Units are left
+    out, since they do not move the geocoded point; the ZIP code is kept, since
+    the same street address exists in more than one ZIP code in the county.
+    """
+    components = parse_address(address)
+    state = components.state or DEFAULT_STATE
+    return f"{components.street_line}|{city_of(components)}|{state}|{components.zip_code}".lower()
+
+def _word_case(word: str, written: dict) -> str:
+    """
+    One normalized word in mixed case: as the visitor wrote it if they mixed
+    case themselves ('McCallie'), else capitalized, with ordinals ('5th') and
+    directionals ('NE') kept in their usual form
+    """
+    spelling = written.get(word)
+    if spelling and not spelling.isupper() and not spelling.islower():
+        return spelling
+    if ORDINAL_NUMBER_PATTERN.match(word):
+        return word.lower()
+    if word[:1].isdigit() or word in DIRECTIONALS.values():
+        return word
+    return '-'.join(part.capitalize() for part in word.split('-'))
+
+def _display_case(text: str, address: str) -> str:
+    written = {}
+    for token in PUNCTUATION_PATTERN.sub(' ', address.replace('#', ' ')).split():
+        written.setdefault(token.upper(), token)
+    return ' '.join(_word_case(word, written) for word in text.split())
+
+def geocode_query(address: str) -> str:
+    """
+    Query string sent to the geocoder: the normalized delivery line without the
+    unit, plus city, state and ZIP, e.g. '100 E 5th St, Chattanooga, TN 37403'
+    """
+    components = parse_address(address)
+    locality = f"{_display_case(city_of(components), address)}, {components.state or DEFAULT_STATE}"
+    if components.zip_code:
+        locality = f"{locality} {components.zip_code}"
+    return f"{_display_case(components.street_line, address)}, {locality}"
+
+# Input spellings and the canonical key each must produce
+ADDRESS_CORPUS = [
+    ("123 Main Street", "123 main st|chattanooga|tn|"),
+    ("123 main st.", "123 main st|chattanooga|tn|"),
+    ("123 MAIN ST, 37405", "123 main st|chattanooga|tn|37405"),
+    ("123 Main St, Chattanooga, TN 37405", "123 main st|chattanooga|tn|37405"),
+    ("123  Main   St.,  Chattanooga,  Tennessee  37405-1234", "123 main st|chattanooga|tn|37405"),
+    ("123 Main St Apt 4B, 37405", "123 main st|chattanooga|tn|37405"),
+    ("123 Main St, Apt. 4B", "123 main st|chattanooga|tn|"),
+    ("123 Main St #4", "123 main st|chattanooga|tn|"),
+    ("1010 North Moore Road", "1010 n moore rd|chattanooga|tn|"),
+    ("1010 N. Moore Rd., 37411", "1010 n moore rd|chattanooga|tn|37411"),
+    ("5600 Brainerd Road Suite 100", "5600 brainerd rd|chattanooga|tn|"),
+    ("4501 Amnicola Highway", "4501 amnicola hwy|chattanooga|tn|"),
+    ("1517 Tombras Ave, East Ridge, TN 37412", "1517 tombras ave|east ridge|tn|37412"),
+    ("1517 Tombras Avenue East Ridge TN 37412", "1517 tombras ave|east ridge|tn|37412"),
+    ("100 E. 11th St.", "100 e 11th st|chattanooga|tn|"),
+    ("100 East Eleventh Street", "100 e eleventh st|chattanooga|tn|"),
+    ("200 First Street", "200 1st st|chattanooga|tn|"),
+    ("700 River Terminal Rd, Chattanooga, TN 37406", "700 river terminal rd|chattanooga|tn|37406"),
+    ("301 Battery Pl", "301 battery pl|chattanooga|tn|"),
+    ("1 Broad St SW", "1 broad st sw|chattanooga|tn|"),
+    ("850 Market Street, Chattanooga TN", "850 market st|chattanooga|tn|"),
+    ("2 S Crest Rd Unit 3", "2 s crest rd|chattanooga|tn|"),
+    ("5 Signal Mountain Blvd, Signal Mountain, TN 37377", "5 signal mountain blvd|signal mountain|tn|37377"),
+    ("12 West Ave", "12 west ave|chattanooga|tn|"),
+    ("37405", "37405|chattanooga|tn|"),
+    # Same street line in two ZIP codes: different places, never one cache entry
+    ("123 Main St, 37343", "123 main st|hixson|tn|37343"),
+    ("4001 Hixson Pike, 37415", "4001 hixson pike|chattanooga|tn|37415"),
+    ("4001 Hixson Pike, 37343", "4001 hixson pike|hixson|tn|37343"),
+    # Ordinals, written out or as numbers
+    ("500 5th St", "500 5th st|chattanooga|tn|"),
+    ("500 Fifth Street", "500 5th st|chattanooga|tn|"),
+    ("800 McCallie Ave, 37403", "800 mccallie ave|chattanooga|tn|37403"),
+    ("3 E 23RD ST", "3 e 23rd st|chattanooga|tn|"),
+]
+
+# Input spellings and the query each must send to the geocoder
+GEOCODE_QUERY_CORPUS = [
+    ("500 5th St", "500 5th St, Chattanooga, TN"),
+    ("500 FIFTH STREET", "500 5th St, Chattanooga, TN"),
+    ("3 e 23rd st", "3 E 23rd St, Chattanooga, TN"),
+    ("800 McCallie Ave, 37403", "800 McCallie Ave, Chattanooga, TN 37403"),
+    ("800 MCCALLIE AVE, 37403", "800 Mccallie Ave, Chattanooga, TN 37403"),
+    ("1 Broad St SW Apt 2, 37402", "1 Broad St SW, Chattanooga, TN 37402"),
+    ("4001 hixson pike, 37343", "4001 Hixson Pike, Hixson, TN 37343"),
+    ("1517 Tombras Ave, East Ridge, TN 37412", "1517 Tombras Ave, East Ridge, TN 37412"),
+]
+
+if __name__ == '__main__':
+    # Check the corpus and report throughput, since this runs on every lookup
+    failures = [(raw, canonical_key(raw), expected) for raw, expected in ADDRESS_CORPUS
+                if canonical_key(raw) != expected]
+    for raw, got, expected in failures:
+        print(f"MISMATCH {raw!r}: got {got!r}, expected {expected!r}")
+    print(f"{len(ADDRESS_CORPUS) - len(failures)}/{len(ADDRESS_CORPUS)} corpus addresses normalized as expected")
+
+    failures = [(raw, geocode_query(raw), expected) for raw, expected in GEOCODE_QUERY_CORPUS
+                if geocode_query(raw) != expected]
+    for raw, got, expected in failures:
+        print(f"MISMATCH {raw!r}: got {got!r}, expected {expected!r}")
+    print(f"{len(GEOCODE_QUERY_CORPUS) - len(failures)}/{len(GEOCODE_QUERY_CORPUS)} geocoder queries cased as expected")
+
+    iterations = 2000
+    inputs = [raw for raw, _ in ADDRESS_CORPUS]
+    start = time.perf_counter()
+    for i in range(iterations):
+        for raw in inputs:
+            parse_address.__wrapped__(raw)
+    elapsed = time.perf_counter() - start
+    print(f"Uncached parse: {iterations * len(inputs) / elapsed:,.0f} addresses/sec")
+
+    start = time.perf_counter()
+    for i in range(iterations):
+        for raw in inputs:
+            canonical_key(raw)
+    elapsed = time.perf_counter() - start
+    print(f"Cached canonical_key: {iterations * len(inputs) / elapsed:,.0f} addresses/sec")
@@ -0,0 +1,123 @@
+import os
+import tempfile
+import time
+import pandas as pd
+import numpy as np
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Optional, Union
+from utils.geocoding import geocode_addresses
+from utils.district_data import find_nearest_polling_places, polling_places_for_precincts
+from utils.boundary_sets import AFTER, BEFORE
+from utils.jurisdictions import NOT_FOUND, PRECINCT_LAYER, boundary_set_layer, lookup_jurisdictions_for_points
+
+ADDRESS_COLUMNS = ['address', 'street_address', 'street']
+ZIP_COLUMNS = ['zip', 'zip_code', 'zipcode', 'postal_code']
+# Results are written here while a lookup runs. Each chunk appends to its file, so one
+# untouched for RESULTS_MAX_AGE seconds belongs to a run that died or was abandoned.
+RESULTS_DIR = Path(os.environ.get("BATCH_RESULTS_DIR", ".cache/batch_results"))
+RESULTS_MAX_AGE = 3600
+RESULT_COLUMNS = ['latitude', 'longitude', 'district', 'new_district', 'precinct', 'polling_place', 'polling_address']
+
+def find_column(columns, candidates) -> Optional[str]:
+    """Find the first column whose normalized name matches one of the candidates"""
+    normalized = {str(column).strip().lower().replace(' ', '_'): column for column in columns}
+    for candidate in candidates:
+        if candidate in normalized:
+            return normalized[candidate]
+    return None
+
+def build_addresses(chunk: pd.DataFrame, address_column: str, zip_column: Optional[str]) -> pd.Series:
+    """Combine street address and optional ZIP code columns into one address string"""
+    addresses = chunk[address_column].fillna('').astype(str).str.strip()
+    if zip_column:
+        zips = chunk[zip_column].fillna('').astype(str).str.strip().str[:5]
+        addresses = addresses.where(zips == '', addresses + ', ' + zips)
+    return addresses
+
+def process_chunk(chunk: pd.DataFrame, address_column: str, zip_column: Optional[str]) -> pd.DataFrame:
+    """Geocode one chunk of rows and attach district, precinct and polling place"""
+    addresses = build_addresses(chunk, address_column, zip_column)
+    coords = geocode_addresses(addresses)
+
+    lats = np.array([coords[a][0] if coords.get(a) else np.nan for a in addresses], dtype=float)
+    lons = np.array([coords[a][1] if coords.get(a) else np.nan for a in addresses], dtype=float)
+
+    result = chunk.copy()
+    result['latitude'] = lats
+    result['longitude'] = lons
+    # Council district now and after the 2025 redistricting, and precinct, from one jurisdiction lookup
+    layers = lookup_jurisdictions_for_points(lats, lons)
+    result['district'] = layers[boundary_set_layer(BEFORE)].replace(
+        NOT_FOUND, "District not found").to_numpy()
+    result['new_district'] = layers[boundary_set_layer(AFTER)].replace(NOT_FOUND, "District not found").to_numpy()
+
+    # Polling place from the precinct polygon where one matched, else the nearest site
+    precincts = (layers[PRECINCT_LAYER].to_numpy() if PRECINCT_LAYER in layers
+                 else np.full(len(lats), NOT_FOUND, dtype=object))
+    polling = polling_places_for_precincts(precincts)
+    unmatched = precincts == NOT_FOUND
+    if unmatched.any():
+        polling.loc[unmatched, :] = find_nearest_polling_places(lats[unmatched], lons[unmatched]).to_numpy()
+
+    in_district = result['district'].to_numpy() != "District not found"
+    for column in ['precinct', 'polling_place', 'polling_address']:
+        result[column] = np.where(in_district, polling[column].to_numpy(), "Not found")
+
+    return result
+
+def sweep_results(directory: Path = RESULTS_DIR, max_age: float = RESULTS_MAX_AGE) -> int:
+    """Delete results files not written to for max_age seconds; returns how many were removed"""
+    removed = 0
+    cutoff = time.time() - max_age
+    for path in directory.glob("batch_lookup_*.csv"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError:
+            continue  # Swept by another session
+    return removed
+
+def new_results_path(directory: Path = RESULTS_DIR) -> Path:
+    """Create an empty results file for one run, sweeping abandoned ones first"""
+    directory.mkdir(parents=True, exist_ok=True)
+    sweep_results(directory)
+    fd, name = tempfile.mkstemp(prefix="batch_lookup_", suffix=".csv", dir=directory)
+    os.close(fd)
+    return Path(name)
+
+def process_address_csv(
+    source: Union[str, Path, BinaryIO],
+    output_path: Union[str, Path],
+    chunk_size: int = 200,
+    progress_callback: Optional[Callable[[int, int], None]] = None
+) -> Dict[str, int]:
+    """
+    Stream an address CSV in chunks and append the lookup results to output_path.
+    Only one chunk of input and results is held in memory at a time.
+    """
+    output_path = Path(output_path)
+    summary = {"rows": 0, "geocoded": 0, "matched": 0}
+
+    reader = pd.read_csv(source, chunksize=chunk_size, dtype=str, keep_default_na=False)
+    address_column = zip_column = None
+
+    for chunk in reader:
+        if address_column is None:
+            address_column = find_column(chunk.columns, ADDRESS_COLUMNS)
+            zip_column = find_column(chunk.columns, ZIP_COLUMNS)
+            if address_column is None:
+                raise ValueError("CSV must include an 'address' column")
+
+        result = process_chunk(chunk, address_column, zip_column)
+        result.to_csv(output_path, mode='w' if summary["rows"] == 0 else 'a',
+                      header=summary["rows"] == 0, index=False)
+
+        summary["rows"] += len(result)
+        summary["geocoded"] += int(result['latitude'].notna().sum())
+        summary["matched"] += int((result['district'] != "District not found").sum())
+
+        if progress_callback:
+            progress_callback(summary["rows"], summary["geocoded"])
+
+    return summary
@@ -0,0 +1,179 @@
+"""
+Versioned council district boundaries. Each boundary set has an effective
+date range, so one lookup answers both "what is my district" and "did it
+change with the 2025 redistricting" without geocoding twice.
+
+    python -m utils.boundary_sets areas --geojson changed_areas.json
+    python -m utils.boundary_sets addresses voters.csv --output voters_changes.csv
+"""
+import argparse
+import json
+import math
+import re
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+import shapely
+from shapely.strtree import STRtree
+from utils.cache_stats import tracked_cache_resource
+from utils.district_data import assign_districts
+
+@dataclass(frozen=True)
+class BoundarySet:
+    name: str
+    label: str
+    source: str                      # Table in utils.geometry_store
+    district_column: str
+    effective_from: Optional[date] = None
+    effective_until: Optional[date] = None
+
+    def is_effective(self, on: date) -> bool:
+        return ((self.effective_from is None or self.effective_from <= on)
+                and (self.effective_until is None or on <= self.effective_until))
+
+# Ordered oldest first; the new council districts take effect when the council elected in 2025 is seated
+BOUNDARY_SETS: Dict[str, BoundarySet] = {
+    "current": BoundarySet("current", "Districts through April 13, 2025", "council_districts", "citydst",
+                           effective_until=date(2025, 4, 13)),
+    "redistricted": BoundarySet("redistricted", "Districts from April 14, 2025", "redistricting_new",
+                                "district_name", effective_from=date(2025, 4, 14)),
+}
+BEFORE, AFTER = "current", "redistricted"
+
+def district_id(value) -> str:
+    """'District 9', 9 and '9' all become '9'"""
+    match = re.search(r'\d+', str(value))
+    return match.group(0) if match else str(value)
+
+def active_boundary_set(on: Optional[date] = None) -> BoundarySet:
+    """The boundary set in force on a date (today by default)"""
+    on = on or date.today()
+    for boundary_set in reversed(BOUNDARY_SETS.values()):
+        if boundary_set.is_effective(on):
+            return boundary_set
+    return next(iter(BOUNDARY_SETS.values()))
+
+@tracked_cache_resource(ttl=3600)  # Rebuilt with the boundary files
+def get_boundary_index(name: str) -> Tuple[STRtree, np.ndarray, np.ndarray]:
+    """STR-tree, district ids and polygons for one boundary set"""
+    # The polygons come from the combined jurisdiction index, which already loaded them
+    from utils.jurisdictions import boundary_set_layer, get_jurisdiction_index
+    names, geometries = get_jurisdiction_index().layer(boundary_set_layer(name))
+    return STRtree(geometries), names, geometries
+
+def districts_for_points(lats: np.ndarray, lons: np.ndarray, sets: Optional[List[str]] = None) -> pd.DataFrame:
+    """One column of districts per boundary set, plus whether the district changed"""
+    sets = sets or list(BOUNDARY_SETS)
+    result = pd.DataFrame({
+        name: assign_districts(*get_boundary_index(name)[:2], lats, lons)
+        for name in sets
+    })
+    if BEFORE in result and AFTER in result:
+        found = (result[BEFORE] != "District not found") & (result[AFTER] != "District not found")
+        result["district_changed"] = found & (result[BEFORE] != result[AFTER])
+    return result
+
+def lookup_districts(lat: float, lon: float) -> Dict[str, str]:
+    """District under every boundary set for one point"""
+    row = districts_for_points(np.array([lat]), np.array([lon])).iloc[0]
+    return {name: row[name] for name in BOUNDARY_SETS}
+
+def _km2_factors(geometries: np.ndarray) -> Tuple[float, float]:
+    """Degrees to kilometers around the city's latitude; plenty for areas this small"""
+    center_lat = shapely.centroid(shapely.union_all(geometries)).y
+    return 111.32 * math.cos(math.radians(center_lat)), 110.57
+
+def district_change_areas(min_km2: float = 0.001) -> Tuple[pd.DataFrame, List[dict]]:
+    """
+    Overlay the old and new districts. Returns one row per (old, new) pair that
+    overlaps, with its area and share of the old district, and GeoJSON features
+    for the pieces that moved to a different district.
+    """
+    _, before_names, before_geoms = get_boundary_index(BEFORE)
+    after_tree, after_names, after_geoms = get_boundary_index(AFTER)
+    x_km, y_km = _km2_factors(before_geoms)
+
+    # Candidate pairs from the spatial index, then exact intersections for just those
+    before_idx, after_idx = after_tree.query(before_geoms, predicate="intersects")
+    pieces = shapely.intersection(before_geoms[before_idx], after_geoms[after_idx])
+    areas = shapely.area(pieces) * x_km * y_km
+    keep = areas >= min_km2
+
+    rows = pd.DataFrame({
+        BEFORE: before_names[before_idx][keep],
+        AFTER: after_names[after_idx][keep],
+        "area_km2": areas[keep].round(3),
+    })
+    old_area = pd.Series(shapely.area(before_geoms) * x_km * y_km, index=before_names)
+    rows["share_of_old"] = (rows["area_km2"] / old_area[rows[BEFORE]].to_numpy()).round(4)
+    rows["changed"] = rows[BEFORE] != rows[AFTER]
+
+    features = [
+        {
+            "type": "Feature",
+            "properties": {BEFORE: old, AFTER: new, "area_km2": round(float(area), 3)},
+            "geometry": json.loads(geometry),
+        }
+        for old, new, area, geometry in zip(
+            rows[BEFORE], rows[AFTER], rows["area_km2"], shapely.to_geojson(pieces[keep])
+        )
+        if old != new
+    ]
+    return rows.sort_values([BEFORE, "area_km2"], ascending=[True, False]).reset_index(drop=True), features
+
+def address_changes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Old and new district for every row. Uses latitude/longitude columns when
+    present and geocodes the address column otherwise.
+    """
+    from utils.batch_lookup import ADDRESS_COLUMNS, ZIP_COLUMNS, build_addresses, find_column
+
+    lat_column = find_column(df.columns, ['latitude', 'lat'])
+    lon_column = find_column(df.columns, ['longitude', 'lon', 'lng'])
+    if lat_column and lon_column:
+        lats = pd.to_numeric(df[lat_column], errors='coerce').to_numpy(dtype=float)
+        lons = pd.to_numeric(df[lon_column], errors='coerce').to_numpy(dtype=float)
+    else:
+        from utils.geocoding import geocode_addresses
+        address_column = find_column(df.columns, ADDRESS_COLUMNS)
+        if address_column is None:
+            raise ValueError("CSV must include latitude/longitude or an 'address' column")
+        addresses = build_addresses(df, address_column, find_column(df.columns, ZIP_COLUMNS))
+        coords = geocode_addresses(addresses)
+        lats = np.array([coords[a][0] if coords.get(a) else np.nan for a in addresses], dtype=float)
+        lons = np.array([coords[a][1] if coords.get(a) else np.nan for a in addresses], dtype=float)
+
+    result = df.copy()
+    result['latitude'] = lats
+    result['longitude'] = lons
+    districts = districts_for_points(lats, lons)
+    for column in districts.columns:
+        result[f"district_{column}" if column in BOUNDARY_SETS else column] = districts[column].to_numpy()
+    return result
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare the pre- and post-redistricting council districts")
+    commands = parser.add_subparsers(dest='command', required=True)
+    areas_parser = commands.add_parser('areas', help="Area of each old district that moved to each new one")
+    areas_parser.add_argument('--geojson', type=Path, help="Write the areas that changed district as GeoJSON")
+    addresses_parser = commands.add_parser('addresses', help="Old and new district for each row of a CSV")
+    addresses_parser.add_argument('input', type=Path)
+    addresses_parser.add_argument('--output', type=Path)
+    args = parser.parse_args()
+
+    if args.command == 'areas':
+        rows, features = district_change_areas()
+        print(rows.to_string(index=False))
+        moved = rows.loc[rows["changed"], "area_km2"].sum()
+        print(f"\n{moved:.2f} of {rows['area_km2'].sum():.2f} km² changed district")
+        if args.geojson:
+            args.geojson.write_text(json.dumps({"type": "FeatureCollection", "features": features}))
+            print(f"Wrote {len(features)} changed areas to {args.geojson}")
+    else:
+        result = address_changes(pd.read_csv(args.input, dtype=str, keep_default_na=False))
+        output = args.output or args.input.with_name(f"{args.input.stem}_district_changes.csv")
+        result.to_csv(output, index=False)
+        print(f"{int(result['district_changed'].sum())} of {len(result)} rows changed district; wrote {output}")
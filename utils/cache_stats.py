@@ -0,0 +1,213 @@
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple, Union
+import streamlit as st
+from streamlit.runtime.caching.cache_type import CacheType
+from streamlit.runtime.caching.hashing import update_hash
+from utils.metrics import register_collector
+
+# Measuring entry sizes pickles every computed value a second time, so it is off
+# unless CACHE_SIZE_STATS=1; cache_resource values are shared objects and never sized
+SIZE_STATS = os.environ.get("CACHE_SIZE_STATS", "") == "1"
+
+def _ttl_seconds(ttl: Union[float, timedelta, None]) -> Optional[float]:
+    if ttl is None:
+        return None
+    if isinstance(ttl, timedelta):
+        return ttl.total_seconds()
+    return float(ttl)
+
+def _arg_key(signature: inspect.Signature, cache_type: CacheType, args: tuple, kwargs: dict) -> str:
+    """
+    Digest of a call's arguments, hashed the way Streamlit keys its own cache:
+    by value, skipping parameters whose name starts with an underscore
+    """
+    hasher = hashlib.new("md5", usedforsecurity=False)
+    try:
+        arguments = signature.bind_partial(*args, **kwargs).arguments
+    except TypeError:
+        arguments = dict(enumerate(args), **kwargs)
+    for name, value in arguments.items():
+        if str(name).startswith("_"):
+            continue
+        hasher.update(str(name).encode("utf-8"))
+        try:
+            update_hash(value, hasher, cache_type)
+        except Exception:
+            # Only counted, never used to look anything up; the type is the best we can do
+            hasher.update(type(value).__qualname__.encode("utf-8"))
+    return hasher.hexdigest()
+
+def _approximate_size(value: Any) -> int:
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+@dataclass
+class CacheStats:
+    """Counters for one cached function, kept alongside Streamlit's own cache"""
+    name: str
+    kind: str
+    ttl: Optional[float] = None
+    max_entries: Optional[int] = None
+    hits: int = 0
+    misses: int = 0
+    expirations: int = 0
+    evictions: int = 0
+    compute_seconds: float = 0.0
+    sized: bool = False
+    entries: Dict[str, Tuple[int, float]] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def _drop_expired(self, now: float):
+        if self.ttl is None:
+            return
+        expired = [key for key, (_, created) in self.entries.items() if now - created >= self.ttl]
+        for key in expired:
+            del self.entries[key]
+        self.expirations += len(expired)
+
+    def record_hit(self):
+        with self.lock:
+            self.hits += 1
+
+    def record_miss(self, key: str, seconds: float, size: int):
+        now = time.monotonic()
+        with self.lock:
+            self.misses += 1
+            self.compute_seconds += seconds
+            self._drop_expired(now)
+            if key in self.entries:
+                # Recomputed before its TTL ran out, so Streamlit dropped it early
+                self.evictions += 1
+            self.entries[key] = (size, now)
+            if self.max_entries is not None and len(self.entries) > self.max_entries:
+                oldest = min(self.entries, key=lambda k: self.entries[k][1])
+                del self.entries[oldest]
+                self.evictions += 1
+
+    def record_clear(self):
+        with self.lock:
+            self.evictions += len(self.entries)
+            self.entries.clear()
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            self._drop_expired(time.monotonic())
+            calls = self.hits + self.misses
+            return {
+                "name": self.name,
+                "kind": self.kind,
+                "ttl_seconds": self.ttl,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / calls if calls else 0.0,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+                "approx_bytes": sum(size for size, _ in self.entries.values()) if self.sized else None,
+                "compute_seconds": self.compute_seconds,
+                "mean_compute_ms": 1000 * self.compute_seconds / self.misses if self.misses else 0.0,
+            }
+
+_registry_lock = threading.Lock()
+_registry: Dict[str, CacheStats] = {}
+_calls = threading.local()
+
+def _register(stats: CacheStats) -> CacheStats:
+    with _registry_lock:
+        # A module imported again keeps counting into the same stats
+        return _registry.setdefault(stats.name, stats)
+
+def _track(cache_decorator, kind: str, name: Optional[str], **cache_kwargs):
+    cache_type = CacheType.DATA if kind == "data" else CacheType.RESOURCE
+
+    def decorator(fn):
+        signature = inspect.signature(fn)
+        stats = _register(CacheStats(
+            name=name or f"{fn.__module__.split('.')[-1]}.{fn.__name__}",
+            kind=kind,
+            ttl=_ttl_seconds(cache_kwargs.get("ttl")),
+            max_entries=cache_kwargs.get("max_entries"),
+            sized=SIZE_STATS and cache_type is CacheType.DATA,
+        ))
+
+        @functools.wraps(fn)
+        def compute(*args, **kwargs):
+            # Only runs on a miss; flag the innermost tracked call on this thread
+            _calls.stack[-1] = True
+            start = time.perf_counter()
+            result = fn(*args, **kwargs)
+            seconds = time.perf_counter() - start
+            size = _approximate_size(result) if stats.sized else 0
+            stats.record_miss(_arg_key(signature, cache_type, args, kwargs), seconds, size)
+            return result
+
+        cached = cache_decorator(**cache_kwargs)(compute)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            stack = getattr(_calls, "stack", None)
+            if stack is None:
+                stack = _calls.stack = []
+            stack.append(False)
+            try:
+                return cached(*args, **kwargs)
+            finally:
+                if not stack.pop():
+                    stats.record_hit()
+
+        def clear(*args, **kwargs):
+            cached.clear(*args, **kwargs)
+            stats.record_clear()
+
+        wrapper.clear = clear
+        wrapper.cache_stats = stats
+        return wrapper
+    return decorator
+
+def tracked_cache_data(name: Optional[str] = None, **cache_kwargs):
+    """st.cache_data that also records hits, misses, evictions, compute time and, optionally, entry sizes"""
+    return _track(st.cache_data, "data", name, **cache_kwargs)
+
+def tracked_cache_resource(name: Optional[str] = None, **cache_kwargs):
+    """st.cache_resource with the same bookkeeping as tracked_cache_data, except entry sizes"""
+    return _track(st.cache_resource, "resource", name, **cache_kwargs)
+
+def cache_stats() -> List[dict]:
+    """Snapshot of every tracked cache, sorted by name"""
+    with _registry_lock:
+        registered = list(_registry.values())
+    return sorted((stats.snapshot() for stats in registered), key=lambda s: s["name"])
+
+def _prometheus_lines() -> List[str]:
+    snapshots = cache_stats()
+    lines = []
+    for metric, kind, help_text, field_name in [
+        ("chattanooga_vote_cache_hits_total", "counter", "Cached function calls answered from the cache", "hits"),
+        ("chattanooga_vote_cache_misses_total", "counter", "Cached function calls that ran the function", "misses"),
+        ("chattanooga_vote_cache_expirations_total", "counter", "Entries dropped after their TTL", "expirations"),
+        ("chattanooga_vote_cache_evictions_total", "counter", "Entries dropped before their TTL", "evictions"),
+        ("chattanooga_vote_cache_compute_seconds_total", "counter", "Time spent computing cache misses", "compute_seconds"),
+        ("chattanooga_vote_cache_entries", "gauge", "Approximate live entries", "entries"),
+        ("chattanooga_vote_cache_bytes", "gauge", "Approximate pickled size of live entries", "approx_bytes"),
+    ]:
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        for snapshot in snapshots:
+            if snapshot[field_name] is None:
+                continue
+            lines.append(f'{metric}{{cache="{snapshot["name"]}"}} {snapshot[field_name]}')
+    return lines
+
+register_collector(_prometheus_lines)
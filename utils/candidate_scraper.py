@@ -10,51 +10,12 @@ def get_candidate_info() -> Dict[str, Dict[str, Dict[str, str]]]:
     """
     Get information about all candidates including their verified websites
     """
-    candidates = {
-        "1": {
-            "Chip Henderson": {},
-            "James \"Skip\" Burnette": {}
-        },
-        "2": {
-            "Jenny Hill": {}
-        },
-        "3": {
-            "Jeff Davis": {},
-            "Tom Marshall": {}
-        },
-        "4": {
-            "Cody Harvey": {}
-        },
-        "5": {
-            "Isiah (Ike) Hester": {},
-            "Dennis Clark": {},
-            "Cory Hall": {},
-            "Samantha Reid-Hawkins": {}
-        },
-        "6": {
-            "Jenni Berz": {},
-            "Jennifer Gregory": {},
-            "Mark Holland": {},
-            "Christian Siler": {},
-            "Robert C Wilson": {}
-        },
-        "7": {
-            "Raquetta Dotley": {}
-        },
-        "8": {
-            "Marvene Noel": {},
-            "Anna Golladay": {},
-            "Doll Sandridge": {},
-            "Kelvin Scott": {}
-        },
-        "9": {
-            
-            "Ron Elliott": {},
-            "Letechia Ellis": {},
-            "Evelina Irén Kertay": {}
-        }
-    }
+    from utils.candidate_data import get_all_candidates
 
+    candidates = {}
+    for candidate in get_all_candidates():
+        info = {"website": candidate.contact.website} if candidate.contact and candidate.contact.website else {}
+        candidates.setdefault(candidate.district, {})[candidate.name] = info
     return candidates
 
 if __name__ == "__main__":
@@ -0,0 +1,257 @@
+"""
+Hot reload of the data files. A background thread polls the files each
+cache is built from; when a group of files changes (and has stopped changing
+for one poll), it bumps the data version, clears only the caches built from
+those files and warms them again, so new data is served within a few seconds
+without a restart.
+
+Values a session already holds are never mutated, so a request in progress
+finishes with the data it started with. The version is a hash of the files'
+contents, not their timestamps, so replicas holding their own copies of the
+same files agree on it. It is part of the shared district-info cache key, so
+replicas never serve each other stale results.
+
+Only serve.py starts the watcher (unless DATA_WATCH_INTERVAL=0). Under a plain
+`streamlit run` nothing polls: data_version() stays at the hash of the files
+as they were at startup, and changed data needs a restart to be picked up.
+
+    python -m utils.data_reload          # print the watched files and current version
+"""
+import glob
+import hashlib
+import importlib
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from streamlit.logger import get_logger
+from utils.metrics import register_collector
+
+logger = get_logger(__name__)
+
+# Seconds between polls; 0 turns the watcher off
+DATA_WATCH_INTERVAL = float(os.environ.get("DATA_WATCH_INTERVAL", "2"))
+
+@dataclass(frozen=True)
+class WatchedData:
+    name: str
+    paths: Tuple[str, ...]           # Files or glob patterns, relative to the repo root
+    caches: Tuple[str, ...]          # "module.function" of each cache built from them
+    warmup_steps: Tuple[str, ...] = ()   # utils.warmup steps that rebuild those caches
+
+# The district info cache holds polling place, boundary and candidate data, so every group clears it
+WATCHED_DATA: List[WatchedData] = [
+    WatchedData(
+        "polling_places",
+        ("assets/polling_places.csv",),
+        ("utils.district_data.get_polling_place_locations", "utils.district_data.get_precinct_assignments",
+         "utils.district_data.find_nearest_polling_place", "utils.district_data.get_district_info"),
+        ("polling_places",),
+    ),
+    WatchedData(
+        "district_boundaries",
+        ("assets/district_boundaries.json", "assets/district_boundaries.topo.json"),
+        ("utils.district_data.get_district_boundaries", "utils.district_data.get_district_topology",
+         "utils.district_data.get_district_index", "utils.district_data.get_district_for_coordinates",
+         "utils.district_data.get_service_area", "utils.district_data.get_district_info",
+         "utils.district_map.build_map_geometry"),
+        ("boundaries", "spatial_index", "service_area", "map_geometry"),
+    ),
+    WatchedData(
+        "jurisdictions",
+        ("attached_assets/*.csv", "assets/jurisdictions/*.geojson"),
+        ("utils.jurisdictions.get_jurisdiction_index", "utils.boundary_sets.get_boundary_index",
+         "utils.district_data.get_service_area", "utils.district_data.get_council_member",
+         "utils.district_data.get_district_info"),
+        ("jurisdictions", "service_area", "boundary_sets", "council_members"),
+    ),
+    WatchedData(
+        "candidates",
+        ("assets/candidates.json",),
+        ("utils.candidate_data.load_candidates", "utils.district_data.get_district_candidates",
+         "utils.district_data.get_district_info"),
+        ("candidates",),
+    ),
+]
+
+# Caches keyed by data_version() that any group's data can end up in
+VERSIONED_CACHES = ("utils.district_data.get_district_info",)
+
+Signature = Tuple[Tuple[str, int, int], ...]
+
+def file_signature(patterns: Tuple[str, ...]) -> Signature:
+    """(path, size, mtime) of every file the patterns match; cheap enough to poll"""
+    signature = []
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern)):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue  # Replaced between the glob and the stat; the next poll sees it
+            signature.append((path, stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+Digest = Tuple[Tuple[str, str], ...]
+
+def content_digest(signature: Signature) -> Digest:
+    """(path, sha256 of the contents) of every file in a signature; only computed once it changes"""
+    digest = []
+    for path, _, _ in signature:
+        sha = hashlib.sha256()
+        try:
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    sha.update(chunk)
+        except OSError:
+            continue  # Removed since the stat; the next poll sees it
+        digest.append((path, sha.hexdigest()))
+    return tuple(digest)
+
+def _version_of(digests: Dict[str, Digest]) -> str:
+    """Same contents, same version, in every replica, whatever the files' timestamps"""
+    return hashlib.sha1(repr(sorted(digests.items())).encode('utf-8')).hexdigest()[:12]
+
+def _resolve(dotted: str) -> Callable:
+    module_name, _, attribute = dotted.rpartition('.')
+    return getattr(importlib.import_module(module_name), attribute)
+
+class DataWatcher:
+    """Polls the watched files and reloads whatever depends on the ones that changed"""
+
+    def __init__(self, watched: List[WatchedData] = WATCHED_DATA, interval: float = DATA_WATCH_INTERVAL):
+        self.watched = watched
+        self.interval = interval
+        self.applied = {group.name: file_signature(group.paths) for group in watched}
+        self.digests = {name: content_digest(signature) for name, signature in self.applied.items()}
+        self.pending: Dict[str, Signature] = {}
+        self.version = _version_of(self.digests)
+        self.reloads = {group.name: 0 for group in watched}
+        self.last_reload: Optional[float] = None
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+
+    def poll(self) -> List[str]:
+        """Check every group once; returns the names of the groups reloaded"""
+        changed = []
+        with self.lock:
+            for group in self.watched:
+                signature = file_signature(group.paths)
+                if signature == self.applied[group.name]:
+                    self.pending.pop(group.name, None)
+                    continue
+                # Wait until the files stop changing, so a file written in pieces is read whole
+                if self.pending.get(group.name) != signature:
+                    self.pending[group.name] = signature
+                    continue
+                del self.pending[group.name]
+                self.applied[group.name] = signature
+                digest = content_digest(signature)
+                if digest == self.digests[group.name]:
+                    continue  # Touched or copied over with the same bytes: nothing to reload
+                self.digests[group.name] = digest
+                changed.append(group)
+            if not changed:
+                return []
+
+            start = time.perf_counter()
+            for group in changed:
+                self.invalidate(group)
+                self.reloads[group.name] += 1
+            # One assignment, so readers see the old version or the new one. Versioned
+            # caches are cleared again after it, in case a request refilled them in between.
+            self.version = _version_of(self.digests)
+            for dotted in VERSIONED_CACHES:
+                self._clear(dotted)
+            for group in changed:
+                self.warm(group)
+
+            self.last_reload = time.time()
+            names = [group.name for group in changed]
+            logger.info("Reloaded %s in %.2fs; data version %s",
+                        ", ".join(names), time.perf_counter() - start, self.version)
+            return names
+
+    def _clear(self, dotted: str):
+        try:
+            _resolve(dotted).clear()
+        except Exception as e:
+            logger.warning("Could not clear %s: %s", dotted, e)
+
+    def invalidate(self, group: WatchedData):
+        """Clear only the caches built from the group's files"""
+        for dotted in group.caches:
+            self._clear(dotted)
+
+    def warm(self, group: WatchedData):
+        """Rebuild now, so the next visitor is not the one who pays for it"""
+        from utils.warmup import WARMUP_STEPS
+        steps = dict(WARMUP_STEPS)
+        for name in group.warmup_steps:
+            try:
+                steps[name]()
+            except Exception as e:
+                logger.warning("Warm-up step %s failed after reloading %s: %s", name, group.name, e)
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                logger.warning("Data watcher poll failed: %s", e)
+
+    def stop(self):
+        self.stop_event.set()
+
+_lock = threading.Lock()
+_watcher: Optional[DataWatcher] = None
+_thread: Optional[threading.Thread] = None
+
+def get_data_watcher() -> DataWatcher:
+    """This process's watcher; created on first use, polling only once started"""
+    global _watcher
+    with _lock:
+        if _watcher is None:
+            _watcher = DataWatcher()
+        return _watcher
+
+def start_data_watcher() -> DataWatcher:
+    """Start polling the data files on a background thread, once per process"""
+    global _thread
+    watcher = get_data_watcher()
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=watcher.run, name="data-watcher", daemon=True)
+            _thread.start()
+    return watcher
+
+def data_version() -> str:
+    """Changes whenever any watched data file does; part of keys for cached results built from them"""
+    return get_data_watcher().version
+
+def _prometheus_lines() -> List[str]:
+    watcher = _watcher
+    if watcher is None:
+        return []
+    lines = [
+        "# HELP chattanooga_vote_data_reloads_total Reloads after a watched data file changed",
+        "# TYPE chattanooga_vote_data_reloads_total counter",
+    ]
+    for name, count in watcher.reloads.items():
+        lines.append(f'chattanooga_vote_data_reloads_total{{group="{name}"}} {count}')
+    if watcher.last_reload is not None:
+        lines.append("# HELP chattanooga_vote_data_last_reload_timestamp_seconds When data was last reloaded")
+        lines.append("# TYPE chattanooga_vote_data_last_reload_timestamp_seconds gauge")
+        lines.append(f"chattanooga_vote_data_last_reload_timestamp_seconds {watcher.last_reload:.3f}")
+    return lines
+
+register_collector(_prometheus_lines)
+
+if __name__ == '__main__':
+    watcher = get_data_watcher()
+    for group in watcher.watched:
+        files = watcher.applied[group.name]
+        print(f"{group.name}: {len(files)} files, {len(group.caches)} caches")
+        for path, size, _ in files:
+            print(f"    {path} ({size:,} bytes)")
+    print(f"data version {watcher.version}")
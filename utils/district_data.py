@@ -1,13 +1,24 @@
 import pandas as pd
+import numpy as np
 import json
 from typing import Dict, Any, Tuple, List, Optional
+import shapely
 from shapely.geometry import Point, Polygon, mapping, shape
+from shapely.strtree import STRtree
 import math
+import re
 from pathlib import Path
-from utils.geocoding import geocode_address
+from utils.geocoding import geocode_address, geocode_addresses
+from utils.single_flight import get_flight_group
+from utils.shared_cache import get_shared_cache
+from utils.metrics import timed
+from utils.cache_stats import tracked_cache_data, tracked_cache_resource
+from utils.data_reload import data_version
+from utils.topojson import load_topology
+from utils.geometry_store import read_attributes
 import streamlit as st
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour
+@tracked_cache_data(ttl=3600)  # Cache for 1 hour
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
     Calculate the great circle distance between two points 
@@ -21,7 +32,8 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     r = 6371  # Radius of earth in kilometers
     return c * r
 
-@st.cache_data(ttl=3600)  # Cache district boundaries for 1 hour
+@timed("district_data.get_district_boundaries")
+@tracked_cache_data(ttl=3600)  # Cache district boundaries for 1 hour
 def get_district_boundaries() -> Dict[str, Any]:
     """
     Load GeoJSON boundaries for Chattanooga city council districts
@@ -81,7 +93,108 @@ def get_district_boundaries() -> Dict[str, Any]:
         st.error(f"Error loading district boundaries: {str(e)}")
         return {}
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
+@tracked_cache_data(ttl=3600)  # Reloaded with the boundaries
+def get_district_topology() -> Optional[Dict[str, Any]]:
+    """
+    Shared-arc TopoJSON of the district boundaries written at ingest, or None
+    if it has not been built, in which case maps fall back to the GeoJSON
+    """
+    return load_topology()
+
+@timed("district_data.get_district_index")
+@tracked_cache_resource(ttl=3600)  # Rebuild the spatial index with the boundaries
+def get_district_index() -> Tuple[Optional[STRtree], np.ndarray]:
+    """
+    Build an STR-tree over the district polygons for vectorized point lookups
+    """
+    district_boundaries = get_district_boundaries()
+    names = np.array(list(district_boundaries.keys()), dtype=object)
+    if not len(names):
+        return None, names
+
+    geometries = [shape(feature['geometry']) for feature in district_boundaries.values()]
+    return STRtree(geometries), names
+
+# Used only until the boundary files load
+FALLBACK_SERVICE_AREA = (-85.4, 34.9, -85.1, 35.2)
+
+@tracked_cache_data(ttl=3600)  # Reloaded with the boundaries
+def get_service_area(buffer_distance: float = 0.001) -> Tuple[float, float, float, float]:
+    """
+    (west, south, east, north) around every council district in every boundary
+    set, padded by the edge buffer. Geocoding, searches, map clicks and batch
+    lookups all check against this one box.
+    """
+    from utils.jurisdictions import get_jurisdiction_index
+    geometries = []
+    tree, _ = get_district_index()
+    if tree is not None:
+        geometries.append(tree.geometries)
+    index = get_jurisdiction_index()
+    if len(index.layers):
+        council = [code for code, name in enumerate(index.layers) if name.startswith("council_")]
+        geometries.append(index.geometries[np.isin(index.layer_codes, council)])
+    geometries = np.concatenate(geometries) if geometries else np.array([], dtype=object)
+    if not len(geometries):
+        return FALLBACK_SERVICE_AREA
+    west, south, east, north = shapely.total_bounds(geometries)
+    return (float(west - buffer_distance), float(south - buffer_distance),
+            float(east + buffer_distance), float(north + buffer_distance))
+
+def in_service_area(lat: float, lon: float) -> bool:
+    west, south, east, north = get_service_area()
+    return south <= lat <= north and west <= lon <= east
+
+@timed("district_data.get_districts_for_points")
+def get_districts_for_points(lats: np.ndarray, lons: np.ndarray, buffer_distance: float = 0.001) -> np.ndarray:
+    """
+    Assign a district to every coordinate pair in one pass over the spatial index.
+    Points outside every district, or with missing coordinates, get "District not found".
+    """
+    tree, names = get_district_index()
+    return assign_districts(tree, names, lats, lons, buffer_distance)
+
+def assign_districts(tree: Optional[STRtree], names: np.ndarray, lats: np.ndarray, lons: np.ndarray,
+                     buffer_distance: float = 0.001) -> np.ndarray:
+    """
+    Match coordinates against an STR-tree of district polygons; names[i] is
+    the district of the tree's i-th geometry. Shared by every boundary set.
+    """
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    result = np.full(lats.shape, "District not found", dtype=object)
+
+    if tree is None or not len(lats):
+        return result
+
+    # Skip points clearly outside the city; the box reaches past -85.1 in East Brainerd
+    west, south, east, north = get_service_area()
+    valid = ~(np.isnan(lats) | np.isnan(lons))
+    valid &= (lats >= south) & (lats <= north) & (lons >= west) & (lons <= east)
+    valid_idx = np.flatnonzero(valid)
+    if not len(valid_idx):
+        return result
+
+    points = shapely.points(lons[valid_idx], lats[valid_idx])
+
+    # Exact containment first; first match wins like get_district_for_coordinates
+    point_idx, tree_idx = tree.query(points, predicate="within")
+    matched = np.zeros(len(points), dtype=bool)
+    for p, t in zip(point_idx, tree_idx):
+        if not matched[p]:
+            result[valid_idx[p]] = names[t]
+            matched[p] = True
+
+    # Points sitting on a boundary edge fall back to the nearest district within the buffer
+    unmatched = np.flatnonzero(~matched)
+    if len(unmatched):
+        point_idx, tree_idx = tree.query_nearest(points[unmatched], max_distance=buffer_distance)
+        for p, t in zip(point_idx, tree_idx):
+            result[valid_idx[unmatched[p]]] = names[t]
+
+    return result
+
+@tracked_cache_data(ttl=300)  # Cache for 5 minutes
 def point_in_polygon(point: Point, polygon_coords: List[List[float]], buffer_distance: float = 0.0001) -> bool:
     """
     Check if a point is within a polygon with a small buffer zone for boundary cases
@@ -94,7 +207,8 @@ def point_in_polygon(point: Point, polygon_coords: List[List[float]], buffer_dis
         st.error(f"Error checking point in polygon: {str(e)}")
         return False
 
-@st.cache_data(ttl=3600)  # Cache polling place data for 1 hour
+@timed("district_data.find_nearest_polling_place")
+@tracked_cache_data(ttl=3600)  # Cache polling place data for 1 hour
 def find_nearest_polling_place(lat: float, lon: float, df: pd.DataFrame) -> Optional[Tuple[str, str, str]]:
     """
     Find the nearest polling place to the given coordinates using haversine distance
@@ -125,48 +239,113 @@ def find_nearest_polling_place(lat: float, lon: float, df: pd.DataFrame) -> Opti
         )
     return None
 
-@st.cache_data(ttl=300)  # Cache district results for 5 minutes
+@tracked_cache_data(ttl=3600)  # Cache polling place coordinates for 1 hour
+def get_polling_place_locations() -> pd.DataFrame:
+    """
+    Load polling places with coordinates, geocoding each site address once
+    """
+    polling_places_path = Path('assets/polling_places.csv')
+    if not polling_places_path.exists():
+        return pd.DataFrame()
+
+    df = pd.read_csv(polling_places_path, dtype=str)
+    df['full_address'] = df['address'] + ", " + df['city'] + ", " + df['state'] + " " + df['zip']
+    coords = geocode_addresses(df['full_address'])
+    df['lat'] = [coords[a][0] if coords.get(a) else np.nan for a in df['full_address']]
+    df['lon'] = [coords[a][1] if coords.get(a) else np.nan for a in df['full_address']]
+    return df.dropna(subset=['lat', 'lon']).reset_index(drop=True)
+
+def precinct_id(value) -> str:
+    """'Precinct 54', 'precinct 54' and 54 all become '54'; named precincts keep their name"""
+    return re.sub(r'^precinct\s+', '', str(value).strip(), flags=re.IGNORECASE)
+
+@tracked_cache_data(ttl=3600)  # Cache the assignment table for 1 hour
+def get_precinct_assignments() -> pd.DataFrame:
+    """
+    Precinct -> polling place assignment table, indexed by precinct_id. Each
+    row of polling_places.csv is the site the Election Commission assigns to
+    that precinct.
+    """
+    polling_places_path = Path('assets/polling_places.csv')
+    if not polling_places_path.exists():
+        return pd.DataFrame(columns=["precinct", "polling_place", "polling_address"])
+
+    df = pd.read_csv(polling_places_path, dtype=str).fillna('')
+    return pd.DataFrame({
+        "precinct": df['precinct'].to_numpy(),
+        "polling_place": df['location_name'].to_numpy(),
+        "polling_address": (df['address'] + ", " + df['city'] + ", " + df['state'] + " " + df['zip']).to_numpy(),
+    }, index=[precinct_id(p) for p in df['precinct']]).groupby(level=0).first()
+
+def polling_places_for_precincts(precincts) -> pd.DataFrame:
+    """
+    Precinct, polling place and address for each precinct id from the polygon
+    lookup. Precincts missing from the assignment table keep their id with
+    "Not found" for the site.
+    """
+    precincts = np.asarray(precincts, dtype=object)
+    assignments = get_precinct_assignments().reindex(precincts).reset_index(drop=True)
+    unassigned = np.where(precincts != "Not found", "Precinct " + precincts.astype(str), "Not found")
+    return pd.DataFrame({
+        "precinct": assignments['precinct'].fillna(pd.Series(unassigned)),
+        "polling_place": assignments['polling_place'].fillna("Not found"),
+        "polling_address": assignments['polling_address'].fillna("Not found"),
+    })
+
+@timed("district_data.find_nearest_polling_places")
+def find_nearest_polling_places(lats: np.ndarray, lons: np.ndarray) -> pd.DataFrame:
+    """
+    Vectorized nearest polling place for many points using haversine distance.
+    Returns one row per input point with precinct, polling_place and polling_address.
+    """
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    result = pd.DataFrame({
+        "precinct": ["Not found"] * len(lats),
+        "polling_place": ["Not found"] * len(lats),
+        "polling_address": ["Not found"] * len(lats)
+    })
+
+    places = get_polling_place_locations()
+    if places.empty or not len(lats):
+        return result
+
+    lat1 = np.radians(lats)[:, None]
+    lon1 = np.radians(lons)[:, None]
+    lat2 = np.radians(places['lat'].to_numpy(dtype=float))[None, :]
+    lon2 = np.radians(places['lon'].to_numpy(dtype=float))[None, :]
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    distances = 2 * np.arcsin(np.sqrt(a))
+
+    valid = ~(np.isnan(lats) | np.isnan(lons))
+    nearest = places.iloc[np.argmin(np.nan_to_num(distances, nan=np.inf), axis=1)]
+    result.loc[valid, "precinct"] = nearest['precinct'].to_numpy()[valid]
+    result.loc[valid, "polling_place"] = nearest['location_name'].to_numpy()[valid]
+    result.loc[valid, "polling_address"] = nearest['full_address'].to_numpy()[valid]
+    return result
+
+@timed("district_data.get_district_for_coordinates")
+@tracked_cache_data(ttl=300)  # Cache district results for 5 minutes
 def get_district_for_coordinates(lat: float, lon: float) -> str:
     """
     Determine which district a point falls within using GIS boundaries
     """
-    try:
-        point = Point(lon, lat)
-
-        if not (34.9 <= lat <= 35.2 and -85.4 <= lon <= -85.1):
-            st.warning("Coordinates appear to be outside the expected Chattanooga area")
-            return "District not found"
-
-        district_boundaries = get_district_boundaries()
-        if not district_boundaries:
-            st.error("Failed to load district boundaries")
-            return "District not found"
-
-        for district, geojson in district_boundaries.items():
-            try:
-                if 'geometry' not in geojson:
-                    continue
-
-                district_shape = shape(geojson['geometry'])
-
-                if district_shape.contains(point):
-                    return district
-
-                if district_shape.buffer(0.001).contains(point):
-                    return district
-
-            except Exception as e:
-                st.error(f"Error checking district {district}: {str(e)}")
-                continue
-
-        st.warning("Location not matched to any district. Please verify the address.")
+    if not in_service_area(lat, lon):
+        st.warning("Coordinates appear to be outside the expected Chattanooga area")
         return "District not found"
 
-    except Exception as e:
-        st.error(f"Error in district matching: {str(e)}")
+    tree, _ = get_district_index()
+    if tree is None:
+        st.error("Failed to load district boundaries")
         return "District not found"
 
-@st.cache_data(ttl=3600)  # Cache candidate data for 1 hour
+    # The same index and edge buffer as the batch lookup, so both give the same answer
+    district = get_districts_for_points(np.array([lat]), np.array([lon]))[0]
+    if district == "District not found":
+        st.warning("Location not matched to any district. Please verify the address.")
+    return district
+
+@tracked_cache_data(ttl=3600)  # Cache candidate data for 1 hour
 def get_district_candidates(district: str) -> list:
     """
     Get list of candidates running in the March 4th, 2025 election for a given district
@@ -208,16 +387,38 @@ def get_district_candidates(district: str) -> list:
         }
         return candidates_2025.get(district, [])
 
-@st.cache_data(ttl=300)  # Cache district info for 5 minutes
+DISTRICT_INFO_TTL = 300  # Seconds, matching the in-process cache below
+
+@timed("district_data.get_district_info")
+@tracked_cache_data(ttl=300)  # Cache district info for 5 minutes
 def get_district_info(lat: float, lon: float) -> dict:
     """
     Get comprehensive district information based on coordinates
     """
-    district = get_district_for_coordinates(lat, lon)
-
-    if district == "District not found":
+    # Concurrent lookups of the same point, in this process or a sibling replica, run once,
+    # and a result any replica built is reused from the shared cache
+    # The data version changes with the files behind the result, so a reload never serves an old one
+    key = f"district_info:{data_version()}:{lat:.6f},{lon:.6f}"
+    return get_flight_group().do(
+        key, get_shared_cache().get_or_set, key, lambda: build_district_info(lat, lon), DISTRICT_INFO_TTL
+    )
+
+def build_district_info(lat: float, lon: float) -> dict:
+    """
+    Assemble district, candidate and polling place details for coordinates
+    """
+    # Every layer from one probe of the jurisdiction index: the council district the page, map,
+    # candidates and council members are keyed to and the one after redistricting (so "did my
+    # district change?" needs no second geocode), the precinct, and county, school board and state
+    from utils.boundary_sets import AFTER, BEFORE
+    from utils.jurisdictions import NOT_FOUND, PRECINCT_LAYER, boundary_set_layer, layer_label, lookup_jurisdictions
+    layers = lookup_jurisdictions(lat, lon) if in_service_area(lat, lon) else {}
+    district = layers.get(boundary_set_layer(BEFORE), NOT_FOUND)
+    new_district = layers.get(boundary_set_layer(AFTER), NOT_FOUND)
+
+    if district == NOT_FOUND:
         return {
-            "district_number": district,
+            "district_number": "District not found",
             "precinct": "Not found",
             "polling_place": "Not found",
             "polling_address": "Not found",
@@ -226,10 +427,31 @@ def get_district_info(lat: float, lon: float) -> dict:
             "candidates": []
         }
 
+    new_district = "District not found" if new_district == NOT_FOUND else new_district
+    precinct = layers.get(PRECINCT_LAYER, NOT_FOUND)
+    jurisdictions = {layer_label(name): value for name, value in layers.items()
+                     if not name.startswith("council_") and name != PRECINCT_LAYER and value != NOT_FOUND}
+
     boundaries = get_district_boundaries()
     district_data = boundaries.get(district, {}).get('properties', {})
     candidates = get_district_candidates(district)
 
+    # The precinct polygon containing the point decides the polling place, from the assignment table
+    if precinct != NOT_FOUND:
+        polling = polling_places_for_precincts([precinct]).iloc[0]
+        return {
+            "district_number": district,
+            "new_district_number": new_district,
+            "jurisdictions": jurisdictions,
+            "district_description": district_data.get('description', ''),
+            "precinct": polling["precinct"],
+            "polling_place": polling["polling_place"],
+            "polling_address": polling["polling_address"],
+            "distance": "Assigned to your precinct",
+            "candidates": candidates
+        }
+
+    # Without precinct boundaries, fall back to the nearest polling place
     try:
         polling_places_path = Path('assets/polling_places.csv')
         if not polling_places_path.exists():
@@ -242,6 +464,8 @@ def get_district_info(lat: float, lon: float) -> dict:
             precinct, location_name, address = polling_info
             return {
                 "district_number": district,
+                "new_district_number": new_district,
+                "jurisdictions": jurisdictions,
                 "district_description": district_data.get('description', ''),
                 "precinct": precinct,
                 "polling_place": location_name,
@@ -254,6 +478,8 @@ def get_district_info(lat: float, lon: float) -> dict:
 
     return {
         "district_number": district,
+        "new_district_number": new_district,
+        "jurisdictions": jurisdictions,
         "district_description": district_data.get('description', ''),
         "precinct": "Not found",
         "polling_place": "Not found",
@@ -262,23 +488,21 @@ def get_district_info(lat: float, lon: float) -> dict:
         "candidates": candidates
     }
 
-@st.cache_data(ttl=3600)  # Cache council member data for 1 hour
+@timed("district_data.get_council_member")
+@tracked_cache_data(ttl=3600)  # Cache council member data for 1 hour
 def get_council_member(district: str) -> dict:
     """
     Get council member information for a district
     """
     try:
-        council_members_path = Path('attached_assets/City_Council__old__20250115.csv')
-        if not council_members_path.exists():
-            raise FileNotFoundError("Council members data file not found")
-
-        df = pd.read_csv(council_members_path)
-        member = df[df['District'] == int(district)]
+        # Attribute columns only; the district shapes in the same file are never read
+        df = read_attributes("council_districts_old", columns=["district", "city_rep"])
+        member = df[df['district'] == int(district)]
         if member.empty:
             raise ValueError(f"No council member found for district {district}")
 
         return {
-            "name": member.iloc[0]['City Rep'],
+            "name": member.iloc[0]['city_rep'],
             "district": str(district)
         }
     except FileNotFoundError:
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional, Tuple
+import shapely
+from shapely.geometry import mapping, shape
+import streamlit.components.v1 as components
+from streamlit.logger import get_logger
+from utils.district_data import get_district_boundaries, get_district_topology
+from utils.mapping import BASEMAP_ATTRIBUTION, BASEMAP_URL, CARTO_POSITRON_URL, DISTRICT_COLORS, district_popup_html
+from utils.cache_stats import tracked_cache_resource
+from utils.topojson import OBJECT_NAME, dumps, simplify_topology
+
+logger = get_logger(__name__)
+
+COMPONENT_DIR = Path(__file__).parent / "district_map_component"
+GEOMETRY_FILE = COMPONENT_DIR / "districts.json"
+TOPOLOGY_FILE = COMPONENT_DIR / "districts.topo.json"
+# Vector tiles unpacked by `python -m utils.vector_tiles --export-dir`; served from the app's own origin
+TILE_DIR = COMPONENT_DIR / "tiles"
+# Tile layers drawn over the districts; the districts themselves come from the geometry file above
+TILE_OVERLAYS = ("precincts",)
+CHATTANOOGA_CENTER = (35.0456, -85.2672)
+
+# Drops vertices closer than about a meter; the outlines look the same at street zoom
+SIMPLIFY_TOLERANCE = 0.00001
+
+_component = components.declare_component("district_map", path=str(COMPONENT_DIR))
+
+def _version(payload: str) -> str:
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+def _write_if_changed(path: Path, payload: str) -> str:
+    """
+    Atomically replace the file when its content changed; return a version for
+    the URL. The deploy build writes these files, so at runtime this only writes
+    after a data reload, and a read-only install keeps serving the built file.
+    """
+    try:
+        current = path.read_text(encoding="utf-8")
+    except OSError:
+        current = None
+    if current == payload:
+        return _version(payload)
+
+    fd, tmp_name = None, None
+    try:
+        # A unique name per writer, so threads and processes never share a temp file
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            fd = None
+            f.write(payload)
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+        tmp_name = None
+    except OSError as e:
+        if current is None:
+            raise
+        logger.warning("Could not update %s, serving the built copy: %s", path, e)
+        return _version(current)
+    finally:
+        if fd is not None:
+            os.close(fd)
+        if tmp_name is not None:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+    return _version(payload)
+
+def _feature_properties(i: int, district_name: str) -> dict:
+    return {
+        "district": district_name,
+        "color": DISTRICT_COLORS[i % len(DISTRICT_COLORS)],
+        "popup": district_popup_html(district_name),
+    }
+
+@tracked_cache_resource(ttl=3600)  # Rebuilt with the boundaries
+def build_map_geometry() -> str:
+    """
+    Write the district polygons, colors and popups the map component fetches,
+    and return their URL with a version that changes whenever the file does.
+    Uses the shared-arc TopoJSON from ingest, or GeoJSON when it is missing.
+    """
+    district_names = list(get_district_boundaries())
+    topology = get_district_topology()
+    if topology:
+        topology = simplify_topology(topology, SIMPLIFY_TOLERANCE)
+        geometries = topology["objects"][OBJECT_NAME]["geometries"]
+        for geometry in geometries:
+            name = str(geometry["properties"].get("district", ""))
+            index = district_names.index(name) if name in district_names else 0
+            geometry["properties"] = _feature_properties(index, name)
+        version = _write_if_changed(TOPOLOGY_FILE, dumps(topology))
+        return f"{TOPOLOGY_FILE.name}?v={version}"
+
+    features = []
+    for i, (district_name, district_geojson) in enumerate(get_district_boundaries().items()):
+        geometry = shapely.set_precision(
+            shape(district_geojson["geometry"]).simplify(SIMPLIFY_TOLERANCE, preserve_topology=True), 1e-6
+        )
+        features.append({
+            "type": "Feature",
+            "properties": _feature_properties(i, district_name),
+            "geometry": mapping(geometry),
+        })
+
+    payload = json.dumps({"type": "FeatureCollection", "features": features}, separators=(",", ":"))
+    return f"{GEOMETRY_FILE.name}?v={_write_if_changed(GEOMETRY_FILE, payload)}"
+
+def tile_overlay_url() -> Optional[str]:
+    """
+    URL template of the exported vector tiles, relative to the component, when
+    they include a layer to overlay; versioned by the export so browsers refetch
+    """
+    tilejson = TILE_DIR / "tiles.json"
+    try:
+        metadata = json.loads(tilejson.read_text(encoding="utf-8"))
+        layers = {layer["id"] for layer in json.loads(metadata.get("json", "{}")).get("vector_layers", [])}
+    except (OSError, ValueError):
+        return None
+    if not layers.intersection(TILE_OVERLAYS):
+        return None
+    return f"{TILE_DIR.name}/{{z}}/{{x}}/{{y}}.pbf?v={tilejson.stat().st_mtime_ns}"
+
+def district_map(location: Optional[Tuple[float, float]] = None, district: Optional[str] = None,
+                 zoom: int = 11, height: int = 400, key: str = "district_map") -> Optional[dict]:
+    """
+    Interactive district map. The polygons are loaded by the browser from a
+    static file once, so a rerun only sends the location and district number.
+    Returns {"last_clicked": {"lat": ..., "lng": ...}} after a click, like st_folium.
+    """
+    return _component(
+        geometry_url=build_map_geometry(),
+        tile_url=tile_overlay_url(),
+        basemap_url=BASEMAP_URL or CARTO_POSITRON_URL,
+        basemap_attribution=BASEMAP_ATTRIBUTION,
+        center=list(location) if location else list(CHATTANOOGA_CENTER),
+        zoom=zoom,
+        location=list(location) if location else None,
+        district=district,
+        height=height,
+        key=key,
+        default=None,
+    )
+
+if __name__ == '__main__':
+    # Run by the deploy build, so the app starts with the files in place
+    print(f"Wrote {build_map_geometry()}")
@@ -0,0 +1,143 @@
+// District map for My_Districts.py. The polygons come from districts.topo.json (or
+// districts.json without a topology), fetched once per page load and cached by the
+// browser under its version; each rerun only sends the searched location and
+// district number. Layers too big to embed, like precincts, come as vector tiles
+// from the tiles/ directory next to this file, fetched only for the current view.
+
+function sendToStreamlit(type, data) {
+    window.parent.postMessage(Object.assign({isStreamlitMessage: true, type: type}, data), "*");
+}
+
+let map = null;
+let districtLayers = {};
+let geometryUrl = null;
+let geometryLoaded = null;
+let locationLayer = null;
+let tileUrl = null;
+let tileLayer = null;
+let lastView = null;
+let frameHeight = null;
+
+function createMap(args) {
+    map = L.map("map", {preferCanvas: true, zoomControl: true}).setView(args.center, args.zoom);
+    L.tileLayer(args.basemap_url, {
+        attribution: args.basemap_attribution,
+        subdomains: "abcd",
+        maxZoom: 20
+    }).addTo(map);
+
+    map.on("click", function (e) {
+        sendToStreamlit("streamlit:setComponentValue", {
+            value: {last_clicked: {lat: e.latlng.lat, lng: e.latlng.lng}},
+            dataType: "json"
+        });
+    });
+}
+
+function districtStyle(feature, highlighted) {
+    return {
+        fillColor: feature.properties.color,
+        color: "white",
+        weight: highlighted ? 2 : 1,
+        fillOpacity: highlighted ? 0.7 : 0.5,
+        opacity: 1
+    };
+}
+
+function loadGeometry(url) {
+    geometryUrl = url;
+    geometryLoaded = fetch(url)
+        .then(function (response) { return response.json(); })
+        .then(function (data) {
+            // Shared-arc TopoJSON from ingest, or plain GeoJSON when it wasn't built
+            const collection = data.type === "Topology" ? topojson.feature(data, data.objects.districts) : data;
+            Object.values(districtLayers).forEach(function (layer) { map.removeLayer(layer); });
+            districtLayers = {};
+            L.geoJSON(collection, {
+                style: function (feature) { return districtStyle(feature, false); },
+                onEachFeature: function (feature, layer) {
+                    layer.bindPopup(feature.properties.popup, {maxWidth: 300});
+                    layer.on("mouseover", function () { layer.setStyle(districtStyle(feature, true)); });
+                    layer.on("mouseout", function () { layer.setStyle(districtStyle(feature, false)); });
+                    districtLayers[feature.properties.district] = layer;
+                }
+            }).eachLayer(function (layer) { layer.addTo(map); });
+        });
+    return geometryLoaded;
+}
+
+function loadTiles(url) {
+    tileUrl = url;
+    if (tileLayer) {
+        map.removeLayer(tileLayer);
+        tileLayer = null;
+    }
+    if (!url || !L.vectorGrid) {
+        return;
+    }
+    tileLayer = L.vectorGrid.protobuf(url, {
+        pane: "overlayPane",
+        interactive: false,
+        maxNativeZoom: 15,
+        vectorTileLayerStyles: {
+            // Drawn from the geometry file, with popups
+            districts: [],
+            precincts: {fill: false, color: "#555555", weight: 0.5, opacity: 0.6, dashArray: "2 3"}
+        }
+    }).addTo(map);
+}
+
+function showLocation(args) {
+    if (locationLayer) {
+        map.removeLayer(locationLayer);
+    }
+    locationLayer = L.layerGroup();
+
+    const district = districtLayers[args.district];
+    if (district) {
+        L.geoJSON(district.feature, {
+            style: {fillOpacity: 0, color: "#004B54", weight: 4, opacity: 1},
+            interactive: false
+        }).addTo(locationLayer);
+    }
+    if (args.location) {
+        L.marker(args.location, {
+            icon: L.divIcon({
+                className: "custom-marker",
+                html: '<div class="marker-pin"><i class="fa fa-home"></i></div>'
+            })
+        }).bindPopup("Your Location").addTo(locationLayer);
+    }
+    locationLayer.addTo(map);
+
+    // Only move the map when the view asked for changes, so unrelated reruns keep the user's pan
+    const view = JSON.stringify([args.center, args.zoom]);
+    if (view !== lastView) {
+        lastView = view;
+        map.setView(args.center, args.zoom);
+    }
+}
+
+window.addEventListener("message", function (event) {
+    if (event.data.type !== "streamlit:render") {
+        return;
+    }
+    const args = event.data.args;
+    if (!map) {
+        createMap(args);
+    }
+    if (args.geometry_url !== geometryUrl) {
+        loadGeometry(args.geometry_url);
+    }
+    if (args.tile_url !== tileUrl) {
+        loadTiles(args.tile_url);
+    }
+    geometryLoaded.then(function () { showLocation(args); });
+
+    if (args.height !== frameHeight) {
+        frameHeight = args.height;
+        sendToStreamlit("streamlit:setFrameHeight", {height: args.height});
+    }
+});
+
+sendToStreamlit("streamlit:componentReady", {apiVersion: 1});
@@ -1,93 +1,87 @@
-import pandas as pd
 import json
 from pathlib import Path
-import streamlit as st
-from shapely.geometry import Polygon, mapping
-from shapely import wkt
-from shapely.validation import make_valid
-import math
-
-def fetch_district_boundaries():
-    """Create district boundaries from CSV data using WKT parsing"""
-    try:
-        # Create assets directory if it doesn't exist
-        Path('assets').mkdir(exist_ok=True)
-
-        # Read the CSV file with current districts (valid until April 13th, 2025)
-        csv_path = Path('attached_assets') / 'Current_City_Council_Districts_20250115.csv'
-        if not csv_path.exists():
-            print("District data CSV file not found")
-            return False
-
-        # Read CSV and convert WKT strings to geometry objects
-        df = pd.read_csv(csv_path)
-        features = []
-
-        for _, row in df.iterrows():
-            try:
-                district_num = str(row['citydst'])  # Use citydst column for district number
-
-                # Parse polygon using WKT from the_geom column
-                geometry = wkt.loads(row['the_geom'])
-
-                # If geometry is not valid, try to fix it
-                if not geometry.is_valid:
-                    try:
-                        geometry = make_valid(geometry)
-                        if not geometry.is_valid:
-                            print(f"Could not fix invalid geometry for District {district_num}")
-                            continue
-                    except Exception as e:
-                        print(f"Error fixing geometry for District {district_num}: {str(e)}")
-                        continue
-
-                # Create GeoJSON feature
-                feature = {
-                    'type': 'Feature',
-                    'properties': {
-                        'district': district_num,
-                        'description': f'City Council District {district_num}',
-                        'representative': row.get('cityrep', 'Information not available')
-                    },
-                    'geometry': mapping(geometry)
-                }
-
-                features.append(feature)
-                print(f"Successfully processed District {district_num}")
-
-            except Exception as e:
-                print(f"Error processing district: {str(e)}")
-                continue
-
-        if not features:
-            print("No valid district features created")
-            return False
-
-        # Create the final GeoJSON structure
+from typing import Any, Dict, List, Tuple
+import numpy as np
+import pandas as pd
+import shapely
+from utils.geometry_store import SOURCE_DIR, SOURCES, read_geometries, store_path
+from utils.scraping import ScrapeContext, Scraper, ValidationError, create_session, run_scraper
+from utils.topojson import report, write_topology
+
+BOUNDARIES_PATH = Path('assets') / 'district_boundaries.json'
+TOPOLOGY_PATH = Path('assets') / 'district_boundaries.topo.json'
+
+class DistrictBoundaryScraper(Scraper):
+    """District boundaries GeoJSON (and TopoJSON) from the council district CSV, via its Parquet copy"""
+    name = "district_boundaries"
+
+    def fetch(self, ctx: ScrapeContext) -> Tuple[pd.DataFrame, np.ndarray]:
+        # Read the current districts (valid until April 13th, 2025) from the columnar copy of the CSV
+        csv_path = SOURCE_DIR / SOURCES['council_districts'].csv_name
+        if not csv_path.exists() and not store_path('council_districts').exists():
+            raise FileNotFoundError("District data CSV file not found")
+        # Attributes plus every polygon, decoded from WKB in one call; shapes
+        # were parsed and repaired with shapely's array functions at ingest
+        return read_geometries('council_districts')
+
+    def parse(self, raw: Tuple[pd.DataFrame, np.ndarray]) -> List[Dict[str, Any]]:
+        df, geometries = raw
+        districts = df['citydst'].astype(str).to_numpy()
+        representatives = df['cityrep'].fillna('Information not available').to_numpy() \
+            if 'cityrep' in df else np.full(len(df), 'Information not available', dtype=object)
+
+        valid = shapely.is_valid(geometries)
+        for district_num in districts[~valid]:
+            print(f"Could not fix invalid geometry for District {district_num}")
+
+        # Create GeoJSON features
+        return [
+            {
+                'type': 'Feature',
+                'properties': {
+                    'district': district_num,
+                    'description': f'City Council District {district_num}',
+                    'representative': representative
+                },
+                'geometry': json.loads(geometry)
+            }
+            for district_num, representative, geometry in zip(
+                districts[valid], representatives[valid], shapely.to_geojson(geometries[valid])
+            )
+        ]
+
+    def validate(self, data: List[Dict[str, Any]]) -> None:
+        if not data:
+            raise ValidationError("No valid district features created")
+
+    def publish(self, data: List[Dict[str, Any]], ctx: ScrapeContext) -> List[Path]:
         district_geojson = {
             'type': 'FeatureCollection',
-            'features': features
+            'features': data
         }
+        outputs = [ctx.publish(BOUNDARIES_PATH, json.dumps(district_geojson, indent=2))]
 
-        # Save to file
-        output_path = Path('assets') / 'district_boundaries.json'
-        with output_path.open('w') as f:
-            json.dump(district_geojson, f, indent=2)
+        # Shared-arc TopoJSON for the maps; they use the GeoJSON if this fails
+        try:
+            print(report(write_topology(outputs[0], ctx.output(TOPOLOGY_PATH))))
+            outputs.append(ctx.output(TOPOLOGY_PATH))
+        except Exception as e:
+            print(f"Error writing district TopoJSON: {str(e)}")
+        return outputs
 
-        print(f"Successfully saved {len(features)} district boundaries")
-        return True
-
-    except Exception as e:
-        print(f"Error in district data processing: {str(e)}")
-        return False
+def fetch_district_boundaries():
+    """Create district boundaries from the council district CSV, via its Parquet copy"""
+    result = run_scraper(DistrictBoundaryScraper(), ScrapeContext(create_session(1)))
+    if result.ok:
+        print(f"Successfully saved {result.records} district boundaries")
+    else:
+        print(f"Error in district data processing: {result.error}")
+    return result.ok
 
 if __name__ == '__main__':
-    # Create assets directory if it doesn't exist
-    Path('assets').mkdir(exist_ok=True)
-
     # Fetch and save district boundaries
     success = fetch_district_boundaries()
     if success:
         print("District boundaries updated successfully")
     else:
-        print("Failed to update district boundaries")
\ No newline at end of file
+        print("Failed to update district boundaries")
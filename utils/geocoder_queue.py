@@ -0,0 +1,252 @@
+import asyncio
+import heapq
+import itertools
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Mapping, Optional, Tuple, Union
+from geopy.geocoders import Nominatim
+import streamlit as st
+from utils.shared_cache import SharedCache, get_shared_cache
+
+Coordinates = Optional[Tuple[float, float]]
+Bounds = Tuple[float, float, float, float]  # West, south, east, north
+
+# Request priorities: a visitor waiting on a search goes ahead of queued batch uploads
+INTERACTIVE = 0
+BATCH = 1
+
+@dataclass
+class GeocoderBackend:
+    name: str = "nominatim"
+    domain: str = "nominatim.openstreetmap.org"
+    scheme: str = "https"
+    user_agent: str = "chattanooga_voting_info"
+    concurrency: int = 1      # Simultaneous requests in flight
+    rate: float = 1.0         # Sustained requests per second
+    burst: int = 1            # Requests allowed back to back
+    timeout: float = 10.0
+
+def backend_from_env() -> GeocoderBackend:
+    """Build the geocoder backend from GEOCODER_* environment variables"""
+    return GeocoderBackend(
+        name=os.environ.get("GEOCODER_NAME", "nominatim"),
+        domain=os.environ.get("GEOCODER_DOMAIN", "nominatim.openstreetmap.org"),
+        scheme=os.environ.get("GEOCODER_SCHEME", "https"),
+        concurrency=int(os.environ.get("GEOCODER_CONCURRENCY", "1")),
+        rate=float(os.environ.get("GEOCODER_RATE", "1.0")),
+        burst=int(os.environ.get("GEOCODER_BURST", "1")),
+        timeout=float(os.environ.get("GEOCODER_TIMEOUT", "10"))
+    )
+
+class TokenBucket:
+    """Token bucket shared by every request sent to one backend"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class PriorityGate:
+    """
+    Admits at most limit holders at a time, lowest priority first and in
+    arrival order within a priority, so batch work never blocks a search
+    """
+
+    def __init__(self, limit: int):
+        self.limit = max(limit, 1)
+        self.active = 0
+        self.waiters = []
+        self.order = itertools.count()
+
+    async def acquire(self, priority: int):
+        if self.active < self.limit and not self.waiters:
+            self.active += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.waiters, (priority, next(self.order), waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # Handed the slot just as the caller gave up; pass it on
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        # The slot goes straight to the next live waiter; cancelled ones are skipped
+        while self.waiters:
+            _, _, waiter = heapq.heappop(self.waiters)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+class GeocodeCache:
+    """Geocode results keyed by canonical address, including misses, kept in the shared cache"""
+
+    def __init__(self, store: SharedCache, ttl: float = 30 * 86400, miss_ttl: float = 86400):
+        self.store = store
+        self.ttl = ttl
+        self.miss_ttl = miss_ttl
+
+    def get(self, key: str) -> Tuple[bool, Coordinates]:
+        """Return (hit, coordinates) for a key"""
+        hit, coords = self.store.get(f"geocode:{key}")
+        return hit, tuple(coords) if coords else None
+
+    def set(self, key: str, coords: Coordinates):
+        self.store.set(f"geocode:{key}", coords, self.ttl if coords else self.miss_ttl)
+
+def _keyed(queries: Union[Iterable[str], Mapping[str, str]]) -> Dict[str, str]:
+    """Turn plain queries into a key -> query mapping keyed by the query"""
+    if isinstance(queries, Mapping):
+        return dict(queries)
+    return {query: query for query in queries}
+
+class GeocodingScheduler:
+    """
+    Runs geocoding requests for one backend on a dedicated event loop thread.
+    Async callers await geocode_async / geocode_many_async from any event loop;
+    sync callers use geocode / geocode_many. Single lookups run at INTERACTIVE
+    priority and batches at BATCH, so a search waits for at most the requests
+    already in flight, not for an upload's whole queue. Results outside bounds,
+    when set, come back as None.
+    """
+
+    def __init__(self, backend: GeocoderBackend, cache: Optional[GeocodeCache] = None,
+                 bounds: Optional[Bounds] = None):
+        self.backend = backend
+        self.cache = cache
+        self.bounds = bounds
+        self.geolocator = Nominatim(
+            user_agent=backend.user_agent,
+            domain=backend.domain,
+            scheme=backend.scheme,
+            timeout=backend.timeout
+        )
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="geocoder-queue", daemon=True)
+        self.thread.start()
+        self.pending: Dict[str, asyncio.Future] = {}
+        self.stats = {"requests": 0, "cache_hits": 0, "coalesced": 0, "errors": 0}
+        # Loop-bound primitives are created on the scheduler loop itself
+        asyncio.run_coroutine_threadsafe(self._init_primitives(), self.loop).result()
+
+    def set_bounds(self, bounds: Optional[Bounds]):
+        """
+        Replace the box results must fall in. Callers compute it on their own
+        thread: the loop thread inherits a script run's context, so Streamlit
+        caches (and their spinners) must never be called from it.
+        """
+        self.bounds = bounds
+
+    def in_bounds(self, lat: float, lon: float) -> bool:
+        bounds = self.bounds
+        if bounds is None:
+            return True
+        west, south, east, north = bounds
+        return south <= lat <= north and west <= lon <= east
+
+    async def _init_primitives(self):
+        self.gate = PriorityGate(self.backend.concurrency)
+        self.bucket = TokenBucket(self.backend.rate, self.backend.burst)
+
+    async def _fetch(self, query: str, priority: int) -> Coordinates:
+        await self.gate.acquire(priority)
+        try:
+            await self.bucket.acquire()
+            self.stats["requests"] += 1
+            location = await asyncio.to_thread(
+                self.geolocator.geocode, query, exactly_one=True, country_codes=['us']
+            )
+        finally:
+            self.gate.release()
+        if location and self.in_bounds(location.latitude, location.longitude):
+            return location.latitude, location.longitude
+        return None
+
+    async def _resolve(self, key: str, query: str, priority: int = INTERACTIVE) -> Coordinates:
+        """Resolve a query on the scheduler loop, sharing in-flight work for its key"""
+        if self.cache:
+            hit, coords = self.cache.get(key)
+            if hit:
+                self.stats["cache_hits"] += 1
+                return coords
+
+        future = self.pending.get(key)
+        if future is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(future)
+
+        future = self.loop.create_future()
+        self.pending[key] = future
+        try:
+            coords = await self._fetch(query, priority)
+            if self.cache:
+                self.cache.set(key, coords)
+            future.set_result(coords)
+        except Exception as e:
+            # Errors are not cached so the next request retries
+            self.stats["errors"] += 1
+            future.set_exception(e)
+        finally:
+            del self.pending[key]
+
+        return await future
+
+    async def _resolve_many(self, queries: Dict[str, str]) -> Dict[str, Coordinates]:
+        keys = list(queries)
+        results = await asyncio.gather(*(self._resolve(k, queries[k], BATCH) for k in keys),
+                                       return_exceptions=True)
+        return {k: (None if isinstance(r, BaseException) else r) for k, r in zip(keys, results)}
+
+    async def geocode_async(self, query: str, key: Optional[str] = None) -> Coordinates:
+        """Geocode one query from any event loop; key defaults to the query itself"""
+        future = asyncio.run_coroutine_threadsafe(self._resolve(key or query, query), self.loop)
+        return await asyncio.wrap_future(future)
+
+    async def geocode_many_async(self, queries: Union[Iterable[str], Mapping[str, str]]) -> Dict[str, Coordinates]:
+        """
+        Geocode many queries concurrently. Pass a key -> query mapping to share
+        results between spellings; failures map to None.
+        """
+        future = asyncio.run_coroutine_threadsafe(self._resolve_many(_keyed(queries)), self.loop)
+        return await asyncio.wrap_future(future)
+
+    def geocode(self, query: str, key: Optional[str] = None, timeout: Optional[float] = None) -> Coordinates:
+        """
+        Blocking wrapper around geocode_async. Raises TimeoutError after timeout
+        seconds; the lookup still finishes and is cached for the next try.
+        """
+        return asyncio.run_coroutine_threadsafe(self._resolve(key or query, query), self.loop).result(timeout)
+
+    def geocode_many(self, queries: Union[Iterable[str], Mapping[str, str]]) -> Dict[str, Coordinates]:
+        """Blocking wrapper around geocode_many_async"""
+        return asyncio.run_coroutine_threadsafe(self._resolve_many(_keyed(queries)), self.loop).result()
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=5)
+
+@st.cache_resource
+def get_scheduler() -> GeocodingScheduler:
+    """
+    Process-wide geocoding scheduler configured from the environment; callers
+    keep its bounds set to the box around the council districts
+    """
+    return GeocodingScheduler(backend_from_env(), GeocodeCache(get_shared_cache()))
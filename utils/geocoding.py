@@ -1,11 +1,18 @@
+import os
 import re
 from functools import lru_cache
-from geopy.geocoders import Nominatim
 from geopy.exc import GeocoderTimedOut, GeocoderUnavailable
 import streamlit as st
-from typing import List, Optional, Tuple
+from utils.geocoder_queue import GeocodingScheduler, get_scheduler
+from utils.single_flight import get_flight_group
+from utils.address_normalizer import parse_address, canonical_key, geocode_query
+from utils.metrics import timed
+from typing import Dict, Iterable, List, Optional, Tuple
 from time import sleep
 
+# Seconds a search waits for the geocoder before asking the visitor to try again
+GEOCODE_TIMEOUT = float(os.environ.get("GEOCODE_TIMEOUT", "15"))
+
 def validate_address(address: str) -> bool:
     """
     Validate if the input address follows the expected format for Chattanooga
@@ -14,12 +21,10 @@ def validate_address(address: str) -> bool:
         return False
 
     # Check for ZIP code
-    zip_match = re.search(r'\b\d{5}\b', address)
-    if not zip_match:
+    zip_code = parse_address(address).zip_code
+    if not zip_code:
         return False
 
-    zip_code = zip_match.group()
-
     # Verify it's a Chattanooga ZIP
     chattanooga_zips = {'37401', '37402', '37403', '37404', '37405', '37406', 
                        '37407', '37408', '37409', '37410', '37411', '37412', 
@@ -27,38 +32,101 @@ def validate_address(address: str) -> bool:
 
     return zip_code in chattanooga_zips
 
+def prepare_geocode_query(address: str) -> str:
+    """
+    Normalize an address and add Chattanooga location context if missing
+    """
+    return geocode_query(address)
+
+def get_area_scheduler() -> GeocodingScheduler:
+    """
+    The shared geocoding scheduler, its bounds refreshed from the box around
+    the council districts. Call from the script thread, where cache misses can
+    rebuild the box; the scheduler's own thread only reads the tuple.
+    """
+    from utils.district_data import get_service_area
+    scheduler = get_scheduler()
+    scheduler.set_bounds(get_service_area())
+    return scheduler
+
+@timed("geocoding.geocode_address")
 def geocode_address(address: str) -> Optional[Tuple[float, float]]:
     """
     Convert address to coordinates
     """
     try:
-        # Clean address
-        address = ' '.join(address.split())
-
-        # Add location context if missing
-        if "chattanooga" not in address.lower():
-            address = f"{address}, Chattanooga, TN"
-        elif "tn" not in address.lower() and "tennessee" not in address.lower():
-            address = f"{address}, TN"
-
-        # Initialize geocoder
-        geolocator = Nominatim(user_agent="chattanooga_voting_info")
-
-        # Try geocoding
-        location = geolocator.geocode(
-            address,
-            timeout=10,
-            exactly_one=True,
-            country_codes=['us']
-        )
-
-        if location:
-            # Verify coordinates are in Chattanooga area
-            if 34.9 <= location.latitude <= 35.2 and -85.4 <= location.longitude <= -85.1:
-                return location.latitude, location.longitude
+        key = canonical_key(address)
+        query = prepare_geocode_query(address)
 
-        return None
+        # Concurrent sessions searching the same address share one lookup.
+        # The shared queue is rate-limited, with searches ahead of batch uploads;
+        # results outside the Chattanooga area come back as None
+        return get_flight_group().do(f"geocode:{key}", get_area_scheduler().geocode, query, key, GEOCODE_TIMEOUT)
 
+    except TimeoutError:
+        st.error("The address lookup service is busy right now. Please try again in a minute, "
+                 "or click your location on the map.")
+        return None
     except Exception as e:
         st.error("Unable to process address. Please try again.")
-        return None
\ No newline at end of file
+        return None
+
+@timed("geocoding.geocode_addresses")
+def geocode_addresses(addresses: Iterable[str]) -> Dict[str, Optional[Tuple[float, float]]]:
+    """
+    Geocode many addresses concurrently through the shared queue,
+    looking up each distinct canonical address only once
+    """
+    addresses = list(dict.fromkeys(addresses))
+    keys = {
+        address: canonical_key(address)
+        for address in addresses
+        if address and address.strip()
+    }
+    queries = {}
+    for address, key in keys.items():
+        queries.setdefault(key, prepare_geocode_query(address))
+
+    coords = get_area_scheduler().geocode_many(queries)
+    return {address: coords.get(keys[address]) if address in keys else None for address in addresses}
+
+def _cold_search_script(address: str):
+    """A search made right after the boundaries reloaded, inside a column like My_Districts.py"""
+    import streamlit as st
+    from utils.district_data import get_service_area
+    from utils.geocoding import geocode_address
+
+    get_service_area.clear()
+    col1, _ = st.columns(2)
+    with col1:
+        st.session_state["coords"] = geocode_address(address)
+
+def _self_check():
+    """Geocode through the stub backend from a script run whose service-area cache is cold"""
+    import tempfile
+    import time
+    from streamlit.testing.v1 import AppTest
+    from utils.stub_geocoder import start_stub_geocoder
+
+    stub = start_stub_geocoder()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ.update(GEOCODER_DOMAIN=f"127.0.0.1:{stub.server_port}", GEOCODER_SCHEME="http",
+                          SHARED_CACHE_URL=f"sqlite:///{cache_dir}/shared_cache.sqlite")
+        # A fresh address each time, so the scheduler has to fetch and check the box
+        address = f"{int(time.time()) % 9000 + 100} Main St, 37405"
+        at = AppTest.from_function(_cold_search_script, args=(address,), default_timeout=60).run()
+        assert not at.exception, at.exception
+        assert not at.error, [e.value for e in at.error]
+        assert at.session_state["coords"] is not None
+        assert stub.request_count == 1
+    stub.shutdown()
+    print("Geocoding self-check passed")
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description="Geocoding checks")
+    parser.add_argument('--self-check', action='store_true',
+                        help="Search with a cold service-area cache against a local stub geocoder")
+    args = parser.parse_args()
+    if args.self_check:
+        _self_check()
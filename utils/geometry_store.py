@@ -0,0 +1,229 @@
+"""
+Columnar copies of the geometry CSVs in attached_assets. Each CSV becomes a
+Parquet file with typed, snake_case attribute columns and the shapes as WKB,
+so readers can load the attributes without touching geometry and decode all
+shapes in one vectorized shapely call.
+
+    python -m utils.geometry_store   # converts every registered CSV that changed
+
+Deploys run the conversion at build time and the server's warm-up runs it
+again before the first visitor, so readers normally find the copy current.
+"""
+import argparse
+import hashlib
+import os
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import shapely
+
+SOURCE_DIR = Path('attached_assets')
+STORE_DIR = Path('assets') / 'geometry'
+GEOMETRY_COLUMN = 'geometry'
+
+# Precinct and block files run to 100k+ polygons; past this many rows, parse on a process pool
+PARALLEL_THRESHOLD = 20_000
+CHUNK_SIZE = 10_000
+
+@dataclass(frozen=True)
+class GeometrySource:
+    csv_name: str
+    wkt_column: str
+
+# One entry per CSV; the "(1)" copy of the redistricting export is byte-identical and skipped
+SOURCES: Dict[str, GeometrySource] = {
+    "council_districts": GeometrySource('Current_City_Council_Districts_20250115.csv', 'the_geom'),
+    "council_districts_old": GeometrySource('City_Council__old__20250115.csv', 'geom'),
+    "redistricting_new": GeometrySource('Chattanooga_Redistricting_-_New_Districts_20250113.csv', 'polygon'),
+    # Hamilton County Election Commission voting precincts, same open-data CSV export as the council districts
+    "precincts": GeometrySource('Voting_Precincts.csv', 'the_geom'),
+}
+
+def snake_case(name: str) -> str:
+    return re.sub(r'[^0-9a-z]+', '_', name.strip().lstrip('﻿').lower()).strip('_')
+
+def store_path(name: str) -> Path:
+    return STORE_DIR / f"{name}.parquet"
+
+def _source_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+def _source_stat(path: Path) -> Tuple[int, int]:
+    stat = path.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+# Only one conversion per table at a time in this process; the rest wait for it
+_convert_lock = threading.Lock()
+
+# (source size, mtime) each Parquet file was last checked against, by store path
+_verified: Dict[Path, Tuple[int, int]] = {}
+
+def _wkt_to_wkb(values: np.ndarray) -> np.ndarray:
+    """Parse and repair one batch of WKT; WKB comes back cheaply from a worker process"""
+    geometries = shapely.from_wkt(values, on_invalid='warn')
+    invalid = ~shapely.is_valid(geometries) & ~shapely.is_missing(geometries)
+    if invalid.any():
+        geometries[invalid] = shapely.make_valid(geometries[invalid])
+    return shapely.to_wkb(geometries)
+
+def parse_wkt(values: np.ndarray, workers: Optional[int] = None, chunk_size: int = CHUNK_SIZE) -> np.ndarray:
+    """
+    WKT strings to valid WKB with shapely's array functions. Inputs over
+    PARALLEL_THRESHOLD rows are split into chunks parsed on a process pool;
+    workers=1 forces a single process.
+    """
+    values = np.asarray(values, dtype=object)
+    if workers is None:
+        workers = (os.cpu_count() or 1) if len(values) > PARALLEL_THRESHOLD else 1
+    if workers <= 1 or len(values) <= chunk_size:
+        return _wkt_to_wkb(values)
+
+    chunks = [values[i:i + chunk_size] for i in range(0, len(values), chunk_size)]
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+        return np.concatenate(list(pool.map(_wkt_to_wkb, chunks)))
+
+def convert_csv(csv_path: Path, wkt_column: str, output: Path, workers: Optional[int] = None) -> Dict[str, float]:
+    """Write a WKT CSV as Parquet with typed attribute columns and a WKB geometry column"""
+    start = time.perf_counter()
+
+    df = pd.read_csv(csv_path, encoding='utf-8-sig')
+    wkt_values = df.pop(wkt_column)
+    wkb = parse_wkt(wkt_values.where(wkt_values.notna(), None).to_numpy(), workers)
+
+    df.columns = [snake_case(column) for column in df.columns]
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.append_column(GEOMETRY_COLUMN, pa.array(wkb, type=pa.binary()))
+    size, mtime_ns = _source_stat(csv_path)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        b"source": csv_path.name.encode(),
+        b"source_sha256": _source_digest(csv_path).encode(),
+        b"source_size": str(size).encode(),
+        b"source_mtime_ns": str(mtime_ns).encode(),
+    })
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    # Per process and thread, so concurrent converters never write the same temporary file
+    tmp_path = output.with_name(f".{output.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    pq.write_table(table, tmp_path, compression='zstd')
+    tmp_path.replace(output)
+    _verified[output] = (size, mtime_ns)
+    return {
+        "rows": table.num_rows,
+        "csv_bytes": csv_path.stat().st_size,
+        "parquet_bytes": output.stat().st_size,
+        "seconds": time.perf_counter() - start,
+    }
+
+def convert(name: str, workers: Optional[int] = None) -> Dict[str, float]:
+    """Convert one registered CSV to Parquet; returns sizes and timing"""
+    source = SOURCES[name]
+    return convert_csv(SOURCE_DIR / source.csv_name, source.wkt_column, store_path(name), workers)
+
+def is_current(name: str) -> bool:
+    """
+    Whether the Parquet file exists and was built from the current CSV. Size
+    and mtime decide it; the CSV is hashed only when they differ from the
+    ones recorded, e.g. after a checkout touched an unchanged file.
+    """
+    path = store_path(name)
+    if not path.exists():
+        return False
+    csv_path = SOURCE_DIR / SOURCES[name].csv_name
+    source = _source_stat(csv_path)
+    if _verified.get(path) == source:
+        return True
+    metadata = pq.read_schema(path).metadata or {}
+    recorded = (int(metadata.get(b"source_size", b"-1")), int(metadata.get(b"source_mtime_ns", b"-1")))
+    if recorded != source and metadata.get(b"source_sha256", b"").decode() != _source_digest(csv_path):
+        return False
+    _verified[path] = source
+    return True
+
+def has_source(name: str) -> bool:
+    """Whether there is a CSV or an already converted copy to read from"""
+    return store_path(name).exists() or (SOURCE_DIR / SOURCES[name].csv_name).exists()
+
+def ensure_store(name: str) -> Path:
+    """Path to the Parquet file, converting the CSV first if the copy is missing or stale"""
+    path = store_path(name)
+    csv_path = SOURCE_DIR / SOURCES[name].csv_name
+    if path.exists() and not csv_path.exists():
+        return path
+    if not is_current(name):
+        with _convert_lock:
+            if not is_current(name):  # Someone else may have converted it while we waited
+                convert(name)
+    return path
+
+def read_attributes(name: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Attribute columns only; the geometry column is never read from disk"""
+    path = ensure_store(name)
+    if columns is None:
+        columns = [field for field in pq.read_schema(path).names if field != GEOMETRY_COLUMN]
+    return pq.read_table(path, columns=columns).to_pandas()
+
+def read_geometries(name: str, columns: Optional[List[str]] = None) -> Tuple[pd.DataFrame, np.ndarray]:
+    """Attributes plus every shape, decoded from WKB in one call"""
+    path = ensure_store(name)
+    if columns is None:
+        columns = [field for field in pq.read_schema(path).names if field != GEOMETRY_COLUMN]
+    table = pq.read_table(path, columns=[*columns, GEOMETRY_COLUMN])
+    geometries = shapely.from_wkb(table.column(GEOMETRY_COLUMN).to_numpy(zero_copy_only=False))
+    return table.drop_columns([GEOMETRY_COLUMN]).to_pandas(), geometries
+
+def convert_all(force: bool = False, workers: Optional[int] = None) -> Dict[str, Optional[Dict[str, float]]]:
+    """Convert every CSV whose Parquet copy is missing or stale; None for ones skipped"""
+    return {
+        name: convert(name, workers) if force or not is_current(name) else None
+        for name, source in SOURCES.items()
+        if (SOURCE_DIR / source.csv_name).exists()
+    }
+
+def _compare_reads(name: str):
+    """Time the old pandas + wkt.loads path against the Parquet readers"""
+    from shapely import wkt
+    source = SOURCES[name]
+
+    start = time.perf_counter()
+    df = pd.read_csv(SOURCE_DIR / source.csv_name, encoding='utf-8-sig')
+    [wkt.loads(value) for value in df[source.wkt_column]]
+    csv_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    read_attributes(name)
+    attribute_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    read_geometries(name)
+    geometry_seconds = time.perf_counter() - start
+
+    print(f"  {name}: csv+wkt {csv_seconds * 1000:.1f} ms, parquet attributes {attribute_seconds * 1000:.1f} ms, "
+          f"parquet+wkb {geometry_seconds * 1000:.1f} ms")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Convert the geometry CSVs in attached_assets to Parquet")
+    parser.add_argument('--force', action='store_true', help="Rebuild even when the CSV is unchanged")
+    parser.add_argument('--compare', action='store_true', help="Time reads against the CSV path")
+    parser.add_argument('--workers', type=int, default=None,
+                        help=f"Processes for WKT parsing (default: all cores past {PARALLEL_THRESHOLD:,} rows)")
+    args = parser.parse_args()
+
+    for name, result in convert_all(args.force, args.workers).items():
+        if result is None:
+            print(f"{name}: up to date")
+        else:
+            print(f"{name}: {result['rows']} rows, {result['csv_bytes'] / 1024:,.0f} KB CSV -> "
+                  f"{result['parquet_bytes'] / 1024:,.0f} KB Parquet in {result['seconds']:.2f}s")
+    if args.compare:
+        for name, source in SOURCES.items():
+            if (SOURCE_DIR / source.csv_name).exists():
+                _compare_reads(name)
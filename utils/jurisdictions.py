@@ -0,0 +1,195 @@
+"""
+Every boundary layer a voter sits in (city council, county commission, school
+board, state house and senate, precinct), answered by one spatial query.
+All layers share a single STR-tree, so a lookup is one index probe however
+many layers are registered, and each layer's file is read once.
+
+Layers without a local file are skipped. To add one, drop a GeoJSON file in
+assets/jurisdictions/ with the name listed in OPTIONAL_LAYERS (precincts come
+from a geometry_store CSV instead), or call register_layer().
+
+    python -m utils.jurisdictions 35.0456 -85.3097
+"""
+import argparse
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+import shapely
+from shapely.geometry import shape
+from shapely.strtree import STRtree
+from utils.boundary_sets import BOUNDARY_SETS, district_id
+from utils.cache_stats import tracked_cache_resource
+from utils.district_data import precinct_id
+from utils.geometry_store import has_source, read_geometries
+
+LAYER_DIR = Path('assets') / 'jurisdictions'
+
+# Points this close to a polygon (in degrees, about 100 m) still match it, as with the council lookup
+BUFFER_DISTANCE = 0.001
+
+NOT_FOUND = "Not found"
+
+@dataclass(frozen=True)
+class JurisdictionLayer:
+    name: str
+    label: str
+    load: Callable[[], Tuple[np.ndarray, np.ndarray]]  # (ids, geometries)
+    available: Callable[[], bool] = lambda: True        # Layers whose data has not arrived are skipped
+
+def store_layer(name: str, label: str, source: str, id_column: str,
+                normalize: Callable[[object], str] = district_id) -> JurisdictionLayer:
+    """A layer read from a utils.geometry_store table, used once its CSV is in attached_assets"""
+    def load():
+        attributes, geometries = read_geometries(source, columns=[id_column])
+        return np.array([normalize(v) for v in attributes[id_column]], dtype=object), geometries
+    return JurisdictionLayer(name, label, load, lambda: has_source(source))
+
+def geojson_layer(name: str, label: str, path: Path, id_property: str = 'district') -> JurisdictionLayer:
+    """A layer read from a local GeoJSON FeatureCollection"""
+    def load():
+        with path.open() as f:
+            features = [f_ for f_ in json.load(f).get('features', []) if f_.get('geometry')]
+        ids = np.array([str(f_.get('properties', {}).get(id_property, '')) for f_ in features], dtype=object)
+        return ids, np.array([shape(f_['geometry']) for f_ in features], dtype=object)
+    return JurisdictionLayer(name, label, load, path.exists)
+
+JURISDICTION_LAYERS: Dict[str, JurisdictionLayer] = {}
+
+def register_layer(layer: JurisdictionLayer):
+    """Add a layer; the combined index picks it up when it is next rebuilt"""
+    JURISDICTION_LAYERS[layer.name] = layer
+
+def boundary_set_layer(set_name: str) -> str:
+    return f"council_{set_name}"
+
+for boundary_set in BOUNDARY_SETS.values():
+    register_layer(store_layer(boundary_set_layer(boundary_set.name), f"City Council ({boundary_set.label})",
+                               boundary_set.source, boundary_set.district_column))
+
+# Precinct polygons come in through the geometry store like the council districts; the
+# polling place for each precinct is in the assignment table (assets/polling_places.csv)
+PRECINCT_LAYER = "precinct"
+register_layer(store_layer(PRECINCT_LAYER, "Voting Precinct", "precincts", "precinct", normalize=precinct_id))
+
+# Layers we expect to get as files; each is used once its file is in place
+OPTIONAL_LAYERS = [
+    ("county_commission", "Hamilton County Commission", "district"),
+    ("school_board", "Hamilton County School Board", "district"),
+    ("state_house", "Tennessee House", "district"),
+    ("state_senate", "Tennessee Senate", "district"),
+]
+for layer_name, layer_label, id_property in OPTIONAL_LAYERS:
+    register_layer(geojson_layer(layer_name, layer_label, LAYER_DIR / f"{layer_name}.geojson", id_property))
+
+@dataclass
+class JurisdictionIndex:
+    tree: Optional[STRtree]
+    layers: List[str]          # Layer names, indexed by layer_codes
+    layer_codes: np.ndarray    # Layer of each geometry in the tree
+    ids: np.ndarray            # District/precinct id of each geometry
+    geometries: np.ndarray
+
+    def layer(self, name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Ids and geometries of one layer, without reloading it"""
+        mask = self.layer_codes == self.layers.index(name)
+        return self.ids[mask], self.geometries[mask]
+
+@tracked_cache_resource(ttl=3600)  # Rebuilt with the boundary files
+def get_jurisdiction_index() -> JurisdictionIndex:
+    """Load every available layer once and index all their polygons together"""
+    layers, codes, ids, geometries = [], [], [], []
+    for layer in JURISDICTION_LAYERS.values():
+        if not layer.available():
+            continue
+        layer_ids, layer_geometries = layer.load()
+        codes.append(np.full(len(layer_ids), len(layers), dtype=np.int32))
+        layers.append(layer.name)
+        ids.append(layer_ids)
+        geometries.append(layer_geometries)
+
+    if not layers:
+        empty = np.array([], dtype=object)
+        return JurisdictionIndex(None, [], np.array([], dtype=np.int32), empty, empty)
+    geometries = np.concatenate(geometries)
+    # Prepared once here, so every point test after the tree probe is fast
+    shapely.prepare(geometries)
+    return JurisdictionIndex(STRtree(geometries), layers, np.concatenate(codes), np.concatenate(ids), geometries)
+
+def lookup_jurisdictions_for_points(lats: np.ndarray, lons: np.ndarray,
+                                    buffer_distance: float = BUFFER_DISTANCE) -> pd.DataFrame:
+    """
+    One column per available layer. A point inside a polygon gets that
+    polygon's id; one just outside (on a boundary edge) gets the nearest
+    polygon within buffer_distance; anything else gets "Not found".
+    """
+    index = get_jurisdiction_index()
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    result = pd.DataFrame(NOT_FOUND, index=range(len(lats)), columns=index.layers, dtype=object)
+    valid = np.flatnonzero(~(np.isnan(lats) | np.isnan(lons)))
+    if index.tree is None or not len(valid):
+        return result
+
+    # One probe against every layer's polygons at once: bounding boxes from
+    # the tree, then exact tests against the prepared polygons
+    points = shapely.points(lons[valid], lats[valid])
+    point_idx, tree_idx = index.tree.query(points)
+    inside = shapely.intersects(index.geometries[tree_idx], points[point_idx])
+    matches = [(point_idx[inside], tree_idx[inside], np.zeros(inside.sum()))]
+
+    # Points on a boundary edge can miss a layer by a hair; look a little further for just those
+    found = pd.DataFrame({"point": point_idx[inside], "layer": index.layer_codes[tree_idx[inside]]}).drop_duplicates()
+    missing = np.flatnonzero(np.bincount(found["point"], minlength=len(points)) < len(index.layers))
+    if len(missing):
+        x, y = shapely.get_x(points[missing]), shapely.get_y(points[missing])
+        boxes = shapely.box(x - buffer_distance, y - buffer_distance, x + buffer_distance, y + buffer_distance)
+        near_point, near_tree = index.tree.query(boxes)
+        near_point = missing[near_point]
+        resolved = set(zip(found["point"], found["layer"]))
+        unresolved = np.array([(p, c) not in resolved for p, c in zip(near_point, index.layer_codes[near_tree])],
+                              dtype=bool)
+        near_point, near_tree = near_point[unresolved], near_tree[unresolved]
+        close = shapely.dwithin(index.geometries[near_tree], points[near_point], buffer_distance)
+        near_point, near_tree = near_point[close], near_tree[close]
+        matches.append((near_point, near_tree,
+                        shapely.distance(index.geometries[near_tree], points[near_point])))
+
+    matches = pd.DataFrame({
+        "point": valid[np.concatenate([m[0] for m in matches])],
+        "order": np.concatenate([m[1] for m in matches]),
+        "distance": np.concatenate([m[2] for m in matches]),
+    })
+    if matches.empty:
+        return result
+    matches["layer"] = index.layer_codes[matches["order"]]
+    matches["id"] = index.ids[matches["order"]]
+
+    # Containing polygon first (distance 0), else the nearest; ties go to file order
+    best = matches.sort_values(["distance", "order"]).drop_duplicates(["point", "layer"])
+    for code, rows in best.groupby("layer"):
+        result.loc[rows["point"].to_numpy(), index.layers[code]] = rows["id"].to_numpy()
+    return result
+
+def lookup_jurisdictions(lat: float, lon: float) -> Dict[str, str]:
+    """Every available layer's id for one point"""
+    return lookup_jurisdictions_for_points(np.array([lat]), np.array([lon])).iloc[0].to_dict()
+
+def layer_label(name: str) -> str:
+    return JURISDICTION_LAYERS[name].label if name in JURISDICTION_LAYERS else name
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Every district and precinct containing a point")
+    parser.add_argument('lat', type=float)
+    parser.add_argument('lon', type=float)
+    args = parser.parse_args()
+
+    index = get_jurisdiction_index()
+    missing = [name for name, layer in JURISDICTION_LAYERS.items() if not layer.available()]
+    print(f"{len(index.layers)} layers, {len(index.geometries)} polygons in one index")
+    if missing:
+        print(f"No file for: {', '.join(missing)}")
+    for name, value in lookup_jurisdictions(args.lat, args.lon).items():
+        print(f"  {layer_label(name)}: {value}")
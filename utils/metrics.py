@@ -0,0 +1,199 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from streamlit.logger import get_logger
+
+# Instrumentation is decided once at import: when disabled, `timed` returns the
+# function unchanged and `span` returns a shared no-op context manager.
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "").lower() in ("1", "true", "yes")
+# /metrics and /ready are for a scraper or probe inside the deployment's network.
+# The port is deliberately left out of .replit's [[ports]]: the platform health
+# check only sees the Streamlit port, and server internals stay off the internet.
+METRICS_PORT = int(os.environ.get("METRICS_PORT", "9464"))
+LOG_RERUNS = os.environ.get("METRICS_LOG_RERUNS", "").lower() in ("1", "true", "yes")
+
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+NOOP_SPAN = nullcontext()
+
+# Streamlit's logger, so per-rerun lines show up in the server log
+logger = get_logger(__name__)
+
+class Histogram:
+    """Cumulative Prometheus-style histogram of span durations in seconds"""
+
+    def __init__(self):
+        self.bucket_counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.bucket_counts[i] += 1
+                break
+
+_lock = threading.Lock()
+_histograms: Dict[str, Histogram] = {}
+_collectors: List[Callable[[], List[str]]] = []
+_readiness_checks: List[Callable[[], Tuple[bool, dict]]] = []
+_rerun_spans = threading.local()
+
+def observe(name: str, seconds: float):
+    """Record one duration for a span name"""
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram()
+        histogram.observe(seconds)
+
+    if LOG_RERUNS:
+        spans = getattr(_rerun_spans, 'spans', None)
+        if spans is None:
+            spans = _rerun_spans.spans = []
+        spans.append((name, seconds))
+
+@contextmanager
+def _timed_span(name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start)
+
+def span(name: str):
+    """Context manager timing a block under `name`; a no-op when metrics are off"""
+    if not METRICS_ENABLED:
+        return NOOP_SPAN
+    return _timed_span(name)
+
+def timed(name: str):
+    """Decorator timing every call of a function under `name`"""
+    def decorator(fn):
+        if not METRICS_ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - start)
+
+        # Keep st.cache_data helpers such as .clear() reachable
+        if hasattr(fn, 'clear'):
+            wrapper.clear = fn.clear
+        return wrapper
+    return decorator
+
+def log_rerun_spans(page_name: str):
+    """Log the spans recorded on this script thread since the last call"""
+    if not (METRICS_ENABLED and LOG_RERUNS):
+        return
+    spans = getattr(_rerun_spans, 'spans', None) or []
+    _rerun_spans.spans = []
+    if spans:
+        total = sum(seconds for _, seconds in spans)
+        details = ", ".join(f"{name}={seconds * 1000:.1f}ms" for name, seconds in spans)
+        logger.info("rerun %s: %d spans, %.1fms instrumented: %s", page_name, len(spans), total * 1000, details)
+
+def register_collector(collector: Callable[[], List[str]]):
+    """Add a callable returning extra Prometheus exposition lines"""
+    with _lock:
+        if collector not in _collectors:
+            _collectors.append(collector)
+
+def register_readiness_check(check: Callable[[], Tuple[bool, dict]]):
+    """Add a callable returning (ready, details) that /ready must wait for"""
+    with _lock:
+        if check not in _readiness_checks:
+            _readiness_checks.append(check)
+
+def readiness() -> Tuple[bool, dict]:
+    """Combined result of every readiness check"""
+    with _lock:
+        checks = list(_readiness_checks)
+    ready, details = True, {}
+    for check in checks:
+        check_ready, check_details = check()
+        ready = ready and check_ready
+        details.update(check_details)
+    return ready, details
+
+def _format_bound(bound: float) -> str:
+    return f"{bound:g}"
+
+def render_prometheus() -> str:
+    """Metrics in the Prometheus text exposition format"""
+    lines = [
+        "# HELP chattanooga_vote_span_seconds Time spent in instrumented functions and blocks",
+        "# TYPE chattanooga_vote_span_seconds histogram",
+    ]
+    with _lock:
+        snapshot = {name: (list(h.bucket_counts), h.count, h.total) for name, h in _histograms.items()}
+        collectors = list(_collectors)
+
+    for name, (bucket_counts, count, total) in sorted(snapshot.items()):
+        cumulative = 0
+        for bound, bucket_count in zip(BUCKETS, bucket_counts):
+            cumulative += bucket_count
+            lines.append(f'chattanooga_vote_span_seconds_bucket{{span="{name}",le="{_format_bound(bound)}"}} {cumulative}')
+        lines.append(f'chattanooga_vote_span_seconds_bucket{{span="{name}",le="+Inf"}} {count}')
+        lines.append(f'chattanooga_vote_span_seconds_sum{{span="{name}"}} {total:.6f}')
+        lines.append(f'chattanooga_vote_span_seconds_count{{span="{name}"}} {count}')
+
+    for collector in collectors:
+        try:
+            lines.extend(collector())
+        except Exception as e:
+            logger.warning("Metrics collector failed: %s", e)
+
+    return "\n".join(lines) + "\n"
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        if path == '/metrics':
+            self._send(200, render_prometheus(), 'text/plain; version=0.0.4; charset=utf-8')
+        elif path == '/ready':
+            ready, details = readiness()
+            self._send(200 if ready else 503, json.dumps({"ready": ready, **details}), 'application/json')
+        else:
+            self.send_error(404)
+
+    def _send(self, status: int, text: str, content_type: str):
+        body = text.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+_server: Optional[ThreadingHTTPServer] = None
+
+def start_metrics_server(port: int = METRICS_PORT) -> Optional[ThreadingHTTPServer]:
+    """Serve /metrics and /ready on a background thread, once per process, for internal clients"""
+    global _server
+    with _lock:
+        if _server is not None:
+            return _server
+        try:
+            _server = ThreadingHTTPServer(('0.0.0.0', port), MetricsHandler)
+        except OSError as e:
+            logger.warning("Metrics endpoint not started on port %d: %s", port, e)
+            return None
+    threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+    return _server
+
+if METRICS_ENABLED:
+    start_metrics_server()
@@ -1,17 +1,23 @@
+import io
 import os
 from pathlib import Path
 import streamlit as st
 from PIL import Image
 import shutil
-from typing import Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 import subprocess
+from utils.metrics import timed
+from utils.scraping import ScrapeContext, Scraper, ValidationError, write_atomic
+
+PHOTO_DIR = Path('candidate_photos')
 
 def create_photo_directory() -> Path:
     """Create directory for storing candidate photos if it doesn't exist"""
-    photo_dir = Path('candidate_photos')
+    photo_dir = PHOTO_DIR
     photo_dir.mkdir(parents=True, exist_ok=True)
     return photo_dir
 
+@timed("photo_scraper.convert_avif_to_png")
 def convert_avif_to_png(avif_path: Path) -> Optional[Path]:
     """Convert AVIF to PNG using system tools"""
     try:
@@ -35,6 +41,24 @@ def sanitize_filename(name: str) -> str:
     sanitized = name.replace('"', '').replace("'", '').replace(' ', '_')
     return sanitized
 
+def encode_candidate_photo(source_path: Path) -> bytes:
+    """Candidate photo as an RGB JPEG no larger than 800x800"""
+    # Open and process the image
+    with Image.open(str(source_path)) as img:
+        # Convert to RGB if needed
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+
+        # Resize if too large while maintaining aspect ratio
+        max_size = (800, 800)
+        img.thumbnail(max_size, Image.Resampling.LANCZOS)
+
+        # Save as optimized JPEG
+        buffer = io.BytesIO()
+        img.save(buffer, 'JPEG', quality=85, optimize=True)
+        return buffer.getvalue()
+
+@timed("photo_scraper.process_candidate_photo")
 def process_candidate_photo(source_path: Union[str, Path], candidate_name: str) -> Optional[str]:
     """Process and save candidate photo from source path"""
     try:
@@ -48,20 +72,7 @@ def process_candidate_photo(source_path: Union[str, Path], candidate_name: str)
             return None
 
         try:
-            # Open and process the image
-            img = Image.open(str(source_path))
-
-            # Convert to RGB if needed
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
-
-            # Resize if too large while maintaining aspect ratio
-            max_size = (800, 800)
-            img.thumbnail(max_size, Image.Resampling.LANCZOS)
-
-            # Save as optimized JPEG
-            img.save(target_path, 'JPEG', quality=85, optimize=True)
-            return str(target_path)
+            return str(write_atomic(target_path, encode_candidate_photo(source_path)))
 
         except Exception as e:
             st.error(f"Error processing image for {candidate_name}: {str(e)}")
@@ -71,26 +82,21 @@ def process_candidate_photo(source_path: Union[str, Path], candidate_name: str)
         st.error(f"Error processing photo for {candidate_name}: {str(e)}")
         return None
 
-def get_candidate_photo(candidate_name: str, district: str) -> Optional[str]:
-    """Get candidate photo path from various sources"""
+def photo_sources(candidate_name: str, district: str) -> List[Path]:
+    """Existing source photos for a candidate, best match first"""
     # Clean the candidate name for file matching
     clean_name = sanitize_filename(candidate_name)
 
     # List of directories to check
-    photo_dir = create_photo_directory()
     assets_dir = Path('attached_assets')
     candidate_photos_dir = Path('assets/candidate_photos')
-
-    # First, check if we already have a processed photo
-    jpg_path = photo_dir / f"{clean_name}.jpg"
-    if jpg_path.exists():
-        return str(jpg_path)
+    sources = []
 
     # Check in assets/candidate_photos directory
     if candidate_photos_dir.exists():
         # Create specific name variations based on the candidate name
         possible_names = []
-        
+
         # Handle special case for Evelina
         if "Evelina Irén Kertay" in candidate_name:
             possible_names.extend([
@@ -106,13 +112,7 @@ def get_candidate_photo(candidate_name: str, district: str) -> Optional[str]:
                 f"{candidate_name.replace(' ', '-')}.jpg",
                 f"{candidate_name.replace(' ', '-')}.png"
             ])
-
-        for name in possible_names:
-            photo_path = candidate_photos_dir / name
-            if photo_path.exists():
-                processed_path = process_candidate_photo(photo_path, candidate_name)
-                if processed_path:
-                    return processed_path
+        sources.extend(candidate_photos_dir / name for name in possible_names)
 
     # Check in attached_assets directory as fallback
     if assets_dir.exists():
@@ -132,19 +132,56 @@ def get_candidate_photo(candidate_name: str, district: str) -> Optional[str]:
             f"{clean_name.lower()}-d{district}.jpg",
             f"{clean_name.lower()}-d{district}.avif"
         ]
+        sources.extend(assets_dir / name for name in possible_names)
+
+    return [path for path in sources if path.exists()]
+
+@timed("photo_scraper.get_candidate_photo")
+def get_candidate_photo(candidate_name: str, district: str) -> Optional[str]:
+    """Get candidate photo path from various sources"""
+    # First, check if we already have a processed photo
+    jpg_path = create_photo_directory() / f"{sanitize_filename(candidate_name)}.jpg"
+    if jpg_path.exists():
+        return str(jpg_path)
+
+    for source_path in photo_sources(candidate_name, district):
+        if source_path.suffix == '.avif':
+            source_path = convert_avif_to_png(source_path)
+            if not source_path:
+                continue
+        processed_path = process_candidate_photo(source_path, candidate_name)
+        if processed_path:
+            return processed_path
+
+    return None
 
-        for name in possible_names:
-            asset_path = assets_dir / name
-            if asset_path.exists():
-                if asset_path.suffix == '.avif':
-                    png_path = convert_avif_to_png(asset_path)
-                    if png_path:
-                        processed_path = process_candidate_photo(png_path, candidate_name)
-                        if processed_path:
-                            return processed_path
-                else:
-                    processed_path = process_candidate_photo(asset_path, candidate_name)
-                    if processed_path:
-                        return processed_path
-
-    return None
\ No newline at end of file
+class CandidatePhotoScraper(Scraper):
+    """Every candidate's photo, resized to a JPEG in candidate_photos/"""
+    name = "candidate_photos"
+
+    def fetch(self, ctx: ScrapeContext) -> List[Tuple[str, List[Path]]]:
+        from utils.candidate_data import get_all_candidates
+        return [(candidate.name, photo_sources(candidate.name, candidate.district))
+                for candidate in get_all_candidates()]
+
+    def parse(self, raw: List[Tuple[str, List[Path]]]) -> Dict[str, bytes]:
+        photos = {}
+        for candidate_name, sources in raw:
+            for source_path in sources:
+                if source_path.suffix == '.avif':
+                    source_path = convert_avif_to_png(source_path)
+                    if not source_path:
+                        continue
+                try:
+                    photos[f"{sanitize_filename(candidate_name)}.jpg"] = encode_candidate_photo(source_path)
+                    break
+                except Exception as e:
+                    print(f"Error processing image for {candidate_name}: {str(e)}")
+        return photos
+
+    def validate(self, data: Dict[str, bytes]) -> None:
+        if not data:
+            raise ValidationError("no candidate photos found")
+
+    def publish(self, data: Dict[str, bytes], ctx: ScrapeContext) -> List[Path]:
+        return [ctx.publish(PHOTO_DIR / file_name, photo) for file_name, photo in data.items()]
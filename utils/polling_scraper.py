@@ -1,70 +1,89 @@
-
-import requests
-from bs4 import BeautifulSoup
+import string
+from typing import Dict, Iterable, Iterator, List
+from lxml import etree
 import pandas as pd
 from pathlib import Path
+from utils.address_normalizer import DEFAULT_CITY, DEFAULT_STATE, parse_address
+from utils.scraping import ScrapeContext, Scraper, ValidationError, create_session, run_scraper
+
+# Hamilton County Election Commission polling places
+POLLING_PLACES_URL = "https://elect.hamiltontn.gov/Polling-Places"
+
+POLLING_PLACES_PATH = Path('assets') / 'polling_places.csv'
+
+def iter_table_rows(chunks: Iterable[bytes]) -> Iterator[List[str]]:
+    """
+    Cell text of each row in the page's first table, parsed with lxml as the
+    bytes arrive. Finished rows are dropped from the tree, and reading stops
+    at the end of the table, so memory stays flat however long the list gets.
+    """
+    parser = etree.HTMLPullParser(events=('start', 'end'), tag=('table', 'tr'))
+    depth = 0  # Tables open inside the first one
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, element in parser.read_events():
+            if element.tag == 'table':
+                depth += 1 if event == 'start' else -1
+                if event == 'end' and depth == 0:
+                    return
+            elif event == 'end' and depth == 1:
+                yield [''.join(cell.itertext()).strip() for cell in element.iterchildren('td')]
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+
+def polling_place_record(precinct: str, location: str, address: str) -> Dict[str, str]:
+    """One polling_places.csv row; the address is split by the shared address normalizer"""
+    components = parse_address(address)
+    street = ' '.join(part for part in [components.street_line, components.unit] if part)
+    return {
+        'precinct': precinct,
+        'location_name': location,
+        'address': string.capwords(street),
+        'city': string.capwords(components.city or DEFAULT_CITY),
+        'state': components.state or DEFAULT_STATE,
+        'zip': components.zip_code,
+    }
+
+def parse_polling_places(chunks: Iterable[bytes]) -> List[Dict[str, str]]:
+    """Polling place records from the Election Commission table (precinct, location, address)"""
+    rows = iter_table_rows(chunks)
+    next(rows, None)  # Skip header row
+    return [polling_place_record(*cells[:3]) for cells in rows if len(cells) >= 3]
+
+class PollingPlaceScraper(Scraper):
+    name = "polling_places"
+
+    def fetch(self, ctx: ScrapeContext) -> Iterator[bytes]:
+        # The page is parsed as it streams in, so most of the download time is counted under parse
+        return ctx.stream(POLLING_PLACES_URL, fixture="polling_places.html")
+
+    def parse(self, raw: Iterator[bytes]) -> List[Dict[str, str]]:
+        try:
+            return parse_polling_places(raw)
+        finally:
+            raw.close()  # Parsing stops at the end of the table; release the connection now
+
+    def validate(self, data: List[Dict[str, str]]) -> None:
+        if not data:
+            raise ValidationError("no polling places found in the page")
+        incomplete = [place['precinct'] or '?' for place in data if not (place['precinct'] and place['address'])]
+        if incomplete:
+            raise ValidationError(f"rows without a precinct or address: {', '.join(incomplete[:5])}")
+
+    def publish(self, data: List[Dict[str, str]], ctx: ScrapeContext) -> List[Path]:
+        return [ctx.publish(POLLING_PLACES_PATH, pd.DataFrame(data).to_csv(index=False))]
 
 def scrape_polling_places():
     """
     Scrape polling place information from Hamilton County Election Commission website
     """
-    try:
-        # Create assets directory if it doesn't exist
-        Path('assets').mkdir(exist_ok=True)
-        
-        # URL for Hamilton County Election Commission polling places
-        url = "https://elect.hamiltontn.gov/Polling-Places"
-        
-        response = requests.get(url)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Find the table with polling place information
-        polling_places = []
-        
-        # Extract table data
-        table = soup.find('table')
-        if table:
-            rows = table.find_all('tr')[1:]  # Skip header row
-            for row in rows:
-                cols = row.find_all('td')
-                if len(cols) >= 3:
-                    precinct = cols[0].text.strip()
-                    location = cols[1].text.strip()
-                    address = cols[2].text.strip()
-                    
-                    # Split address into components
-                    addr_parts = address.split(',')
-                    if len(addr_parts) >= 2:
-                        street = addr_parts[0].strip()
-                        city_state_zip = addr_parts[1].strip().split()
-                        
-                        city = 'Chattanooga'
-                        state = 'TN'
-                        zip_code = city_state_zip[-1] if city_state_zip else ''
-                        
-                        polling_places.append({
-                            'precinct': precinct,
-                            'location_name': location,
-                            'address': street,
-                            'city': city,
-                            'state': state,
-                            'zip': zip_code
-                        })
-        
-        # Create DataFrame and save to CSV
-        if polling_places:
-            df = pd.DataFrame(polling_places)
-            df.to_csv('assets/polling_places.csv', index=False)
-            print(f"Successfully saved {len(polling_places)} polling places")
-            return True
-            
-        return False
-        
-    except Exception as e:
-        print(f"Error scraping polling places: {str(e)}")
-        return False
+    result = run_scraper(PollingPlaceScraper(), ScrapeContext(create_session(1)))
+    if result.ok:
+        print(f"Successfully saved {result.records} polling places")
+    else:
+        print(f"Error scraping polling places: {result.error}")
+    return result.ok
 
 if __name__ == '__main__':
     success = scrape_polling_places()
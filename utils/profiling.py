@@ -0,0 +1,139 @@
+import hashlib
+import hmac
+import io
+import json
+import os
+import re
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+import streamlit as st
+from streamlit.logger import get_logger
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+try:
+    import pyinstrument
+except ImportError:
+    pyinstrument = None
+
+# Profiling is decided once at import. With neither switch set,
+# start_rerun_profile and finish_rerun_profile return straight away.
+PROFILE_RERUNS = os.environ.get("PROFILE_RERUNS", "").lower() in ("1", "true", "yes")
+PROFILE_TOKEN = os.environ.get("PROFILE_TOKEN", "")
+PROFILE_DIR = Path(os.environ.get("PROFILE_DIR", ".cache/profiles"))
+PROFILE_KEEP = int(os.environ.get("PROFILE_KEEP", "50"))
+PROFILE_MIN_SECONDS = float(os.environ.get("PROFILE_MIN_SECONDS", "0"))
+PROFILE_INTERVAL = float(os.environ.get("PROFILE_INTERVAL", "0.001"))
+PROFILING_AVAILABLE = PROFILE_RERUNS or bool(PROFILE_TOKEN)
+
+logger = get_logger(__name__)
+
+class RerunProfile:
+    """A profiler running for one page rerun of one session"""
+
+    def __init__(self, page_name: str, session_id: str):
+        self.page_name = page_name
+        self.session_id = session_id
+        self.started = time.perf_counter()
+        self.started_at = datetime.now(timezone.utc)
+        if pyinstrument is not None:
+            self.backend = "pyinstrument"
+            self.profiler = pyinstrument.Profiler(interval=PROFILE_INTERVAL, async_mode="disabled")
+            self.profiler.start()
+        else:
+            import cProfile
+            self.backend = "cProfile"
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+
+    def stop(self) -> float:
+        if self.backend == "pyinstrument":
+            self.profiler.stop()
+        else:
+            self.profiler.disable()
+        return time.perf_counter() - self.started
+
+    def report(self) -> str:
+        if self.backend == "pyinstrument":
+            return self.profiler.output_text(unicode=True, show_all=False)
+        import pstats
+        stream = io.StringIO()
+        pstats.Stats(self.profiler, stream=stream).sort_stats("cumulative").print_stats(60)
+        return stream.getvalue()
+
+# The running profile lives in session state, so it goes away with its session
+# even when the visitor disconnects before the rerun finishes
+_STATE_KEY = "_rerun_profile"
+
+def hash_input(value) -> str:
+    """Short stable digest so searched addresses never reach the report in clear text"""
+    return hashlib.sha256(str(value).encode("utf-8")).hexdigest()[:12]
+
+def _requested() -> bool:
+    if PROFILE_RERUNS:
+        return True
+    requested = st.query_params.get("profile", "")
+    return bool(requested) and hmac.compare_digest(requested, PROFILE_TOKEN)
+
+def _session_id() -> str:
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else "no-session"
+
+def _write_report(profile: RerunProfile, elapsed: float, inputs: dict, status: str):
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    stamp = profile.started_at.strftime("%Y%m%dT%H%M%S.%f")
+    session = re.sub(r"[^A-Za-z0-9-]", "", profile.session_id)[:8]
+    path = PROFILE_DIR / f"{stamp}_{profile.page_name}_{session}.txt"
+    header = {
+        "page": profile.page_name,
+        "session_id": profile.session_id,
+        "started_at": profile.started_at.isoformat(),
+        "elapsed_seconds": round(elapsed, 4),
+        "status": status,
+        "backend": profile.backend,
+        "inputs": inputs,
+    }
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(header, indent=2) + "\n\n" + profile.report(), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+    # Keep only the newest PROFILE_KEEP reports
+    reports = sorted(PROFILE_DIR.glob("*.txt"))
+    for old in reports[:-PROFILE_KEEP] if PROFILE_KEEP > 0 else []:
+        old.unlink(missing_ok=True)
+
+def _finish(profile: RerunProfile, inputs: dict, status: str):
+    elapsed = profile.stop()
+    if elapsed < PROFILE_MIN_SECONDS:
+        return
+    try:
+        _write_report(profile, elapsed, inputs, status)
+    except Exception as e:
+        logger.warning("Could not write profile for %s: %s", profile.page_name, e)
+
+def start_rerun_profile(page_name: str):
+    """
+    Start profiling this rerun when PROFILE_RERUNS is set, or when the URL
+    carries ?profile=<PROFILE_TOKEN>. Call right after st.set_page_config.
+    """
+    if not PROFILING_AVAILABLE:
+        return
+    try:
+        if not _requested():
+            return
+        # A rerun cut short by st.rerun or st.stop never reached its finish call
+        interrupted = st.session_state.pop(_STATE_KEY, None)
+        if interrupted is not None:
+            _finish(interrupted, {}, "interrupted")
+        st.session_state[_STATE_KEY] = RerunProfile(page_name, _session_id())
+    except Exception as e:
+        logger.warning("Could not start profiler for %s: %s", page_name, e)
+
+def finish_rerun_profile(inputs: Optional[dict] = None):
+    """Stop this session's profiler, if any, and write its report with `inputs` attached"""
+    if not PROFILING_AVAILABLE:
+        return
+    profile = st.session_state.pop(_STATE_KEY, None)
+    if profile is not None:
+        _finish(profile, inputs or {}, "completed")
@@ -0,0 +1,217 @@
+"""
+Common shape for the data refresh scripts. Each scraper goes fetch -> parse
+-> validate -> publish; the runner runs independent scrapers on a thread
+pool with one shared HTTP session, publishes files atomically and prints one
+report with per-stage timings.
+
+    python -m utils.scraping                      # refresh everything
+    python -m utils.scraping polling_places       # just one
+    python -m utils.scraping --fixtures           # offline, from fixtures/, into a temp dir
+
+In fixture mode every HTTP fetch is answered from a file in fixtures/ and
+outputs go to a scratch directory, so nothing touches the network or
+assets/. Only the polling place page is fetched over HTTP today; the
+boundary and photo scrapers read attached_assets/ in either mode.
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+import requests
+from requests.adapters import HTTPAdapter
+
+FIXTURE_DIR = Path('fixtures')
+
+# Bytes read at a time from the network or a fixture
+CHUNK_BYTES = 64 * 1024
+
+REQUEST_TIMEOUT = 30  # Seconds
+
+class ValidationError(Exception):
+    """Parsed data that should not replace what is already published"""
+
+def write_atomic(path: Path, data: Union[bytes, str]) -> Path:
+    """Write to a temporary file next to path and rename it over; readers never see a partial file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(data.encode('utf-8') if isinstance(data, str) else data)
+    tmp_path.replace(path)
+    return path
+
+def _chunks(chunks: Iterator[bytes], source) -> Iterator[bytes]:
+    try:
+        yield from chunks
+    finally:
+        source.close()
+
+@dataclass
+class ScrapeContext:
+    session: requests.Session
+    output_dir: Path = Path('.')           # Published paths are relative to this
+    fixture_dir: Optional[Path] = None     # Set in fixture mode
+
+    def stream(self, url: str, fixture: str) -> Iterator[bytes]:
+        """
+        Response body in chunks; in fixture mode, the named file in the fixture
+        directory. The request is made (and fails) here; the body is read as
+        the caller iterates, and closing the iterator releases the connection.
+        """
+        if self.fixture_dir is not None:
+            path = self.fixture_dir / fixture
+            if not path.exists():
+                raise FileNotFoundError(f"no fixture {fixture} in {self.fixture_dir} for {url}")
+            f = path.open('rb')
+            return _chunks(iter(lambda: f.read(CHUNK_BYTES), b''), f)
+        response = self.session.get(url, stream=True, timeout=REQUEST_TIMEOUT)
+        try:
+            response.raise_for_status()
+        except requests.HTTPError:
+            response.close()
+            raise
+        return _chunks(response.iter_content(CHUNK_BYTES), response)
+
+    def fetch(self, url: str, fixture: str) -> bytes:
+        return b''.join(self.stream(url, fixture))
+
+    def output(self, path: Union[str, Path]) -> Path:
+        return self.output_dir / path
+
+    def publish(self, path: Union[str, Path], data: Union[bytes, str]) -> Path:
+        return write_atomic(self.output(path), data)
+
+class Scraper(ABC):
+    """
+    One data source. Subclasses set name and implement fetch and publish, and
+    parse and validate where needed; a subclass missing either abstract stage
+    fails when constructed. validate raises ValidationError to stop before
+    anything is published.
+    """
+    name: str = ""
+
+    @abstractmethod
+    def fetch(self, ctx: ScrapeContext) -> Any:
+        ...
+
+    def parse(self, raw: Any) -> Any:
+        return raw
+
+    def validate(self, data: Any) -> None:
+        pass
+
+    @abstractmethod
+    def publish(self, data: Any, ctx: ScrapeContext) -> List[Path]:
+        ...
+
+    def count(self, data: Any) -> int:
+        """Records in the parsed data, for the report"""
+        return len(data) if hasattr(data, '__len__') else 0
+
+@dataclass
+class ScrapeResult:
+    name: str
+    ok: bool = False
+    records: int = 0
+    outputs: List[str] = field(default_factory=list)
+    seconds: Dict[str, float] = field(default_factory=dict)   # Per stage
+    error: str = ""
+
+def run_scraper(scraper: Scraper, ctx: ScrapeContext) -> ScrapeResult:
+    """Run one scraper's stages in order, timing each; errors end up in the result, not raised"""
+    result = ScrapeResult(scraper.name)
+    stage = "fetch"
+    try:
+        start = time.perf_counter()
+        raw = scraper.fetch(ctx)
+        result.seconds["fetch"] = time.perf_counter() - start
+
+        stage, start = "parse", time.perf_counter()
+        data = scraper.parse(raw)
+        result.seconds["parse"] = time.perf_counter() - start
+        result.records = scraper.count(data)
+
+        stage, start = "validate", time.perf_counter()
+        scraper.validate(data)
+        result.seconds["validate"] = time.perf_counter() - start
+
+        stage, start = "publish", time.perf_counter()
+        result.outputs = [str(path) for path in scraper.publish(data, ctx)]
+        result.seconds["publish"] = time.perf_counter() - start
+        result.ok = True
+    except Exception as e:
+        result.error = f"{stage}: {e}"
+    return result
+
+def create_session(pool_size: int = 8) -> requests.Session:
+    """One connection pool for every scraper in a run"""
+    session = requests.Session()
+    session.headers["User-Agent"] = "chattanooga-vote-scraper"
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def default_scrapers() -> Dict[str, Scraper]:
+    from utils.district_scraper import DistrictBoundaryScraper
+    from utils.photo_scraper import CandidatePhotoScraper
+    from utils.polling_scraper import PollingPlaceScraper
+    return {scraper.name: scraper for scraper in [
+        DistrictBoundaryScraper(), PollingPlaceScraper(), CandidatePhotoScraper(),
+    ]}
+
+def run_scrapers(scrapers: Sequence[Scraper], output_dir: Path = Path('.'), fixture_dir: Optional[Path] = None,
+                 workers: int = 4) -> Dict[str, Any]:
+    """Run independent scrapers concurrently and return the run report"""
+    start = time.perf_counter()
+    with create_session(workers) as session:
+        ctx = ScrapeContext(session, output_dir, fixture_dir)
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(scrapers)))) as pool:
+            results = list(pool.map(lambda scraper: run_scraper(scraper, ctx), scrapers))
+    return {
+        "ok": all(result.ok for result in results),
+        "fixtures": str(fixture_dir) if fixture_dir else None,
+        "output_dir": str(output_dir),
+        "seconds": time.perf_counter() - start,
+        "scrapers": [asdict(result) for result in results],
+    }
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = []
+    for result in report["scrapers"]:
+        stages = ", ".join(f"{stage} {seconds * 1000:.0f} ms" for stage, seconds in result["seconds"].items())
+        status = f"{result['records']} records" if result["ok"] else f"FAILED ({result['error']})"
+        lines.append(f"{result['name']}: {status}; {stages}")
+        lines.extend(f"    -> {output}" for output in result["outputs"])
+    lines.append(f"{'All scrapers succeeded' if report['ok'] else 'Some scrapers failed'} "
+                 f"in {report['seconds']:.2f}s")
+    return "\n".join(lines)
+
+if __name__ == '__main__':
+    available = default_scrapers()
+    parser = argparse.ArgumentParser(description="Refresh the scraped data files")
+    parser.add_argument('names', nargs='*', help="Scrapers to run: " + ", ".join(available))
+    parser.add_argument('--fixtures', action='store_true', help="Read from fixture files instead of the network")
+    parser.add_argument('--fixture-dir', type=Path, default=FIXTURE_DIR)
+    parser.add_argument('--output-dir', type=Path,
+                        help="Where to publish (default: the repo, or a temp dir in fixture mode)")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--report', type=Path, help="Also write the run report as JSON")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.names if name not in available]
+    if unknown:
+        parser.error(f"unknown scraper: {', '.join(unknown)}")
+    output_dir = args.output_dir or (Path(tempfile.mkdtemp(prefix="scrape_")) if args.fixtures else Path('.'))
+
+    report = run_scrapers([available[name] for name in args.names or available], output_dir,
+                          args.fixture_dir if args.fixtures else None, args.workers)
+    print(format_report(report))
+    if args.report:
+        write_atomic(args.report, json.dumps(report, indent=2))
+    raise SystemExit(0 if report["ok"] else 1)
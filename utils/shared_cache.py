@@ -0,0 +1,300 @@
+import os
+import pickle
+import socket
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+import streamlit as st
+from streamlit.logger import get_logger
+from utils.metrics import register_collector
+
+logger = get_logger(__name__)
+
+class SharedCacheError(Exception):
+    """Raised by a backend when the store cannot be reached or rejects a command"""
+
+class SharedCache(ABC):
+    """
+    Key/value cache shared by every replica. Values are pickled, every entry
+    has a TTL, and backend failures degrade to cache misses so a broken store
+    only costs speed. Backends implement _get, _set and _delete.
+    """
+
+    def __init__(self):
+        self.stats = {"hits": 0, "misses": 0, "errors": 0}
+
+    @abstractmethod
+    def _get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    def _set(self, key: str, payload: bytes, ttl: float):
+        ...
+
+    @abstractmethod
+    def _delete(self, key: str):
+        ...
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return (hit, value); a stored None is a hit"""
+        try:
+            payload = self._get(key)
+        except (SharedCacheError, OSError, sqlite3.Error) as e:
+            self.stats["errors"] += 1
+            logger.warning("Shared cache read failed for %s: %s", key, e)
+            return False, None
+        if payload is None:
+            self.stats["misses"] += 1
+            return False, None
+        try:
+            value = pickle.loads(payload)
+        except Exception as e:
+            # A truncated entry, or one pickled from a class that has since changed; drop it and recompute
+            self.stats["errors"] += 1
+            logger.warning("Shared cache entry for %s could not be unpickled, dropping it: %s", key, e)
+            self.delete(key)
+            return False, None
+        self.stats["hits"] += 1
+        return True, value
+
+    def set(self, key: str, value: Any, ttl: float):
+        try:
+            self._set(key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), ttl)
+        except (SharedCacheError, OSError, sqlite3.Error) as e:
+            self.stats["errors"] += 1
+            logger.warning("Shared cache write failed for %s: %s", key, e)
+
+    def delete(self, key: str):
+        try:
+            self._delete(key)
+        except (SharedCacheError, OSError, sqlite3.Error) as e:
+            self.stats["errors"] += 1
+            logger.warning("Shared cache delete failed for %s: %s", key, e)
+
+    def get_or_set(self, key: str, compute: Callable[[], Any], ttl: float) -> Any:
+        """Return the cached value for key, computing and storing it on a miss"""
+        hit, value = self.get(key)
+        if hit:
+            return value
+        value = compute()
+        self.set(key, value, ttl)
+        return value
+
+class SQLiteSharedCache(SharedCache):
+    """Shared cache in one SQLite file, for replicas on the same host or a shared volume"""
+
+    PURGE_EVERY = 1000
+
+    def __init__(self, path: Path):
+        super().__init__()
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.local = threading.local()
+        self.writes = 0
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value BLOB, expires REAL)")
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread so reads never wait on a Python lock
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def _get(self, key: str) -> Optional[bytes]:
+        row = self._conn().execute(
+            "SELECT value FROM entries WHERE key = ? AND expires > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set(self, key: str, payload: bytes, ttl: float):
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO entries (key, value, expires) VALUES (?, ?, ?)",
+            (key, payload, time.time() + ttl)
+        )
+        self.writes += 1
+        if self.writes % self.PURGE_EVERY == 0:
+            conn.execute("DELETE FROM entries WHERE expires <= ?", (time.time(),))
+
+    def _delete(self, key: str):
+        self._conn().execute("DELETE FROM entries WHERE key = ?", (key,))
+
+class RedisSharedCache(SharedCache):
+    """Shared cache on any server speaking the Redis protocol (GET / SET PX / DEL)"""
+
+    RETRY_AFTER = 5.0
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 6379, db: int = 0,
+                 password: Optional[str] = None, prefix: str = "chattanooga_vote:", timeout: float = 1.0):
+        super().__init__()
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.prefix = prefix
+        self.timeout = timeout
+        self.local = threading.local()
+        self.retry_at = 0.0
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self.local.sock = sock
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.local.reader = sock.makefile('rb')
+            if self.password:
+                self._send_command("AUTH", self.password)
+            if self.db:
+                self._send_command("SELECT", str(self.db))
+        except SharedCacheError:
+            # Rejected AUTH or SELECT: never keep the connection, or later commands
+            # would run unauthenticated or against db 0. Retrying right away won't help.
+            self._disconnect()
+            self.retry_at = time.monotonic() + self.RETRY_AFTER
+            raise
+        except BaseException:
+            self._disconnect()
+            raise
+
+    def _disconnect(self):
+        sock = getattr(self.local, "sock", None)
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+        self.local.sock = None
+        self.local.reader = None
+
+    @staticmethod
+    def _encode(*parts) -> bytes:
+        chunks = [f"*{len(parts)}\r\n".encode()]
+        for part in parts:
+            data = part if isinstance(part, bytes) else str(part).encode('utf-8')
+            chunks.append(f"${len(data)}\r\n".encode() + data + b"\r\n")
+        return b"".join(chunks)
+
+    def _read_reply(self):
+        line = self.local.reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Connection closed by server")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode()
+        if kind == b"-":
+            raise SharedCacheError(body.decode())
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            data = self.local.reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            count = int(body)
+            return None if count < 0 else [self._read_reply() for _ in range(count)]
+        raise SharedCacheError(f"Unexpected reply {line!r}")
+
+    def _send_command(self, *parts):
+        self.local.sock.sendall(self._encode(*parts))
+        return self._read_reply()
+
+    def _command(self, *parts):
+        if time.monotonic() < self.retry_at:
+            raise SharedCacheError("Server unreachable, not retrying yet")
+        for attempt in range(2):
+            try:
+                if getattr(self.local, "sock", None) is None:
+                    self._connect()
+                return self._send_command(*parts)
+            except OSError:
+                self._disconnect()
+                # Retry once on a dropped connection, then back off so every rerun doesn't wait on the timeout
+                if attempt:
+                    self.retry_at = time.monotonic() + self.RETRY_AFTER
+                    raise
+
+    def _get(self, key: str) -> Optional[bytes]:
+        return self._command("GET", self.prefix + key)
+
+    def _set(self, key: str, payload: bytes, ttl: float):
+        self._command("SET", self.prefix + key, payload, "PX", str(max(1, int(ttl * 1000))))
+
+    def _delete(self, key: str):
+        self._command("DEL", self.prefix + key)
+
+def cache_from_url(url: str) -> SharedCache:
+    """
+    Build a shared cache from a URL:
+    sqlite:///relative/path.sqlite, sqlite:////absolute/path.sqlite or
+    redis://[:password@]host[:port][/db]
+    """
+    parsed = urlparse(url)
+    if parsed.scheme == "sqlite":
+        return SQLiteSharedCache(Path(unquote(parsed.path[1:])))
+    if parsed.scheme == "redis":
+        db = int(parsed.path.lstrip('/') or 0)
+        return RedisSharedCache(parsed.hostname or "127.0.0.1", parsed.port or 6379, db,
+                                unquote(parsed.password) if parsed.password else None)
+    raise ValueError(f"Unsupported shared cache URL: {url}")
+
+@st.cache_resource
+def get_shared_cache() -> SharedCache:
+    """
+    Process-wide shared cache. Set SHARED_CACHE_URL to a redis:// URL so all
+    replicas share one store; the default is a SQLite file under .cache/.
+    """
+    return cache_from_url(os.environ.get("SHARED_CACHE_URL", "sqlite:///.cache/shared_cache.sqlite"))
+
+def _prometheus_lines() -> List[str]:
+    stats = get_shared_cache().stats
+    lines = [
+        "# HELP chattanooga_vote_shared_cache_requests_total Shared cache reads and failures",
+        "# TYPE chattanooga_vote_shared_cache_requests_total counter",
+    ]
+    for result, count in stats.items():
+        lines.append(f'chattanooga_vote_shared_cache_requests_total{{result="{result}"}} {count}')
+    return lines
+
+register_collector(_prometheus_lines)
+
+def _self_check():
+    """Run the Redis backend against the stub server, including a rejected AUTH and SELECT"""
+    from utils.stub_redis import start_stub_redis
+
+    server = start_stub_redis(password="secret")
+    port = server.server_address[1]
+
+    cache = cache_from_url(f"redis://:secret@127.0.0.1:{port}/2")
+    cache.set("key", {"value": 1}, 60)
+    assert cache.get("key") == (True, {"value": 1})
+    assert cache.get("missing") == (False, None)
+
+    for url in (f"redis://:wrong@127.0.0.1:{port}/0", f"redis://:secret@127.0.0.1:{port}/99"):
+        rejected = cache_from_url(url)
+        before = dict(server.store.data)
+        rejected.set("other", "value", 60)
+        assert rejected.get("other") == (False, None), url
+        # The rejected connection is dropped, not reused without AUTH or on db 0
+        assert getattr(rejected.local, "sock", None) is None, url
+        assert server.store.data == before, url
+        assert rejected.stats["errors"] == 2, (url, rejected.stats)
+    server.shutdown()
+    print("Shared cache self-check passed")
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description="Shared cache backends")
+    parser.add_argument('--self-check', action='store_true', help="Exercise the Redis backend against a local stub")
+    args = parser.parse_args()
+    if args.self_check:
+        _self_check()
@@ -0,0 +1,152 @@
+import fcntl
+import hashlib
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+import streamlit as st
+
+class _Call:
+    """One in-flight computation and the callers waiting on it"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key inside one process: the first
+    caller runs the function, later callers block until it finishes and share
+    its result or exception. Nothing is kept once the call completes.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls: Dict[str, _Call] = {}
+        self.stats = {"leaders": 0, "followers": 0}
+
+    def do(self, key: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self.calls[key] = call
+                self.stats["leaders"] += 1
+            else:
+                self.stats["followers"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
+
+class FileLockSingleFlight:
+    """
+    Cross-process variant for several replicas sharing a directory. The leader
+    holds an exclusive flock on the key's lock file while computing and leaves
+    the result behind for result_ttl seconds; processes that were waiting on the
+    lock read that result instead of recomputing. Keys hash onto a fixed set of
+    lock files, and expired results are swept, so the directory stays bounded.
+    """
+
+    def __init__(self, directory: Path, result_ttl: float = 30.0, lock_stripes: int = 64):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.result_ttl = result_ttl
+        self.lock_stripes = lock_stripes
+        self.next_sweep = 0.0
+
+    def _paths(self, key: str):
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        # Unrelated keys on one stripe only wait on each other, which is rare with enough stripes
+        stripe = int(digest[:8], 16) % self.lock_stripes
+        return self.directory / f"stripe-{stripe:03d}.lock", self.directory / f"{digest}.result"
+
+    def _read_fresh(self, result_path: Path):
+        try:
+            if time.time() - result_path.stat().st_mtime > self.result_ttl:
+                return False, None
+            with result_path.open('rb') as f:
+                return True, pickle.load(f)
+        except Exception:
+            # Missing, swept, half-written or from an older version of the code: recompute
+            return False, None
+
+    def _write(self, result_path: Path, result: Any):
+        tmp_path = result_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with tmp_path.open('wb') as f:
+            pickle.dump(result, f)
+        os.replace(tmp_path, result_path)
+
+    def _sweep(self):
+        """Delete results (and temporary files) past the TTL; each process sweeps at most once per TTL"""
+        now = time.time()
+        if now < self.next_sweep:
+            return
+        self.next_sweep = now + self.result_ttl
+        for pattern in ("*.result", "*.tmp"):
+            for path in self.directory.glob(pattern):
+                try:
+                    if now - path.stat().st_mtime > self.result_ttl:
+                        path.unlink()
+                except OSError:
+                    continue  # Already swept by another replica
+
+    def do(self, key: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        lock_path, result_path = self._paths(key)
+        try:
+            with lock_path.open('a+') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    found, result = self._read_fresh(result_path)
+                    if found:
+                        return result
+
+                    result = fn(*args, **kwargs)
+                    self._write(result_path, result)
+                    return result
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+        finally:
+            self._sweep()
+
+class FlightGroup:
+    """In-process coalescing, optionally backed by cross-process coalescing"""
+
+    def __init__(self, shared: Optional[FileLockSingleFlight] = None):
+        self.local = SingleFlight()
+        self.shared = shared
+
+    def do(self, key: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        if self.shared is None:
+            return self.local.do(key, fn, *args, **kwargs)
+        # Only one thread per process queues on the file lock
+        return self.local.do(key, self.shared.do, key, fn, *args, **kwargs)
+
+@st.cache_resource
+def get_flight_group() -> FlightGroup:
+    """
+    Process-wide flight group. Set SINGLE_FLIGHT_DIR to a directory shared by
+    all replicas to coalesce across processes as well.
+    """
+    shared_dir = os.environ.get("SINGLE_FLIGHT_DIR")
+    if shared_dir:
+        ttl = float(os.environ.get("SINGLE_FLIGHT_RESULT_TTL", "30"))
+        return FlightGroup(FileLockSingleFlight(Path(shared_dir), ttl))
+    return FlightGroup()
@@ -0,0 +1,76 @@
+import argparse
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+from urllib.parse import urlparse, parse_qs
+
+def stub_coordinates(query: str) -> Tuple[float, float]:
+    """Deterministic coordinates inside Chattanooga for a query string"""
+    digest = hashlib.sha1(query.lower().encode('utf-8')).digest()
+    lat = 34.99 + (int.from_bytes(digest[:4], 'big') / 2**32) * 0.12
+    lon = -85.35 + (int.from_bytes(digest[4:8], 'big') / 2**32) * 0.2
+    return lat, lon
+
+class StubGeocoderHandler(BaseHTTPRequestHandler):
+    """Answers Nominatim-style /search requests without network access"""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path.rstrip('/') != '/search':
+            self.send_error(404)
+            return
+
+        query = parse_qs(url.query).get('q', [''])[0]
+        self.server.request_count += 1
+        if self.server.delay:
+            time.sleep(self.server.delay)
+
+        results = []
+        if query and 'nowhere' not in query.lower():
+            lat, lon = stub_coordinates(query)
+            results.append({
+                "place_id": 1,
+                "lat": f"{lat:.7f}",
+                "lon": f"{lon:.7f}",
+                "display_name": query,
+                "boundingbox": [f"{lat:.7f}", f"{lat:.7f}", f"{lon:.7f}", f"{lon:.7f}"]
+            })
+
+        body = json.dumps(results).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def create_stub_server(port: int = 0, delay: float = 0.0) -> ThreadingHTTPServer:
+    """Create the stub geocoder server; port 0 picks a free port"""
+    server = ThreadingHTTPServer(('127.0.0.1', port), StubGeocoderHandler)
+    server.request_count = 0
+    server.delay = delay
+    return server
+
+def start_stub_geocoder(port: int = 0, delay: float = 0.0) -> ThreadingHTTPServer:
+    """
+    Start the stub geocoder on a background thread. Point the app at it with
+    GEOCODER_DOMAIN=127.0.0.1:<port> and GEOCODER_SCHEME=http.
+    """
+    server = create_stub_server(port, delay)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Local Nominatim stand-in for offline testing")
+    parser.add_argument('--port', type=int, default=8088)
+    parser.add_argument('--delay', type=float, default=0.0, help="Seconds to wait before each response")
+    args = parser.parse_args()
+
+    server = create_stub_server(args.port, args.delay)
+    print(f"Stub geocoder listening on http://127.0.0.1:{args.port}/search")
+    server.serve_forever()
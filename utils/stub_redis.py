@@ -0,0 +1,136 @@
+import argparse
+import socketserver
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+class StubRedisStore:
+    """In-memory keyspace with per-key expiry, shared by every connection"""
+
+    def __init__(self, password: Optional[str] = None, databases: int = 16):
+        self.password = password
+        self.databases = databases
+        self.lock = threading.Lock()
+        self.data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self.command_count = 0
+
+    def _live(self, key: bytes) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires = entry
+        if expires is not None and time.monotonic() >= expires:
+            del self.data[key]
+            return None
+        return value
+
+    def execute(self, args: List[bytes]) -> bytes:
+        """Run one command and return its RESP-encoded reply"""
+        command = args[0].upper()
+        with self.lock:
+            self.command_count += 1
+            if command == b"PING":
+                return b"+PONG\r\n"
+            if command == b"SELECT" and len(args) == 2:
+                if args[1].isdigit() and int(args[1]) < self.databases:
+                    return b"+OK\r\n"
+                return b"-ERR DB index is out of range\r\n"
+            if command == b"GET" and len(args) == 2:
+                value = self._live(args[1])
+                return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+            if command == b"SET" and len(args) >= 3:
+                return self._set(args[1], args[2], [a.upper() for a in args[3:]], args[3:])
+            if command == b"DEL":
+                removed = sum(1 for key in args[1:] if self._live(key) is not None and self.data.pop(key))
+                return b":%d\r\n" % removed
+            if command == b"EXISTS":
+                return b":%d\r\n" % sum(1 for key in args[1:] if self._live(key) is not None)
+            if command == b"DBSIZE":
+                return b":%d\r\n" % sum(1 for key in list(self.data) if self._live(key) is not None)
+            if command == b"FLUSHDB":
+                self.data.clear()
+                return b"+OK\r\n"
+        return b"-ERR unknown command or wrong number of arguments\r\n"
+
+    def _set(self, key: bytes, value: bytes, options: List[bytes], raw: List[bytes]) -> bytes:
+        expires = None
+        if b"NX" in options and self._live(key) is not None:
+            return b"$-1\r\n"
+        for unit, scale in ((b"EX", 1.0), (b"PX", 0.001)):
+            if unit in options:
+                index = options.index(unit)
+                if index + 1 >= len(raw):
+                    return b"-ERR syntax error\r\n"
+                expires = time.monotonic() + int(raw[index + 1]) * scale
+        self.data[key] = (value, expires)
+        return b"+OK\r\n"
+
+class StubRedisHandler(socketserver.StreamRequestHandler):
+    """Reads RESP arrays of bulk strings, the framing every Redis client uses"""
+
+    def read_command(self) -> Optional[List[bytes]]:
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            # Inline command, as typed into telnet
+            return line.strip().split()
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def authenticate(self, args: List[bytes]) -> bytes:
+        store = self.server.store
+        if store.password is None:
+            return b"-ERR AUTH <password> called without any password configured for the default user\r\n"
+        self.authenticated = args[-1].decode('utf-8', 'replace') == store.password
+        return b"+OK\r\n" if self.authenticated else b"-WRONGPASS invalid username-password pair\r\n"
+
+    def handle(self):
+        self.authenticated = self.server.store.password is None
+        while True:
+            args = self.read_command()
+            if args is None:
+                return
+            if not args:
+                continue
+            command = args[0].upper()
+            if command == b"QUIT":
+                self.wfile.write(b"+OK\r\n")
+                return
+            if command == b"AUTH":
+                self.wfile.write(self.authenticate(args))
+            elif not self.authenticated:
+                self.wfile.write(b"-NOAUTH Authentication required.\r\n")
+            else:
+                self.wfile.write(self.server.store.execute(args))
+
+class StubRedisServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, port: int = 0, password: Optional[str] = None):
+        super().__init__(('127.0.0.1', port), StubRedisHandler)
+        self.store = StubRedisStore(password)
+
+def start_stub_redis(port: int = 0, password: Optional[str] = None) -> StubRedisServer:
+    """
+    Start the Redis stand-in on a background thread. Point the app at it with
+    SHARED_CACHE_URL=redis://127.0.0.1:<port>/0, or redis://:<password>@... when
+    it requires a password.
+    """
+    server = StubRedisServer(port, password)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Local Redis stand-in for testing the shared cache")
+    parser.add_argument('--port', type=int, default=6379)
+    parser.add_argument('--password', help="Require AUTH with this password")
+    args = parser.parse_args()
+
+    server = StubRedisServer(args.port, args.password)
+    print(f"Stub Redis listening on redis://127.0.0.1:{args.port}/0")
+    server.serve_forever()
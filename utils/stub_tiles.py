@@ -0,0 +1,80 @@
+import argparse
+import hashlib
+import re
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+TILE_PATH = re.compile(r"^/(\d+)/(\d+)/(\d+)\.png$")
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+def stub_tile(z: int, x: int, y: int) -> bytes:
+    """A flat 256px PNG whose color and text chunk identify the tile"""
+    r, g, b = hashlib.sha1(f"{z}/{x}/{y}".encode()).digest()[:3]
+    row = b'\x00' + bytes((r, g, b)) * 256
+    return b''.join([
+        b'\x89PNG\r\n\x1a\n',
+        _png_chunk(b'IHDR', struct.pack('>IIBBBBB', 256, 256, 8, 2, 0, 0, 0)),
+        _png_chunk(b'tEXt', f"tile\x00{z}/{x}/{y}".encode()),
+        _png_chunk(b'IDAT', zlib.compress(row * 256)),
+        _png_chunk(b'IEND', b''),
+    ])
+
+class StubTileHandler(BaseHTTPRequestHandler):
+    """Answers /{z}/{x}/{y}.png like a raster basemap CDN, without network access"""
+
+    def do_GET(self):
+        match = TILE_PATH.match(self.path.split('?')[0])
+        if not match:
+            self.send_error(404)
+            return
+
+        with self.server.lock:
+            self.server.request_count += 1
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        if self.server.fail:
+            self.send_error(503)
+            return
+
+        body = stub_tile(*(int(part) for part in match.groups()))
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def create_stub_server(port: int = 0, delay: float = 0.0) -> ThreadingHTTPServer:
+    """Create the stub tile server; port 0 picks a free port. Set .fail to return 503s."""
+    server = ThreadingHTTPServer(('127.0.0.1', port), StubTileHandler)
+    server.lock = threading.Lock()
+    server.request_count = 0
+    server.delay = delay
+    server.fail = False
+    return server
+
+def start_stub_tiles(port: int = 0, delay: float = 0.0) -> ThreadingHTTPServer:
+    """
+    Start the stub tile server on a background thread. Point the tile proxy at it
+    with BASEMAP_UPSTREAM=http://127.0.0.1:<port>/{z}/{x}/{y}.png
+    """
+    server = create_stub_server(port, delay)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Local basemap tile CDN stand-in for offline testing")
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--delay', type=float, default=0.0, help="Seconds to wait before each response")
+    args = parser.parse_args()
+
+    server = create_stub_server(args.port, args.delay)
+    print(f"Stub tiles listening on http://127.0.0.1:{args.port}/{{z}}/{{x}}/{{y}}.png")
+    server.serve_forever()
@@ -0,0 +1,314 @@
+"""
+Basemap tile proxy with a disk-backed LRU cache. Serves /{z}/{x}/{y}.png from
+the cache, fetching misses from BASEMAP_UPSTREAM when it is set, so the maps
+keep their basemap even if the CDN is slow or down on election night.
+
+Tiles are fetched by each visitor's browser, not by the app, so BASEMAP_URL
+must be an address the public can reach: run the proxy on a host or port
+published behind HTTPS and point BASEMAP_URL there. A loopback address only
+works for a browser on the server itself. The Replit deployment publishes a
+single port for Streamlit, so it keeps the CARTO default.
+
+    python -m utils.tile_proxy --upstream "https://{s}.basemaps.cartocdn.com/light_all/{z}/{x}/{y}.png" --seed
+    BASEMAP_URL="https://tiles.example.org/{z}/{x}/{y}.png" python serve.py
+"""
+import argparse
+import math
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import requests
+from utils.metrics import register_collector
+from utils.single_flight import SingleFlight
+
+BASEMAP_UPSTREAM = os.environ.get("BASEMAP_UPSTREAM", "")
+TILE_CACHE_DIR = Path(os.environ.get("TILE_CACHE_DIR", ".cache/basemap"))
+TILE_CACHE_MAX_MB = int(os.environ.get("TILE_CACHE_MAX_MB", "512"))
+TILE_PROXY_PORT = int(os.environ.get("TILE_PROXY_PORT", "8766"))
+UPSTREAM_TIMEOUT = 10
+
+# West, south, east, north around the city limits, with some margin
+CHATTANOOGA_BBOX = (-85.48, 34.97, -85.04, 35.23)
+SEED_ZOOMS = range(10, 17)
+
+TILE_PATH = re.compile(r"^/(\d+)/(\d+)/(\d+)\.png$")
+SUBDOMAINS = "abcd"
+
+def tiles_for_bbox(bbox: Tuple[float, float, float, float], z: int) -> Iterator[Tuple[int, int]]:
+    """XYZ tile columns and rows covering a lon/lat bounding box"""
+    west, south, east, north = bbox
+    n = 2 ** z
+
+    def tile_xy(lon: float, lat: float) -> Tuple[int, int]:
+        lat_rad = math.radians(lat)
+        x = int((lon + 180.0) / 360.0 * n)
+        y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+        return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+    min_x, min_y = tile_xy(west, north)
+    max_x, max_y = tile_xy(east, south)
+    for x in range(min_x, max_x + 1):
+        for y in range(min_y, max_y + 1):
+            yield x, y
+
+class DiskTileCache:
+    """
+    Tiles stored as {root}/{z}/{x}/{y}.png. Recency is tracked in memory and
+    in file mtimes, so the LRU order survives a restart; the least recently
+    used tiles are deleted once the total size goes over max_bytes.
+    """
+
+    def __init__(self, root: Path = TILE_CACHE_DIR, max_bytes: int = TILE_CACHE_MAX_MB * 1024 * 1024):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.sizes: "OrderedDict[str, int]" = OrderedDict()
+        self.total_bytes = 0
+        self.evictions = 0
+        self._load()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.png"
+
+    def _load(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        found = []
+        for path in self.root.glob("*/*/*.png"):
+            stat = path.stat()
+            key = path.relative_to(self.root).with_suffix("").as_posix()
+            found.append((stat.st_mtime, key, stat.st_size))
+        for _, key, size in sorted(found):
+            self.sizes[key] = size
+            self.total_bytes += size
+        with self.lock:
+            self._evict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self.lock:
+            if key not in self.sizes:
+                return None
+            self.sizes.move_to_end(key)
+        try:
+            data = self._path(key).read_bytes()
+            os.utime(self._path(key))
+            return data
+        except FileNotFoundError:
+            # Removed behind our back; forget it and refetch
+            with self.lock:
+                self.total_bytes -= self.sizes.pop(key, 0)
+            return None
+
+    def put(self, key: str, data: bytes):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        with self.lock:
+            self.total_bytes += len(data) - self.sizes.pop(key, 0)
+            self.sizes[key] = len(data)
+            self._evict()
+
+    def __contains__(self, key: str) -> bool:
+        with self.lock:
+            return key in self.sizes
+
+    def __len__(self) -> int:
+        return len(self.sizes)
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and len(self.sizes) > 1:
+            key, size = self.sizes.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+            self._path(key).unlink(missing_ok=True)
+
+class TileProxy:
+    """Cache in front of an optional upstream tile URL template"""
+
+    def __init__(self, cache: DiskTileCache, upstream: str = BASEMAP_UPSTREAM, timeout: float = UPSTREAM_TIMEOUT):
+        self.cache = cache
+        self.upstream = upstream
+        self.timeout = timeout
+        self.local = threading.local()
+        self.flight = SingleFlight()
+        self.stats = {"hits": 0, "misses": 0, "upstream_errors": 0}
+
+    def _session(self) -> requests.Session:
+        session = getattr(self.local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers["User-Agent"] = "chattanooga-vote-tile-proxy"
+            self.local.session = session
+        return session
+
+    def upstream_url(self, z: int, x: int, y: int) -> str:
+        return self.upstream.format(s=SUBDOMAINS[(x + y) % len(SUBDOMAINS)], z=z, x=x, y=y, r="")
+
+    def _fetch(self, key: str, z: int, x: int, y: int) -> Optional[bytes]:
+        # Another request may have stored it while we waited for the flight
+        data = self.cache.get(key)
+        if data is not None:
+            return data
+        try:
+            response = self._session().get(self.upstream_url(z, x, y), timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException:
+            self.stats["upstream_errors"] += 1
+            return None
+        self.cache.put(key, response.content)
+        return response.content
+
+    def get(self, z: int, x: int, y: int) -> Tuple[Optional[bytes], bool]:
+        """Return (tile bytes or None, served from cache)"""
+        key = f"{z}/{x}/{y}"
+        data = self.cache.get(key)
+        if data is not None:
+            self.stats["hits"] += 1
+            return data, True
+        self.stats["misses"] += 1
+        if not self.upstream:
+            return None, False
+        return self.flight.do(key, self._fetch, key, z, x, y), False
+
+    def seed(self, bbox: Tuple[float, float, float, float] = CHATTANOOGA_BBOX,
+             zooms: Iterable[int] = SEED_ZOOMS, workers: int = 4) -> Dict[str, int]:
+        """Fetch every tile in the box that is not cached yet"""
+        wanted = [(z, x, y) for z in zooms for x, y in tiles_for_bbox(bbox, z)]
+        missing = [tile for tile in wanted if f"{tile[0]}/{tile[1]}/{tile[2]}" not in self.cache]
+        errors_before = self.stats["upstream_errors"]
+        if missing and self.upstream:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(lambda tile: self.get(*tile), missing))
+        return {
+            "tiles": len(wanted),
+            "fetched": len(missing) if self.upstream else 0,
+            "errors": self.stats["upstream_errors"] - errors_before,
+        }
+
+class TileProxyHandler(BaseHTTPRequestHandler):
+    """Serves /{z}/{x}/{y}.png through the proxy"""
+
+    def do_GET(self):
+        match = TILE_PATH.match(self.path.split('?')[0])
+        if not match:
+            self.send_error(404)
+            return
+
+        data, cached = self.server.proxy.get(*(int(part) for part in match.groups()))
+        if data is None:
+            self.send_error(502 if self.server.proxy.upstream else 404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('Cache-Control', 'public, max-age=86400')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('X-Cache', 'HIT' if cached else 'MISS')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+_proxies: List[TileProxy] = []
+
+def create_tile_proxy(port: int = TILE_PROXY_PORT, upstream: str = BASEMAP_UPSTREAM,
+                      cache_dir: Path = TILE_CACHE_DIR, host: str = '0.0.0.0') -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), TileProxyHandler)
+    server.proxy = TileProxy(DiskTileCache(cache_dir), upstream)
+    _proxies.append(server.proxy)
+    return server
+
+def start_tile_proxy(port: int = TILE_PROXY_PORT, upstream: str = BASEMAP_UPSTREAM,
+                     cache_dir: Path = TILE_CACHE_DIR, host: str = '0.0.0.0') -> ThreadingHTTPServer:
+    """Serve the proxy on a background thread; port 0 picks a free port"""
+    server = create_tile_proxy(port, upstream, cache_dir, host)
+    threading.Thread(target=server.serve_forever, name="tile-proxy", daemon=True).start()
+    return server
+
+def _prometheus_lines() -> List[str]:
+    if not _proxies:
+        return []
+    lines = [
+        "# HELP chattanooga_vote_basemap_tiles_total Basemap tile proxy requests",
+        "# TYPE chattanooga_vote_basemap_tiles_total counter",
+    ]
+    for result in ("hits", "misses", "upstream_errors"):
+        lines.append(f'chattanooga_vote_basemap_tiles_total{{result="{result}"}} '
+                     f'{sum(proxy.stats[result] for proxy in _proxies)}')
+    lines += [
+        "# HELP chattanooga_vote_basemap_cache_bytes Size of the basemap tile cache on disk",
+        "# TYPE chattanooga_vote_basemap_cache_bytes gauge",
+        f"chattanooga_vote_basemap_cache_bytes {sum(proxy.cache.total_bytes for proxy in _proxies)}",
+    ]
+    return lines
+
+register_collector(_prometheus_lines)
+
+def _self_check():
+    """Run the proxy against the stub upstream and check caching and eviction"""
+    import tempfile
+    from utils.stub_tiles import start_stub_tiles, stub_tile
+
+    upstream = start_stub_tiles()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        server = start_tile_proxy(0, f"http://127.0.0.1:{upstream.server_port}/{{z}}/{{x}}/{{y}}.png",
+                                  Path(cache_dir), '127.0.0.1')
+        url = f"http://127.0.0.1:{server.server_port}/12/1081/1622.png"
+
+        first, second = requests.get(url), requests.get(url)
+        assert first.content == second.content == stub_tile(12, 1081, 1622)
+        assert (first.headers['X-Cache'], second.headers['X-Cache']) == ('MISS', 'HIT')
+        assert upstream.request_count == 1
+
+        start = time.perf_counter()
+        result = server.proxy.seed(zooms=range(10, 14))
+        print(f"Seeded {result['fetched']} of {result['tiles']} tiles in {time.perf_counter() - start:.2f}s")
+        assert upstream.request_count == 1 + result['fetched']
+
+        # Cached tiles keep being served while the upstream is down
+        upstream.fail = True
+        assert requests.get(url).status_code == 200
+        assert requests.get(f"http://127.0.0.1:{server.server_port}/16/0/0.png").status_code == 502
+
+        # A restarted cache remembers its tiles and evicts the oldest past its limit
+        tile_size = len(stub_tile(12, 1081, 1622))
+        cached = len(server.proxy.cache)
+        small = DiskTileCache(Path(cache_dir), max_bytes=tile_size * 10)
+        assert small.total_bytes <= small.max_bytes and len(small) + small.evictions == cached
+        assert small.get("12/1081/1622") is not None
+        server.shutdown()
+    upstream.shutdown()
+    print("Tile proxy self-check passed")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Caching proxy for basemap tiles")
+    parser.add_argument('--port', type=int, default=TILE_PROXY_PORT)
+    parser.add_argument('--upstream', default=BASEMAP_UPSTREAM,
+                        help="Tile URL template with {z}/{x}/{y} and optional {s}; blank serves only cached tiles")
+    parser.add_argument('--cache-dir', type=Path, default=TILE_CACHE_DIR)
+    parser.add_argument('--seed', action='store_true', help="Fetch the Chattanooga area at zooms 10-16 first")
+    parser.add_argument('--seed-only', action='store_true', help="Seed the cache and exit")
+    parser.add_argument('--self-check', action='store_true', help="Exercise the proxy against a local stub upstream")
+    args = parser.parse_args()
+
+    if args.self_check:
+        _self_check()
+    else:
+        server = create_tile_proxy(args.port, args.upstream, args.cache_dir)
+        if args.seed or args.seed_only:
+            start = time.perf_counter()
+            result = server.proxy.seed()
+            print(f"Seeded {result['fetched']} new of {result['tiles']} tiles "
+                  f"({result['errors']} errors) in {time.perf_counter() - start:.1f}s")
+        if not args.seed_only:
+            print(f"Tile proxy listening on port {args.port}; publish it and set BASEMAP_URL "
+                  f"to its public https://.../{{z}}/{{x}}/{{y}}.png URL")
+            server.serve_forever()
@@ -0,0 +1,117 @@
+import argparse
+import json
+import os
+import re
+import sqlite3
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+from utils.vector_tiles import DEFAULT_MBTILES
+
+TILE_PATH = re.compile(r"^/tiles/(\d+)/(\d+)/(\d+)\.pbf$")
+TILE_SERVER_PORT = int(os.environ.get("TILE_SERVER_PORT", "8765"))
+
+class MBTilesReader:
+    """Read-only access to an MBTiles file, one connection per thread"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            self.local.conn = conn
+        return conn
+
+    def tile(self, z: int, x: int, y: int) -> Optional[bytes]:
+        """Gzipped tile data for XYZ coordinates, or None outside the pyramid"""
+        row = self._conn().execute(
+            "SELECT tile_data FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?",
+            (z, x, 2 ** z - 1 - y)
+        ).fetchone()
+        return row[0] if row else None
+
+    def metadata(self) -> dict:
+        return dict(self._conn().execute("SELECT name, value FROM metadata").fetchall())
+
+class TileHandler(BaseHTTPRequestHandler):
+    """Serves /tiles/{z}/{x}/{y}.pbf and a TileJSON description at /tiles.json"""
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        match = TILE_PATH.match(path)
+        if match:
+            z, x, y = (int(part) for part in match.groups())
+            data = self.server.reader.tile(z, x, y)
+            if data is None:
+                # Empty tile: nothing to draw here
+                self.send_response(204)
+                self._common_headers()
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/x-protobuf')
+            self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(data)))
+            self._common_headers()
+            self.end_headers()
+            self.wfile.write(data)
+        elif path == '/tiles.json':
+            body = json.dumps(self._tilejson()).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self._common_headers()
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_error(404)
+
+    def _common_headers(self):
+        # Tiles are fetched by the map in the visitor's browser, from another origin
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Cache-Control', 'public, max-age=3600')
+
+    def _tilejson(self) -> dict:
+        metadata = self.server.reader.metadata()
+        host = self.headers.get('Host', f"127.0.0.1:{self.server.server_address[1]}")
+        return {
+            "tilejson": "3.0.0",
+            "name": metadata.get("name"),
+            "tiles": [f"http://{host}/tiles/{{z}}/{{x}}/{{y}}.pbf"],
+            "minzoom": int(metadata.get("minzoom", 0)),
+            "maxzoom": int(metadata.get("maxzoom", 14)),
+            "bounds": [float(v) for v in metadata.get("bounds", "-180,-85,180,85").split(',')],
+            "vector_layers": json.loads(metadata.get("json", "{}")).get("vector_layers", []),
+        }
+
+    def log_message(self, format, *args):
+        pass
+
+def create_tile_server(mbtiles: Path = DEFAULT_MBTILES, port: int = TILE_SERVER_PORT,
+                       host: str = '0.0.0.0') -> ThreadingHTTPServer:
+    if not Path(mbtiles).exists():
+        raise FileNotFoundError(f"{mbtiles} not found; run python utils/vector_tiles.py first")
+    server = ThreadingHTTPServer((host, port), TileHandler)
+    server.reader = MBTilesReader(mbtiles)
+    return server
+
+def start_tile_server(mbtiles: Path = DEFAULT_MBTILES, port: int = TILE_SERVER_PORT,
+                      host: str = '0.0.0.0') -> ThreadingHTTPServer:
+    """Serve vector tiles on a background thread"""
+    server = create_tile_server(mbtiles, port, host)
+    threading.Thread(target=server.serve_forever, name="tile-server", daemon=True).start()
+    return server
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serve an MBTiles vector tile file over HTTP")
+    parser.add_argument('--mbtiles', type=Path, default=DEFAULT_MBTILES)
+    parser.add_argument('--port', type=int, default=TILE_SERVER_PORT)
+    args = parser.parse_args()
+
+    server = create_tile_server(args.mbtiles, args.port)
+    print(f"Serving {args.mbtiles} at http://127.0.0.1:{args.port}/tiles/{{z}}/{{x}}/{{y}}.pbf")
+    server.serve_forever()
@@ -0,0 +1,238 @@
+"""
+TopoJSON encoding for the district boundaries. Neighboring districts share
+long borders; TopoJSON stores each border once as an arc that both polygons
+reference, with coordinates quantized to integers and delta-encoded.
+
+    python -m utils.topojson   # writes assets/district_boundaries.topo.json and reports the savings
+"""
+import argparse
+import gzip
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from shapely import make_valid
+from shapely.geometry import LineString, shape
+
+Point = Tuple[int, int]
+
+BOUNDARIES_PATH = Path('assets') / 'district_boundaries.json'
+TOPOLOGY_PATH = Path('assets') / 'district_boundaries.topo.json'
+OBJECT_NAME = 'districts'
+
+# 1e5 steps across the city is well under a meter per step
+QUANTIZATION = 100_000
+
+def _polygons(geometry: dict) -> List[List[List[Sequence[float]]]]:
+    if geometry['type'] == 'Polygon':
+        return [geometry['coordinates']]
+    if geometry['type'] == 'MultiPolygon':
+        return geometry['coordinates']
+    raise ValueError(f"Unsupported geometry type {geometry['type']}")
+
+def _quantize_ring(ring: Sequence[Sequence[float]], translate: np.ndarray, scale: np.ndarray) -> List[Point]:
+    points = np.rint((np.asarray(ring, dtype=float)[:, :2] - translate) / scale).astype(np.int64)
+    # Drop the repeats quantization creates, keeping the ring closed
+    keep = np.ones(len(points), dtype=bool)
+    keep[1:] = np.any(points[1:] != points[:-1], axis=1)
+    points = points[keep]
+    if len(points) and tuple(points[0]) != tuple(points[-1]):
+        points = np.vstack([points, points[:1]])
+    return [tuple(p) for p in points.tolist()]
+
+def _find_junctions(rings: List[List[Point]]) -> set:
+    """Points where two rings stop following the same path"""
+    neighbors: Dict[Point, Tuple[Point, Point]] = {}
+    junctions = set()
+    for ring in rings:
+        n = len(ring) - 1
+        for i in range(n):
+            point = ring[i]
+            pair = tuple(sorted((ring[i - 1] if i else ring[n - 1], ring[i + 1])))
+            seen = neighbors.get(point)
+            if seen is None:
+                neighbors[point] = pair
+            elif seen != pair:
+                junctions.add(point)
+    return junctions
+
+def _cut_ring(ring: List[Point], junctions: set) -> List[List[Point]]:
+    """Split a closed ring into arcs that start and end at junctions"""
+    open_ring = ring[:-1]
+    cuts = [i for i, point in enumerate(open_ring) if point in junctions]
+    if not cuts:
+        # A ring that touches nothing: start it at its smallest point, so an
+        # identical ring elsewhere (a hole filled by another district) matches
+        start = open_ring.index(min(open_ring))
+        rotated = open_ring[start:] + open_ring[:start]
+        return [rotated + rotated[:1]]
+    rotated = open_ring[cuts[0]:] + open_ring[:cuts[0]] + [open_ring[cuts[0]]]
+    offsets = [c - cuts[0] for c in cuts] + [len(open_ring)]
+    return [rotated[start:end + 1] for start, end in zip(offsets, offsets[1:])]
+
+def _simplify_arc(arc: List[Point], tolerance: float) -> List[Point]:
+    # Endpoints are kept, so arcs still meet at their junctions
+    if len(arc) <= 3:
+        return arc
+    simplified = [tuple(map(int, p)) for p in LineString(arc).simplify(tolerance).coords]
+    closed = arc[0] == arc[-1]
+    return simplified if len(simplified) >= (4 if closed else 2) else arc
+
+def topology(features: List[dict], quantization: int = QUANTIZATION,
+             object_name: str = OBJECT_NAME) -> Dict[str, Any]:
+    """Encode GeoJSON polygon features as a quantized TopoJSON topology"""
+    all_points = np.vstack([
+        np.asarray(ring, dtype=float)[:, :2]
+        for feature in features for polygon in _polygons(feature['geometry']) for ring in polygon
+    ])
+    translate = all_points.min(axis=0)
+    extent = all_points.max(axis=0) - translate
+    scale = np.where(extent > 0, extent / (quantization - 1), 1.0)
+
+    # Quantize every ring once, remembering where it belongs
+    shapes = []
+    rings = []
+    for feature in features:
+        polygons = []
+        for polygon in _polygons(feature['geometry']):
+            quantized = [_quantize_ring(ring, translate, scale) for ring in polygon]
+            quantized = [ring for ring in quantized if len(ring) >= 4]
+            if quantized:
+                polygons.append(quantized)
+                rings.extend(quantized)
+        shapes.append(polygons)
+
+    junctions = _find_junctions(rings)
+    arcs: List[List[Point]] = []
+    arc_index: Dict[Tuple[Point, ...], int] = {}
+
+    def ring_arcs(ring: List[Point]) -> List[int]:
+        refs = []
+        for arc in _cut_ring(ring, junctions):
+            key = tuple(arc)
+            if key in arc_index:
+                refs.append(arc_index[key])
+            elif key[::-1] in arc_index:
+                refs.append(~arc_index[key[::-1]])
+            else:
+                arc_index[key] = len(arcs)
+                refs.append(len(arcs))
+                arcs.append(arc)
+        return refs
+
+    geometries = []
+    for feature, polygons in zip(features, shapes):
+        encoded = [[ring_arcs(ring) for ring in polygon] for polygon in polygons]
+        if not encoded:
+            continue
+        geometry = {"type": "Polygon", "arcs": encoded[0]} if len(encoded) == 1 \
+            else {"type": "MultiPolygon", "arcs": encoded}
+        geometry["properties"] = feature.get('properties', {})
+        geometries.append(geometry)
+
+    delta_arcs = []
+    for arc in arcs:
+        points = np.asarray(arc, dtype=np.int64)
+        delta_arcs.append(np.vstack([points[:1], np.diff(points, axis=0)]).tolist())
+
+    return {
+        "type": "Topology",
+        "transform": {"scale": scale.tolist(), "translate": translate.tolist()},
+        "objects": {object_name: {"type": "GeometryCollection", "geometries": geometries}},
+        "arcs": delta_arcs,
+    }
+
+def simplify_topology(topo: Dict[str, Any], tolerance: float) -> Dict[str, Any]:
+    """
+    Copy of a topology with every arc simplified. The tolerance is in the
+    topology's coordinate units; because each border is one arc, both
+    neighbors get the same simplified edge and no gaps open between them.
+    """
+    tolerance_units = tolerance / max(topo["transform"]["scale"])
+    arcs = []
+    for arc in topo["arcs"]:
+        points = [tuple(p) for p in np.cumsum(np.asarray(arc, dtype=np.int64), axis=0).tolist()]
+        points = np.asarray(_simplify_arc(points, tolerance_units), dtype=np.int64)
+        arcs.append(np.vstack([points[:1], np.diff(points, axis=0)]).tolist())
+    return {**topo, "arcs": arcs}
+
+def feature_collection(topo: Dict[str, Any], object_name: str = OBJECT_NAME) -> Dict[str, Any]:
+    """Decode a topology back into a GeoJSON FeatureCollection"""
+    scale = np.asarray(topo["transform"]["scale"])
+    translate = np.asarray(topo["transform"]["translate"])
+    arcs = [np.cumsum(np.asarray(arc, dtype=np.int64), axis=0) * scale + translate for arc in topo["arcs"]]
+
+    def ring(refs: List[int]) -> List[List[float]]:
+        points = []
+        for ref in refs:
+            arc = arcs[ref] if ref >= 0 else arcs[~ref][::-1]
+            points.extend(arc[1:].tolist() if points else arc.tolist())
+        return points
+
+    features = []
+    for geometry in topo["objects"][object_name]["geometries"]:
+        if geometry["type"] == "Polygon":
+            coordinates = [ring(refs) for refs in geometry["arcs"]]
+        else:
+            coordinates = [[ring(refs) for refs in polygon] for polygon in geometry["arcs"]]
+        features.append({
+            "type": "Feature",
+            "properties": geometry.get("properties", {}),
+            "geometry": {"type": geometry["type"], "coordinates": coordinates},
+        })
+    return {"type": "FeatureCollection", "features": features}
+
+def dumps(topo: Dict[str, Any]) -> str:
+    return json.dumps(topo, separators=(",", ":"))
+
+def write_topology(geojson_path: Path = BOUNDARIES_PATH, output: Path = TOPOLOGY_PATH,
+                   quantization: int = QUANTIZATION) -> Dict[str, int]:
+    """Encode the boundaries file as TopoJSON and return both sizes, plain and gzipped"""
+    source = geojson_path.read_bytes()
+    encoded = dumps(topology(json.loads(source)['features'], quantization)).encode('utf-8')
+    tmp_path = output.with_suffix('.tmp')
+    tmp_path.write_bytes(encoded)
+    tmp_path.replace(output)
+    return {
+        "geojson": len(source),
+        "topojson": len(encoded),
+        "geojson_gzip": len(gzip.compress(source)),
+        "topojson_gzip": len(gzip.compress(encoded)),
+    }
+
+def report(sizes: Dict[str, int]) -> str:
+    return (f"TopoJSON {sizes['topojson'] / 1024:,.0f} KB vs GeoJSON {sizes['geojson'] / 1024:,.0f} KB "
+            f"({1 - sizes['topojson'] / sizes['geojson']:.1%} smaller); gzipped "
+            f"{sizes['topojson_gzip'] / 1024:,.0f} KB vs {sizes['geojson_gzip'] / 1024:,.0f} KB "
+            f"({1 - sizes['topojson_gzip'] / sizes['geojson_gzip']:.1%} smaller)")
+
+def load_topology(path: Path = TOPOLOGY_PATH) -> Optional[Dict[str, Any]]:
+    """The ingested topology, or None when it is missing or unreadable"""
+    try:
+        with path.open() as f:
+            topo = json.load(f)
+        return topo if topo.get("type") == "Topology" else None
+    except (OSError, ValueError):
+        return None
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Encode district_boundaries.json as TopoJSON")
+    parser.add_argument('--input', type=Path, default=BOUNDARIES_PATH)
+    parser.add_argument('--output', type=Path, default=TOPOLOGY_PATH)
+    parser.add_argument('--quantization', type=int, default=QUANTIZATION)
+    args = parser.parse_args()
+
+    sizes = write_topology(args.input, args.output, args.quantization)
+    print(report(sizes))
+
+    # Round trip: every district should come back with the same shape
+    with args.input.open() as f:
+        original = {str(f_['properties']['district']): shape(f_['geometry']) for f_ in json.load(f)['features']}
+    decoded = feature_collection(load_topology(args.output))
+    # Quantization can pinch a ring into a self-touching one, so validate before comparing
+    worst = max(
+        original[str(f_['properties']['district'])].symmetric_difference(make_valid(shape(f_['geometry']))).area
+        / original[str(f_['properties']['district'])].area
+        for f_ in decoded['features']
+    )
+    print(f"{len(decoded['features'])} districts decoded, worst area difference {worst:.4%}")
@@ -0,0 +1,342 @@
+import argparse
+import gzip
+import json
+import math
+import shutil
+import sqlite3
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+import numpy as np
+import shapely
+from shapely.geometry import Polygon, shape
+from shapely.geometry.base import BaseGeometry
+from utils.geometry_store import has_source, read_geometries
+
+# Web Mercator constants
+EARTH_RADIUS = 6378137.0
+WORLD_SIZE = 2 * math.pi * EARTH_RADIUS
+MAX_LATITUDE = 85.0511287798
+
+EXTENT = 4096   # Tile coordinate grid, per the Mapbox Vector Tile spec
+BUFFER = 64     # Tile units drawn past each edge so strokes don't clip at seams
+
+DEFAULT_MBTILES = Path('assets') / 'district_tiles.mbtiles'
+
+Feature = Tuple[BaseGeometry, Dict[str, object]]
+
+# Protobuf encoding, just enough for vector_tile.proto
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+def _zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 31)
+
+def _field(number: int, wire_type: int) -> bytes:
+    return _varint((number << 3) | wire_type)
+
+def _varint_field(number: int, value: int) -> bytes:
+    return _field(number, 0) + _varint(value)
+
+def _bytes_field(number: int, payload: bytes) -> bytes:
+    return _field(number, 2) + _varint(len(payload)) + payload
+
+def _packed_field(number: int, values: Iterable[int]) -> bytes:
+    return _bytes_field(number, b"".join(_varint(v) for v in values))
+
+def _encode_value(value) -> bytes:
+    if isinstance(value, bool):
+        return _varint_field(7, int(value))
+    if isinstance(value, int):
+        if value < 0:
+            return _field(6, 0) + _varint((value << 1) ^ (value >> 63))
+        return _varint_field(5, value)
+    if isinstance(value, float):
+        return _field(3, 1) + np.float64(value).tobytes()
+    return _bytes_field(1, str(value).encode('utf-8'))
+
+# Geometry
+
+def lonlat_to_mercator(geometry: BaseGeometry) -> BaseGeometry:
+    """Project a lon/lat geometry to Web Mercator meters"""
+    def project(coords: np.ndarray) -> np.ndarray:
+        lon = coords[:, 0]
+        lat = np.clip(coords[:, 1], -MAX_LATITUDE, MAX_LATITUDE)
+        x = np.radians(lon) * EARTH_RADIUS
+        y = np.log(np.tan(np.pi / 4 + np.radians(lat) / 2)) * EARTH_RADIUS
+        return np.column_stack([x, y])
+    return shapely.transform(geometry, project)
+
+def tile_bounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """Mercator bounds (minx, miny, maxx, maxy) of an XYZ tile"""
+    size = WORLD_SIZE / 2 ** z
+    minx = -WORLD_SIZE / 2 + x * size
+    maxy = WORLD_SIZE / 2 - y * size
+    return minx, maxy - size, minx + size, maxy
+
+def tiles_covering(bounds: Tuple[float, float, float, float], z: int) -> Iterator[Tuple[int, int]]:
+    """XYZ tiles at zoom z intersecting mercator bounds"""
+    minx, miny, maxx, maxy = bounds
+    n = 2 ** z
+    size = WORLD_SIZE / n
+    x0 = max(0, int((minx + WORLD_SIZE / 2) // size))
+    x1 = min(n - 1, int((maxx + WORLD_SIZE / 2) // size))
+    y0 = max(0, int((WORLD_SIZE / 2 - maxy) // size))
+    y1 = min(n - 1, int((WORLD_SIZE / 2 - miny) // size))
+    for x in range(x0, x1 + 1):
+        for y in range(y0, y1 + 1):
+            yield x, y
+
+def _signed_area(ring: List[Tuple[int, int]]) -> int:
+    return sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(ring, ring[1:] + ring[:1]))
+
+def _ring_commands(coords: np.ndarray, cursor: List[int], exterior: bool) -> List[int]:
+    """MoveTo/LineTo/ClosePath commands for one ring, in tile coordinates"""
+    ring: List[Tuple[int, int]] = []
+    for x, y in coords[:-1]:
+        point = (int(x), int(y))
+        if not ring or ring[-1] != point:
+            ring.append(point)
+    if len(ring) > 1 and ring[0] == ring[-1]:
+        ring.pop()
+    if len(ring) < 3:
+        return []
+
+    # With y pointing down, exterior rings need a positive area and holes a negative one
+    area = _signed_area(ring)
+    if area == 0:
+        return []
+    if (area > 0) != exterior:
+        ring.reverse()
+
+    commands: List[int] = []
+    for i, (x, y) in enumerate(ring):
+        if i == 0:
+            commands.append(1 << 3 | 1)                 # MoveTo, one point
+        elif i == 1:
+            commands.append((len(ring) - 1) << 3 | 2)   # LineTo, the remaining points
+        commands.extend((_zigzag(x - cursor[0]), _zigzag(y - cursor[1])))
+        cursor[0], cursor[1] = x, y
+    commands.append(1 << 3 | 7)                         # ClosePath
+    return commands
+
+def _polygon_commands(geometry: BaseGeometry) -> List[int]:
+    polygons = shapely.get_parts(geometry)
+    cursor = [0, 0]
+    commands: List[int] = []
+    for polygon in polygons:
+        if not isinstance(polygon, Polygon) or polygon.is_empty:
+            continue
+        exterior = _ring_commands(np.asarray(polygon.exterior.coords), cursor, exterior=True)
+        if not exterior:
+            continue
+        commands.extend(exterior)
+        for interior in polygon.interiors:
+            commands.extend(_ring_commands(np.asarray(interior.coords), cursor, exterior=False))
+    return commands
+
+def _to_tile_coords(geometry: BaseGeometry, bounds: Tuple[float, float, float, float]) -> BaseGeometry:
+    minx, _, maxx, maxy = bounds
+    scale = EXTENT / (maxx - minx)
+    return shapely.transform(geometry, lambda c: np.rint(np.column_stack([
+        (c[:, 0] - minx) * scale, (maxy - c[:, 1]) * scale
+    ])))
+
+def encode_tile(layers: Dict[str, List[Feature]], z: int, x: int, y: int) -> bytes:
+    """
+    Encode mercator polygon features into one Mapbox Vector Tile (spec v2).
+    Returns b"" when no layer has anything inside the tile.
+    """
+    bounds = tile_bounds(z, x, y)
+    pad = (bounds[2] - bounds[0]) * BUFFER / EXTENT
+    clip_box = (bounds[0] - pad, bounds[1] - pad, bounds[2] + pad, bounds[3] + pad)
+    # Simplify to about one tile unit so low zooms don't carry street-level detail
+    tolerance = (bounds[2] - bounds[0]) / EXTENT
+
+    tile = b""
+    for layer_name, features in layers.items():
+        keys: Dict[str, int] = {}
+        values: Dict[Tuple[type, object], int] = {}
+        encoded_features = []
+        for feature_id, (geometry, properties) in enumerate(features, start=1):
+            if not shapely.intersects(geometry, shapely.box(*clip_box)):
+                continue
+            clipped = shapely.clip_by_rect(geometry, *clip_box).simplify(tolerance, preserve_topology=True)
+            commands = _polygon_commands(_to_tile_coords(clipped, bounds))
+            if not commands:
+                continue
+
+            tags = []
+            for key, value in properties.items():
+                if value is None:
+                    continue
+                tags.append(keys.setdefault(key, len(keys)))
+                tags.append(values.setdefault((type(value), value), len(values)))
+            encoded_features.append(
+                _varint_field(1, feature_id) + _packed_field(2, tags)
+                + _varint_field(3, 3) + _packed_field(4, commands)
+            )
+
+        if not encoded_features:
+            continue
+        layer = _varint_field(15, 2) + _bytes_field(1, layer_name.encode('utf-8'))
+        layer += b"".join(_bytes_field(2, f) for f in encoded_features)
+        layer += b"".join(_bytes_field(3, k.encode('utf-8')) for k in keys)
+        layer += b"".join(_bytes_field(4, _encode_value(v)) for _, v in values)
+        layer += _varint_field(5, EXTENT)
+        tile += _bytes_field(3, layer)
+    return tile
+
+# Boundary layers
+
+def district_features(boundaries_path: Path = Path('assets') / 'district_boundaries.json') -> List[Feature]:
+    """District polygons in mercator with the properties the map styles on"""
+    with boundaries_path.open() as f:
+        geojson = json.load(f)
+    features = []
+    for feature in geojson.get('features', []):
+        district = str(feature.get('properties', {}).get('district', ''))
+        if district and feature.get('geometry'):
+            features.append((lonlat_to_mercator(shape(feature['geometry'])), {"district": district}))
+    return sorted(features, key=lambda f: int(f[1]["district"]) if f[1]["district"].isdigit() else 0)
+
+def precinct_features() -> List[Feature]:
+    """Precinct polygons from the geometry store; empty until the precinct CSV is added"""
+    from utils.district_data import precinct_id
+    if not has_source("precincts"):
+        return []
+    attributes, geometries = read_geometries("precincts", columns=["precinct"])
+    return [
+        (lonlat_to_mercator(geometry), {"precinct": precinct_id(precinct)})
+        for precinct, geometry in zip(attributes["precinct"], geometries)
+        if geometry is not None and not geometry.is_empty
+    ]
+
+# New boundary layers (voting sites, ...) register a loader here
+BOUNDARY_LAYERS: Dict[str, Callable[[], List[Feature]]] = {
+    "districts": district_features,
+    "precincts": precinct_features,
+}
+
+# MBTiles storage
+
+def _write_metadata(conn: sqlite3.Connection, layers: Dict[str, List[Feature]], minzoom: int, maxzoom: int):
+    bounds = shapely.bounds(shapely.union_all([g for features in layers.values() for g, _ in features]))
+    west, south = np.degrees(bounds[0] / EARTH_RADIUS), np.degrees(2 * np.arctan(np.exp(bounds[1] / EARTH_RADIUS)) - np.pi / 2)
+    east, north = np.degrees(bounds[2] / EARTH_RADIUS), np.degrees(2 * np.arctan(np.exp(bounds[3] / EARTH_RADIUS)) - np.pi / 2)
+    vector_layers = [
+        {
+            "id": name,
+            "fields": {key: "String" for _, props in features[:1] for key in props},
+            "minzoom": minzoom,
+            "maxzoom": maxzoom,
+        }
+        for name, features in layers.items()
+    ]
+    metadata = {
+        "name": "Chattanooga boundaries",
+        "format": "pbf",
+        "type": "overlay",
+        "version": "2",
+        "minzoom": str(minzoom),
+        "maxzoom": str(maxzoom),
+        "bounds": f"{west:.6f},{south:.6f},{east:.6f},{north:.6f}",
+        "center": f"{(west + east) / 2:.6f},{(south + north) / 2:.6f},{minzoom + 2}",
+        "json": json.dumps({"vector_layers": vector_layers}),
+    }
+    conn.executemany("INSERT INTO metadata (name, value) VALUES (?, ?)", metadata.items())
+
+def build_mbtiles(output: Path = DEFAULT_MBTILES, minzoom: int = 8, maxzoom: int = 15,
+                  layer_names: Iterable[str] = tuple(BOUNDARY_LAYERS)) -> Dict[str, int]:
+    """Render the boundary layers into gzipped vector tiles for every zoom in range"""
+    layers = {name: BOUNDARY_LAYERS[name]() for name in layer_names}
+    # Layers with no data yet are left out rather than written as empty
+    layers = {name: features for name, features in layers.items() if features}
+    all_bounds = shapely.bounds(shapely.union_all([g for features in layers.values() for g, _ in features]))
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_suffix('.tmp')
+    tmp_path.unlink(missing_ok=True)
+    conn = sqlite3.connect(str(tmp_path))
+    conn.execute("CREATE TABLE metadata (name TEXT, value TEXT)")
+    conn.execute(
+        "CREATE TABLE tiles (zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER, tile_data BLOB)"
+    )
+    conn.execute("CREATE UNIQUE INDEX tile_index ON tiles (zoom_level, tile_column, tile_row)")
+    _write_metadata(conn, layers, minzoom, maxzoom)
+
+    counts = {}
+    for z in range(minzoom, maxzoom + 1):
+        rows = []
+        for x, y in tiles_covering(tuple(all_bounds), z):
+            data = encode_tile(layers, z, x, y)
+            if data:
+                # MBTiles rows count from the bottom (TMS)
+                rows.append((z, x, 2 ** z - 1 - y, gzip.compress(data, mtime=0)))
+        conn.executemany("INSERT INTO tiles VALUES (?, ?, ?, ?)", rows)
+        counts[z] = len(rows)
+    conn.commit()
+    conn.close()
+    # Replace atomically so a running tile server never reads a half-built file
+    tmp_path.replace(output)
+    return counts
+
+def export_tiles(mbtiles: Path, directory: Path) -> int:
+    """
+    Unpack an MBTiles file into {z}/{x}/{y}.pbf files plus a tiles.json of its
+    metadata, uncompressed, so any static file server can serve them; the map
+    component serves them from the app's own origin. The directory is
+    replaced whole, so the map never mixes tiles from two builds.
+    """
+    tmp_dir = directory.with_name(f".{directory.name}.tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+    conn = sqlite3.connect(f"file:{mbtiles}?mode=ro", uri=True)
+    count = 0
+    for z, x, tms_y, data in conn.execute("SELECT zoom_level, tile_column, tile_row, tile_data FROM tiles"):
+        path = tmp_dir / str(z) / str(x) / f"{2 ** z - 1 - tms_y}.pbf"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(gzip.decompress(data))
+        count += 1
+    metadata = dict(conn.execute("SELECT name, value FROM metadata").fetchall())
+    conn.close()
+    (tmp_dir / "tiles.json").write_text(json.dumps(metadata), encoding="utf-8")
+
+    old_dir = directory.with_name(f".{directory.name}.old")
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if directory.exists():
+        directory.replace(old_dir)
+    tmp_dir.replace(directory)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return count
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Render boundary layers into an MBTiles vector tile pyramid")
+    parser.add_argument('--output', type=Path, default=DEFAULT_MBTILES)
+    parser.add_argument('--minzoom', type=int, default=8)
+    parser.add_argument('--maxzoom', type=int, default=15)
+    parser.add_argument('--layers', default=",".join(BOUNDARY_LAYERS),
+                        help="Comma-separated layers to include: " + ", ".join(BOUNDARY_LAYERS))
+    parser.add_argument('--export-dir', type=Path,
+                        help="Also unpack the tiles here as static files, e.g. utils/district_map_component/tiles")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = build_mbtiles(args.output, args.minzoom, args.maxzoom,
+                           [name.strip() for name in args.layers.split(',') if name.strip()])
+    for z, count in counts.items():
+        print(f"  zoom {z}: {count} tiles")
+    size_kb = args.output.stat().st_size / 1024
+    print(f"Wrote {sum(counts.values())} tiles ({size_kb:.0f} KB) to {args.output} "
+          f"in {time.perf_counter() - start:.1f}s")
+    if args.export_dir:
+        print(f"Unpacked {export_tiles(args.output, args.export_dir)} tiles into {args.export_dir}")
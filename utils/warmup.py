@@ -0,0 +1,179 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+from streamlit.logger import get_logger
+from utils.metrics import register_collector, register_readiness_check
+
+logger = get_logger(__name__)
+
+class _WarmupThreadFilter(logging.Filter):
+    """Drops Streamlit's missing-ScriptRunContext warnings raised by the warm-up thread"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.threadName != "cache-warmup"
+
+get_logger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(_WarmupThreadFilter())
+
+@dataclass
+class WarmupReport:
+    """Progress of the warm-up run in this process"""
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    steps: Dict[str, float] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def ready(self) -> bool:
+        return self.finished_at is not None
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+def warm_geometry_store():
+    from utils.geometry_store import convert_all
+    convert_all()
+
+def warm_boundaries():
+    from utils.district_data import get_district_boundaries
+    get_district_boundaries()
+
+def warm_spatial_index():
+    from utils.district_data import get_district_index
+    get_district_index()
+
+def warm_jurisdictions():
+    from utils.jurisdictions import get_jurisdiction_index
+    get_jurisdiction_index()
+
+def warm_service_area():
+    from utils.district_data import get_service_area
+    get_service_area()
+
+def warm_boundary_sets():
+    from utils.boundary_sets import BOUNDARY_SETS, get_boundary_index
+    for name in BOUNDARY_SETS:
+        get_boundary_index(name)
+
+def warm_council_members():
+    from utils.district_data import get_council_member
+    for district in range(1, 10):
+        get_council_member(str(district))
+
+def warm_candidates():
+    from utils.district_data import get_district_candidates
+    for district in range(1, 10):
+        get_district_candidates(str(district))
+
+def warm_photos():
+    from utils.candidate_data import get_all_candidates
+    from utils.photo_scraper import get_candidate_photo
+    for candidate in get_all_candidates():
+        get_candidate_photo(candidate.name, candidate.district)
+
+def warm_map_geometry():
+    from utils.district_map import build_map_geometry
+    build_map_geometry()
+
+def warm_polling_places():
+    from utils.district_data import get_polling_place_locations, get_precinct_assignments
+    get_precinct_assignments()
+    get_polling_place_locations()
+
+# Run in order; later steps reuse what earlier ones loaded
+WARMUP_STEPS: List[Tuple[str, Callable[[], None]]] = [
+    ("geometry_store", warm_geometry_store),
+    ("boundaries", warm_boundaries),
+    ("spatial_index", warm_spatial_index),
+    ("jurisdictions", warm_jurisdictions),
+    ("service_area", warm_service_area),
+    ("boundary_sets", warm_boundary_sets),
+    ("council_members", warm_council_members),
+    ("candidates", warm_candidates),
+    ("photos", warm_photos),
+    ("map_geometry", warm_map_geometry),
+    ("polling_places", warm_polling_places),
+]
+
+_lock = threading.Lock()
+_report = WarmupReport()
+_thread: Optional[threading.Thread] = None
+
+def run_warmup(report: WarmupReport):
+    """Run every warm-up step, recording how long each took; a failing step does not stop the rest"""
+    report.started_at = time.monotonic()
+    for name, step in WARMUP_STEPS:
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            report.errors[name] = str(e)
+            logger.warning("Warm-up step %s failed: %s", name, e)
+        report.steps[name] = time.perf_counter() - start
+    report.finished_at = time.monotonic()
+    logger.info("Warm-up finished in %.1fs (%s)", report.duration,
+                ", ".join(f"{name}={seconds:.2f}s" for name, seconds in report.steps.items()))
+
+def start_warmup() -> WarmupReport:
+    """Start warming caches on a background thread, once per process"""
+    global _thread
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=run_warmup, args=(_report,), name="cache-warmup", daemon=True)
+            _thread.start()
+    return _report
+
+def wait_for_warmup(timeout: Optional[float] = None) -> bool:
+    """Block until warm-up finishes; True if it did within the timeout"""
+    thread = _thread
+    if thread is not None:
+        thread.join(timeout)
+    return _report.ready
+
+def warmup_report() -> WarmupReport:
+    return _report
+
+def _readiness() -> Tuple[bool, dict]:
+    duration = _report.duration
+    return _report.ready, {
+        "warmup": {
+            "started": _report.started_at is not None,
+            "finished": _report.ready,
+            "duration_seconds": round(duration, 3) if duration is not None else None,
+            "steps": {name: round(seconds, 3) for name, seconds in _report.steps.items()},
+            "errors": dict(_report.errors),
+        }
+    }
+
+def _prometheus_lines() -> List[str]:
+    lines = [
+        "# HELP chattanooga_vote_warmup_ready Whether the cache warm-up has finished",
+        "# TYPE chattanooga_vote_warmup_ready gauge",
+        f"chattanooga_vote_warmup_ready {int(_report.ready)}",
+        "# HELP chattanooga_vote_warmup_step_seconds Time spent in each warm-up step",
+        "# TYPE chattanooga_vote_warmup_step_seconds gauge",
+    ]
+    for name, seconds in list(_report.steps.items()):
+        lines.append(f'chattanooga_vote_warmup_step_seconds{{step="{name}"}} {seconds:.6f}')
+    return lines
+
+register_readiness_check(_readiness)
+register_collector(_prometheus_lines)
+
+if __name__ == '__main__':
+    import streamlit.config
+    import streamlit.logger
+    streamlit.config.get_config_options()
+    streamlit.logger.set_log_level('error')
+
+    start_warmup()
+    wait_for_warmup()
+    ready, details = _readiness()
+    print(f"Warm-up finished in {_report.duration:.2f}s")
+    for name, seconds in details["warmup"]["steps"].items():
+        error = details["warmup"]["errors"].get(name)
+        print(f"  {name}: {seconds:.2f}s" + (f" (failed: {error})" if error else ""))